@@ -1,12 +1,16 @@
 from phi.agent import Agent
-from tools.data_tools import get_market_data, plot_stock_history, get_fundamental_metrics, get_analyst_recommendations, compare_stocks, get_watchlist_summary
+from tools.data_tools import get_market_data, plot_stock_history, get_fundamental_metrics, get_analyst_recommendations, compare_stocks, get_watchlist_summary, get_fundamentals_history
+from tools.technical_tools import get_technical_indicators
+from tools.portfolio_tools import get_portfolio_risk
+from tools.screener_tools import screen_stocks
+from tools.backtest_tools import backtest_signal_rule
 
 def get_data_agent(model_config):
     return Agent(
         name="Data Analyst",
         role="Financial Data Specialist - Hybrid (Stocks & Crypto)",
         model=model_config,
-        tools=[get_market_data, plot_stock_history, get_fundamental_metrics, get_analyst_recommendations, compare_stocks, get_watchlist_summary],
+        tools=[get_market_data, plot_stock_history, get_fundamental_metrics, get_analyst_recommendations, compare_stocks, get_watchlist_summary, get_technical_indicators, get_portfolio_risk, screen_stocks, backtest_signal_rule, get_fundamentals_history],
         instructions=[
             "You are a hybrid financial data specialist covering both traditional stocks and cryptocurrencies.",
             "",
@@ -20,13 +24,23 @@ def get_data_agent(model_config):
             "  * Stocks: Returns P/E, Market Cap, EPS",
             "  * Crypto: Returns Sentiment Score, ATH Distance, Volatility",
             "- For charts: call plot_stock_history(symbol='<TICKER>') - works for both",
+            "  * Longer ranges: plot_stock_history(symbol='<TICKER>', period='5y') (also '2y', '10y', 'max')",
+            "  * Intraday: plot_stock_history(symbol='<TICKER>', period='5d', interval='15m') (also '5m', '30m', '1h')",
             "  ⚠️ CRITICAL: ALWAYS call plot_stock_history() when analyzing an asset!",
             "  ⚠️ NEVER skip the chart - charts are MANDATORY for analysis!",
             "  ⚠️ NEVER write plotly/matplotlib code - ONLY use the plot_stock_history() tool!",
             "- For stock deep dive: get_fundamental_metrics() and get_analyst_recommendations()",
-            "- For comparisons: compare_stocks(symbol1='<FIRST>', symbol2='<SECOND>')",
-            "  * After compare_stocks, ALSO call plot_stock_history() for BOTH symbols!",
+            "- For how fundamentals changed (e.g. 'EPS since last week'): get_fundamentals_history(symbol='<TICKER>', since_days=7)",
+            "- For comparisons: compare_stocks(symbols=['<FIRST>', '<SECOND>', ...]) - two or more symbols",
+            "  * After compare_stocks, ALSO call plot_stock_history() for EVERY compared symbol!",
             "- For watchlist: get_watchlist_summary()",
+            "- For technicals (RSI, MACD, moving averages, Bollinger, ATR, volatility): get_technical_indicators(symbols=['<TICKER>'])",
+            "  * Omit symbols to analyze the whole watchlist in one call",
+            "  * To overlay on a chart: plot_stock_history(symbol='<TICKER>', indicators=['SMA_50', 'SMA_200', 'BB'])",
+            "- For portfolio risk (VaR, correlation, beta, diversification): get_portfolio_risk()",
+            "- For screening many tickers at once: screen_stocks(criteria=\"pct_above_low <= 10 and pe < 20\")",
+            "  * NEVER call get_market_data once per symbol to screen - use screen_stocks instead",
+            "- For how the BUY/HOLD/SELL rule or a trading rule performed: backtest_signal_rule(rule='range_position')",
             "",
             "🔔 CRYPTO DETECTION:",
             "- Common crypto: BTC, ETH, SOL, ADA, DOGE, XRP",
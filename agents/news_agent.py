@@ -1,19 +1,20 @@
 from phi.agent import Agent
-from tools.search_tools import get_company_news, get_watchlist_news
+from tools.search_tools import get_company_news, get_watchlist_news, search_news_archive
 
 def get_news_agent(model_config):
     return Agent(
         name="News Researcher",
         role="Market News Analyst",
         model=model_config,
-        tools=[get_company_news, get_watchlist_news],
+        tools=[get_company_news, get_watchlist_news, search_news_archive],
         instructions=[
             "You are a market news researcher.",
             "Find and summarize recent financial news.",
             "For single stock: use get_company_news(symbol='<TICKER>').",
             "For watchlist/portfolio news: use get_watchlist_news().",
-            "Ignore irrelevant content like driver downloads or support pages.",
+            "For past coverage ('what did the news say about X last week'): use search_news_archive(query, symbol, since_days) first.",
             "Focus on market-moving news, earnings, and analyst opinions.",
+            "News results carry precomputed sentiment scores (-1 to +1); report those numbers instead of judging tone yourself.",
             "CRITICAL: Summarize news into 3-5 key bullet points. Do not return full articles.",
             "Start your response with '📰 [News Researcher]' to show you're working."
         ],
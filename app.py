@@ -18,6 +18,9 @@ from utils.memory import MemoryStore, extract_entities_from_text, compact_sessio
 from utils.vector_store import Retriever
 from utils.db import get_all_sessions
 from utils.activity_tracker import ActivityTracker
+from tools.data_tools import get_watchlist_prefetcher
+from tools.screener_tools import refresh_universe_if_stale
+from tools.search_tools import prefetch_headlines
 import re
 
 # -----------------------------------------------------------------------------
@@ -36,6 +39,19 @@ st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 init_db()
 mem_store = MemoryStore()
 
+
+@st.cache_resource
+def start_watchlist_prefetch():
+    """Starts the background watchlist prefetcher once per server process."""
+    prefetcher = get_watchlist_prefetcher()
+    # The screener universe only needs a daily bulk refresh; the job is a no-op while fresh
+    prefetcher.add_job('headlines', prefetch_headlines)
+    prefetcher.add_job('universe', lambda tickers: refresh_universe_if_stale())
+    return prefetcher.start()
+
+
+start_watchlist_prefetch()
+
 # -----------------------------------------------------------------------------
 # 2. MODEL CONFIGURATION
 # -----------------------------------------------------------------------------
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.backtest import _ffill_state, run_grid, simulate
+
+
+def _close():
+    idx = pd.bdate_range("2020-01-01", periods=600)
+    t = np.arange(600)
+    return pd.DataFrame({
+        'WAVE': 100 + 20 * np.sin(t / 40.0),
+        'TREND': np.linspace(50, 150, 600),
+    }, index=idx)
+
+
+def test_ffill_state_holds_until_exit():
+    entry = np.array([[False], [True], [False], [False], [True]])
+    exit_ = np.array([[True], [False], [False], [True], [False]])
+    assert _ffill_state(entry, exit_)[:, 0].tolist() == [0, 1, 1, 0, 1]
+
+
+def test_simulate_always_long_matches_buy_and_hold():
+    close = _close()
+    always = pd.DataFrame(True, index=close.index, columns=close.columns)
+    never = ~always
+    stats = simulate(close, always, never, cost_bps=0)
+    # Signal on the first close, held from the next bar on
+    expected = close.iloc[-1] / close.iloc[0] - 1
+    assert stats.loc['TREND', 'total_return'] == pytest.approx(expected['TREND'])
+    assert stats.loc['TREND', 'trades'] == 1
+    assert stats.loc['TREND', 'max_drawdown'] == pytest.approx(0.0)
+
+
+def test_run_grid_sweeps_parameters_across_symbols():
+    result = run_grid(_close(), 'range_position', grid={'buy_below': [0.2, 0.3], 'sell_above': [0.7, 0.8], 'lookback': [126]})
+    assert len(result.stats) == 4 * 2
+    summary = result.summary()
+    assert len(summary) == 4
+    assert set(summary['symbols']) == {2}
+
+    wave = result.stats[(result.stats.symbol == 'WAVE') & (result.stats.buy_below == 0.3) & (result.stats.sell_above == 0.7)].iloc[0]
+    assert wave['trades'] > 0
+    assert 0 <= wave['hit_rate'] <= 1
+
+
+def test_run_grid_rejects_unknown_rule():
+    with pytest.raises(ValueError):
+        run_grid(_close(), 'moon_phase')
+
+
+def test_mixed_stock_and_crypto_calendar_trades_and_keeps_weekend_moves(monkeypatch):
+    import tools.backtest_tools as bt
+
+    days = pd.date_range("2020-01-01", periods=900, freq="D")
+    t = np.arange(900)
+    crypto = pd.Series(100 + 20 * np.sin(t / 40.0), index=days)
+    stock = pd.Series(100 + 20 * np.sin(t / 40.0), index=days)[days.dayofweek < 5]
+    histories = {'AAPL': stock.to_frame('Close'), 'BTC-USD': crypto.to_frame('Close')}
+    monkeypatch.setattr(bt, 'get_price_history', lambda sym, period='5y': histories[sym])
+
+    captured = {}
+    real_run_grid = bt.run_grid
+
+    def spy(close, **kwargs):
+        captured['close'] = close
+        return real_run_grid(close, **kwargs)
+
+    monkeypatch.setattr(bt, 'run_grid', spy)
+    out = bt.backtest_signal_rule(symbols=['AAPL', 'BTC-USD'], grid={'lookback': [126]})
+    assert out.startswith("**🧪 Backtest")
+
+    close = captured['close']
+    # Stock column has only leading NaN (before its first bar), never weekend holes
+    assert close['AAPL'].dropna().size == stock.size
+    assert close['AAPL'].iloc[-stock.size:].notna().all()
+
+    result = real_run_grid(close, 'range_position', grid={'buy_below': [0.3], 'sell_above': [0.7], 'lookback': [126]})
+    assert (result.stats['trades'] > 0).all()
+
+
+def test_simulate_carries_returns_across_gaps():
+    close = pd.DataFrame({'A': [100.0, np.nan, np.nan, 110.0]})
+    always = pd.DataFrame(True, index=close.index, columns=close.columns)
+    stats = simulate(close, always, ~always, cost_bps=0)
+    assert stats.loc['A', 'total_return'] == pytest.approx(0.10)
+
+
+def test_crypto_annualizes_over_calendar_days():
+    path = np.linspace(100, 200, 366)
+    close = pd.DataFrame({'AAPL': path, 'BTC-USD': path})
+    always = pd.DataFrame(True, index=close.index, columns=close.columns)
+    stats = simulate(close, always, ~always, cost_bps=0)
+    # 366 bars are one calendar year of crypto but ~1.45 years of stock sessions
+    assert stats.loc['BTC-USD', 'ann_return'] == pytest.approx(1.0, rel=0.01)
+    assert stats.loc['AAPL', 'ann_return'] < 0.7
+    ratio = stats.loc['BTC-USD', 'sharpe'] / stats.loc['AAPL', 'sharpe']
+    assert ratio == pytest.approx(np.sqrt(365 / 252))
+
+
+def test_flat_history_reports_sharpe_as_not_available(monkeypatch):
+    import tools.backtest_tools as bt
+
+    flat = pd.DataFrame({'Close': np.full(400, 50.0)}, index=pd.bdate_range("2020-01-01", periods=400))
+    monkeypatch.setattr(bt, 'get_price_history', lambda sym, period='5y': flat)
+    out = bt.backtest_signal_rule(symbols=['KO'], grid={'buy_below': [0.3], 'sell_above': [0.7], 'lookback': [126]})
+    assert "nan" not in out
+    assert "| n/a |" in out
@@ -2,6 +2,21 @@ import types
 import pytest
 
 from tools import data_tools
+from utils import market_providers
+from utils.quote_cache import get_quote_cache
+from utils.resilience import reset_upstreams
+
+
+@pytest.fixture(autouse=True)
+def _clear_quote_cache():
+    # Tests patch yfinance per case; never serve one test's info dict to another
+    get_quote_cache().clear()
+    reset_upstreams()
+    market_providers.set_provider(market_providers.YFinanceProvider())
+    yield
+    get_quote_cache().clear()
+    reset_upstreams()
+    market_providers.set_provider(None)
 
 
 class DummyTicker:
@@ -21,7 +36,7 @@ def test_get_market_data_stock(monkeypatch):
         'fiftyTwoWeekHigh': 200.00
     }
 
-    monkeypatch.setattr(data_tools, 'yf', types.SimpleNamespace(Ticker=lambda s: DummyTicker(stock_info)))
+    monkeypatch.setattr(market_providers, 'yf', types.SimpleNamespace(Ticker=lambda s: DummyTicker(stock_info)))
 
     res = data_tools.get_market_data('AAPL')
     assert 'Apple Inc.' in res
@@ -40,7 +55,7 @@ def test_get_market_data_crypto(monkeypatch):
         'fiftyTwoWeekHigh': 69000
     }
 
-    monkeypatch.setattr(data_tools, 'yf', types.SimpleNamespace(Ticker=lambda s: DummyTicker(crypto_info)))
+    monkeypatch.setattr(market_providers, 'yf', types.SimpleNamespace(Ticker=lambda s: DummyTicker(crypto_info)))
 
     # Patch the API call for FNG
     monkeypatch.setattr(data_tools, 'get_crypto_sentiment', lambda: {'score': 40, 'label': 'Neutral', 'interpretation': 'Balanced'})
@@ -56,7 +71,108 @@ def test_get_market_data_fallback(monkeypatch):
         def __init__(self, sym):
             raise RuntimeError('Network unreachable')
 
-    monkeypatch.setattr(data_tools, 'yf', types.SimpleNamespace(Ticker=lambda s: BadTicker(s)))
+    monkeypatch.setattr(market_providers, 'yf', types.SimpleNamespace(Ticker=lambda s: BadTicker(s)))
 
     res = data_tools.get_market_data('AAPL')
-    assert 'Demo' in res or 'Live data unavailable' in res
\ No newline at end of file
+    assert 'Demo' in res or 'Live data unavailable' in res
+
+
+def test_get_ticker_info_is_cached(monkeypatch):
+    calls = []
+
+    def fake_ticker(sym):
+        calls.append(sym)
+        return DummyTicker({'currentPrice': 10.0})
+
+    monkeypatch.setattr(market_providers, 'yf', types.SimpleNamespace(Ticker=fake_ticker))
+
+    first = data_tools.get_ticker_info('NVDA')
+    second = data_tools.get_ticker_info('nvda')
+    assert first == second == {'currentPrice': 10.0}
+    assert calls == ['NVDA']
+
+
+def test_get_batch_quotes_single_bulk_request(monkeypatch):
+    import pandas as pd
+
+    idx = pd.date_range('2024-01-01', periods=3, freq='D')
+    cols = pd.MultiIndex.from_product([['AAPL', 'MSFT'], ['Low', 'High', 'Close']])
+    frame = pd.DataFrame(
+        [[9, 11, 10, 99, 101, 100],
+         [8, 12, 11, 98, 105, 104],
+         [10, 13, 12, 97, 103, 102]],
+        index=idx, columns=cols, dtype=float,
+    )
+    downloads = []
+
+    def fake_download(tickers, **kwargs):
+        downloads.append(list(tickers))
+        return frame
+
+    monkeypatch.setattr(market_providers, 'yf', types.SimpleNamespace(download=fake_download))
+
+    quotes = data_tools.get_batch_quotes(['AAPL', 'msft', 'AAPL'])
+    assert downloads == [['AAPL', 'MSFT']]
+    assert quotes['AAPL'] == {'price': 12.0, 'previous_close': 11.0, 'low_52w': 8.0, 'high_52w': 13.0}
+    assert quotes['MSFT']['price'] == 102.0
+
+    # Second call is served entirely from the quote cache
+    data_tools.get_batch_quotes(['AAPL', 'MSFT'])
+    assert len(downloads) == 1
+
+
+def test_compare_stocks_builds_table_from_metrics(monkeypatch):
+    infos = {
+        'NVDA': {'currentPrice': 120.5, 'trailingPE': 60.1, 'fiftyTwoWeekHigh': 150.0, 'longName': 'NVIDIA'},
+        'AMD': {'currentPrice': 150.0, 'trailingPE': 110.0, 'fiftyTwoWeekHigh': 220.0, 'longName': 'AMD'},
+        'INTC': {'currentPrice': 20.0, 'fiftyTwoWeekHigh': 50.0, 'longName': 'Intel'},
+    }
+    monkeypatch.setattr(market_providers, 'yf', types.SimpleNamespace(Ticker=lambda s: DummyTicker(infos[s])))
+
+    res = data_tools.compare_stocks(['nvda', 'AMD', 'INTC'])
+    assert 'NVDA vs AMD vs INTC' in res
+    assert '| Current Price | $120.50 | $150.00 | $20.00 |' in res
+    assert '| P/E Ratio | 60.10 | 110.00 | N/A |' in res
+    assert '| 52-Week High | $150.00 | $220.00 | $50.00 |' in res
+
+
+def test_compare_stocks_requires_two_symbols():
+    assert 'at least two' in data_tools.compare_stocks(['AAPL'])
+
+
+def test_plot_stock_history_uses_webgl_only_for_dense_intraday(monkeypatch):
+    import numpy as np
+    import pandas as pd
+
+    charts = []
+    monkeypatch.setattr(data_tools, 'st', types.SimpleNamespace(session_state={'pending_charts': charts}))
+
+    def fake_history(symbol, period='1y', interval='1d'):
+        freq = '15min' if interval == '15m' else 'D'
+        idx = pd.date_range('2024-01-01', periods=6000, freq=freq)
+        return pd.DataFrame({'Close': 100 + np.sin(np.arange(6000) / 50.0)}, index=idx)
+
+    monkeypatch.setattr(data_tools, 'get_price_history', fake_history)
+
+    assert "📊" in data_tools.plot_stock_history('AAPL', period='5y')
+    assert "📊" in data_tools.plot_stock_history('AAPL', period='1mo', interval='15m')
+    daily, intraday = charts
+    assert daily.data[0].type == 'scatter'
+    assert len(daily.data[0].x) <= data_tools.CHART_MAX_POINTS
+    assert intraday.data[0].type == 'scattergl'
+    assert len(intraday.data[0].x) == data_tools.CHART_MAX_POINTS_INTRADAY
+
+
+def test_fundamentals_tools_share_units(tmp_path, monkeypatch):
+    from utils.fundamentals_store import FundamentalsStore
+
+    info = {'trailingEps': 6.0, 'marketCap': 3.0e12, 'returnOnEquity': 1.5, 'dividendYield': 0.005}
+    monkeypatch.setattr(data_tools, '_fundamentals_store', FundamentalsStore(db_path=str(tmp_path / 'market.db')))
+    monkeypatch.setattr(data_tools, 'get_ticker_info', lambda symbol: info)
+
+    metrics = data_tools.get_fundamental_metrics('AAPL')
+    history = data_tools.get_fundamentals_history('AAPL')
+    for text in ("150.00%", "0.50%", "6.00"):
+        assert text in metrics
+        assert text in history
+    assert "$3.00T" in metrics
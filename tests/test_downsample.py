@@ -0,0 +1,34 @@
+import numpy as np
+
+from utils.downsample import downsample_recent_full, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_budget():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 200.0)
+    idx = lttb_indices(x, y, 500)
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_preserves_spike():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[437] = 100.0
+    idx = lttb_indices(x, y, 50)
+    assert 437 in idx
+
+
+def test_recent_window_stays_full_resolution():
+    x = np.arange(5000, dtype=float)
+    y = np.cos(x / 50.0)
+    idx = downsample_recent_full(x, y, max_points=600, recent_from=4800.0)
+    recent = idx[idx >= 4800]
+    assert len(recent) == 200
+    assert len(idx) <= 600
+
+
+def test_short_series_untouched():
+    x = np.arange(100, dtype=float)
+    assert len(downsample_recent_full(x, x, max_points=800)) == 100
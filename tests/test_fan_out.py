@@ -0,0 +1,35 @@
+import time
+
+from utils.fan_out import fan_out
+
+
+def test_fan_out_collects_results_concurrently():
+    def slow_double(x):
+        time.sleep(0.2)
+        return x * 2
+
+    res = fan_out(slow_double, [1, 2, 3, 4], max_workers=4, timeout_sec=5)
+    assert res.results == {1: 2, 2: 4, 3: 6, 4: 8}
+    assert res.errors == {}
+    # Concurrent: close to one task's latency, not the sum of four
+    assert res.elapsed_sec < 0.6
+
+
+def test_fan_out_partial_results_on_failure_and_timeout():
+    def fetch(key):
+        if key == 'BAD':
+            raise RuntimeError('boom')
+        if key == 'SLOW':
+            time.sleep(1.0)
+        return key.lower()
+
+    res = fan_out(fetch, ['AAPL', 'BAD', 'SLOW'], max_workers=3, timeout_sec=0.2)
+    assert res.results == {'AAPL': 'aapl'}
+    assert res.errors['BAD'] == 'boom'
+    assert res.errors['SLOW'] == 'timeout'
+    assert res.elapsed_sec < 0.8
+
+
+def test_fan_out_empty_keys():
+    res = fan_out(lambda k: k, [])
+    assert res.results == {} and res.errors == {}
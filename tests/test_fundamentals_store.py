@@ -0,0 +1,63 @@
+from utils.fundamentals_store import FundamentalsStore, changed_fields, extract_fundamentals
+
+
+def _info(eps=6.0, market_cap=3.0e12):
+    return {'trailingEps': eps, 'marketCap': market_cap, 'returnOnEquity': 1.5, 'dividendYield': 0.005, 'sector': 'Tech'}
+
+
+def test_extract_and_change_detection():
+    fields = extract_fundamentals(_info())
+    assert fields['eps'] == 6.0
+    assert fields['pe'] is None
+
+    # Market cap follows the share price and never makes a new version; an EPS revision does
+    assert changed_fields(fields, extract_fundamentals(_info(market_cap=3.01e12))) == []
+    assert changed_fields(fields, extract_fundamentals(_info(market_cap=2.4e12))) == []
+    assert changed_fields(fields, extract_fundamentals(_info(eps=6.1))) == ['eps']
+
+
+def test_only_changed_snapshots_are_stored(tmp_path):
+    store = FundamentalsStore(db_path=str(tmp_path / 'market.db'))
+    day = 86400
+    assert store.record('aapl', extract_fundamentals(_info()), now=1 * day)
+    assert not store.record('AAPL', extract_fundamentals(_info(market_cap=3.02e12)), now=2 * day)
+    assert store.record('AAPL', extract_fundamentals(_info(eps=6.4)), now=8 * day)
+
+    assert len(store.history('AAPL')) == 2
+    assert store.checked_at('AAPL') == 8 * day
+    # "Since last week" reads the version that was current then
+    assert store.as_of('AAPL', 7 * day).fields['eps'] == 6.0
+    assert store.latest('AAPL').fields['eps'] == 6.4
+
+
+def test_get_serves_from_disk_and_survives_upstream_failures(tmp_path):
+    store = FundamentalsStore(db_path=str(tmp_path / 'market.db'))
+    calls = []
+
+    def fetch(symbol):
+        calls.append(symbol)
+        return _info()
+
+    first = store.get('MSFT', fetch)
+    assert store.get('MSFT', fetch).fields == first.fields
+    assert calls == ['MSFT']
+
+    store.max_age_sec = -1
+
+    def broken(symbol):
+        raise RuntimeError("circuit open")
+
+    assert store.get('MSFT', broken).fields == first.fields
+    assert store.get('MSFT', lambda s: {}).fields == first.fields
+    assert len(store.history('MSFT')) == 1
+
+
+def test_price_derived_fields_are_latest_values_only(tmp_path):
+    store = FundamentalsStore(db_path=str(tmp_path / 'market.db'))
+    for day, cap in enumerate((3.0e12, 2.7e12, 3.3e12), start=1):
+        store.record('NVDA', extract_fundamentals(_info(market_cap=cap)), now=day * 86400)
+
+    assert len(store.history('NVDA')) == 1
+    assert 'market_cap' not in store.latest('NVDA').fields
+    assert store.current('NVDA').fields['market_cap'] == 3.3e12
+    assert store.current('NVDA').fields['eps'] == 6.0
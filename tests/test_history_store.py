@@ -0,0 +1,113 @@
+import pandas as pd
+
+from utils.history_store import HistoryStore, period_start
+
+
+def _bars(dates, start_price=100.0):
+    idx = pd.DatetimeIndex(pd.to_datetime(dates)).tz_localize('America/New_York')
+    closes = [start_price + i for i in range(len(dates))]
+    return pd.DataFrame(
+        {'Open': closes, 'High': closes, 'Low': closes, 'Close': closes, 'Volume': [1000] * len(dates)},
+        index=idx,
+    )
+
+
+def test_history_store_fetches_once_then_tops_up(tmp_path):
+    calls = []
+    today = pd.Timestamp.utcnow().normalize().tz_localize(None)
+    days = [today - pd.Timedelta(days=n) for n in (3, 2, 1)]
+
+    def fetch(symbol, **kwargs):
+        calls.append(kwargs)
+        if 'period' in kwargs:
+            return _bars(days[:2])
+        return _bars(days[1:], start_price=101.0)
+
+    store = HistoryStore(fetch=fetch, db_path=str(tmp_path / 'market.db'), refresh_after_sec=3600)
+
+    first = store.get_history('aapl', period='1mo')
+    assert len(first) == 2
+    assert calls == [{'interval': '1d', 'period': '1mo'}]
+
+    # Fresh coverage: served from disk without touching the fetcher
+    store.get_history('AAPL', period='1mo')
+    assert len(calls) == 1
+
+    # Stale coverage: only bars from the last stored date onward are requested
+    store.refresh_after_sec = -1
+    topped_up = store.get_history('AAPL', period='1mo')
+    assert len(calls) == 2
+    assert 'start' in calls[1]
+    assert len(topped_up) == 3
+    assert list(topped_up['Close']) == [100.0, 101.0, 102.0]
+
+
+def test_history_store_longer_period_triggers_full_download(tmp_path):
+    calls = []
+    today = pd.Timestamp.utcnow().normalize().tz_localize(None)
+
+    def fetch(symbol, **kwargs):
+        calls.append(kwargs)
+        return _bars([today - pd.Timedelta(days=1)])
+
+    store = HistoryStore(fetch=fetch, db_path=str(tmp_path / 'market.db'))
+    store.get_history('MSFT', period='1mo')
+    store.get_history('MSFT', period='5y')
+    store.get_history('MSFT', period='1y')
+
+    assert [c.get('period') for c in calls] == ['1mo', '5y']
+
+
+def test_period_start_max_is_unbounded():
+    assert period_start('max') is None
+    assert period_start('1y') < period_start('1mo')
+
+
+def test_history_store_serves_stored_bars_when_upstream_fails(tmp_path):
+    today = pd.Timestamp.utcnow().normalize().tz_localize(None)
+    state = {'down': False}
+
+    def fetch(symbol, **kwargs):
+        if state['down']:
+            raise RuntimeError("circuit open")
+        return _bars([today - pd.Timedelta(days=2), today - pd.Timedelta(days=1)])
+
+    store = HistoryStore(fetch=fetch, db_path=str(tmp_path / 'market.db'))
+    store.get_history('NVDA', period='1mo')
+    state['down'] = True
+
+    assert len(store.get_history('NVDA', period='1y')) == 2
+
+
+def test_history_store_retries_after_empty_first_fetch(tmp_path):
+    calls = []
+    today = pd.Timestamp.utcnow().normalize().tz_localize(None)
+
+    def fetch(symbol, **kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'])
+        return _bars([today - pd.Timedelta(days=2), today - pd.Timedelta(days=1)])
+
+    store = HistoryStore(fetch=fetch, db_path=str(tmp_path / 'market.db'), refresh_after_sec=3600)
+    assert store.get_history('TSLA', period='1mo').empty
+
+    second = store.get_history('TSLA', period='1mo')
+    assert len(second) == 2
+    assert calls[1] == {'interval': '1d', 'period': '1mo'}
+
+
+def test_history_store_top_up_without_stored_bars_refetches_full_range(tmp_path):
+    calls = []
+    today = pd.Timestamp.utcnow().normalize().tz_localize(None)
+
+    def fetch(symbol, **kwargs):
+        calls.append(kwargs)
+        return _bars([today - pd.Timedelta(days=1)])
+
+    store = HistoryStore(fetch=fetch, db_path=str(tmp_path / 'market.db'), refresh_after_sec=-1)
+    # Coverage left behind by an empty download, with no bars stored
+    store._set_coverage('AMD', '1d', period_start('1mo'))
+
+    assert len(store.get_history('AMD', period='1mo')) == 1
+    assert calls == [{'interval': '1d', 'period': '1mo'}]
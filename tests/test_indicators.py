@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from utils.indicators import align_by_bar, bollinger, compute_indicator_panel, rsi, sma
+
+
+def test_sma_matches_manual_mean():
+    close = pd.DataFrame({'A': np.arange(1, 11, dtype=float)})
+    out = sma(close, 5)
+    assert np.isnan(out['A'].iloc[3])
+    assert out['A'].iloc[-1] == np.mean([6, 7, 8, 9, 10])
+
+
+def test_rsi_extremes():
+    up = pd.DataFrame({'UP': np.arange(1, 40, dtype=float), 'DOWN': np.arange(40, 1, -1, dtype=float)})
+    out = rsi(up, 14)
+    assert out['UP'].iloc[-1] == 100
+    assert out['DOWN'].iloc[-1] == 0
+
+
+def test_bollinger_pct_b_in_band_for_flat_noise():
+    rng = np.random.default_rng(0)
+    close = pd.DataFrame({'A': 100 + rng.normal(0, 1, 200)})
+    bands = {name: band.dropna() for name, band in bollinger(close).items()}
+    assert len(bands['BB_upper']) == 200 - 19
+    assert (bands['BB_upper'] >= bands['BB_lower']).all().all()
+
+
+def test_panel_computes_all_symbols_at_once():
+    rng = np.random.default_rng(1)
+    close = pd.DataFrame(100 + rng.normal(0, 1, (300, 3)).cumsum(axis=0), columns=['A', 'B', 'C'])
+    panel = compute_indicator_panel(close, close + 1, close - 1)
+    for name in ['SMA_200', 'RSI_14', 'MACD_hist', 'BB_pct_b', 'ATR_14', 'RV_20']:
+        assert list(panel[name].columns) == ['A', 'B', 'C']
+        assert panel[name].iloc[-1].notna().all()
+
+
+def test_align_by_bar_right_aligns_series():
+    frame = align_by_bar({
+        'STOCK': pd.Series([1.0, 2.0]),
+        'CRYPTO': pd.Series([5.0, 6.0, 7.0]),
+    })
+    assert frame.iloc[-1].tolist() == [2.0, 7.0]
+    assert np.isnan(frame['STOCK'].iloc[0])
@@ -0,0 +1,117 @@
+import json
+import types
+
+import pandas as pd
+import pytest
+
+from tools import data_tools
+from utils import market_providers
+from utils.market_providers import RecordingProvider, ReplayProvider, provider_from_env
+from utils.quote_cache import get_quote_cache
+
+
+def _bars(n=300, start="2024-01-01"):
+    idx = pd.date_range(start, periods=n, freq="D")
+    close = pd.Series(range(100, 100 + n), index=idx, dtype=float)
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close, 'Volume': 1000.0}, index=idx)
+
+
+def test_provider_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("COFINANCE_DATA_PROVIDER", "replay")
+    monkeypatch.setenv("COFINANCE_FIXTURES_DIR", str(tmp_path))
+    provider = provider_from_env()
+    assert isinstance(provider, ReplayProvider)
+    assert provider.fixtures_dir == str(tmp_path)
+
+    monkeypatch.delenv("COFINANCE_DATA_PROVIDER")
+    assert isinstance(provider_from_env(), market_providers.YFinanceProvider)
+
+
+def test_recording_then_replay_round_trip(tmp_path):
+    class Inner(market_providers.MarketDataProvider):
+        def get_info(self, symbol):
+            return {'currentPrice': 42.0, 'shortName': symbol}
+
+        def get_history(self, symbol, **kwargs):
+            return _bars()
+
+        def get_recommendations(self, symbol):
+            return None
+
+        def download(self, symbols, period="1y", interval="1d"):
+            return pd.DataFrame()
+
+        def get_fear_greed(self):
+            return {'score': 50, 'label': 'Neutral'}
+
+    recorder = RecordingProvider(Inner(), str(tmp_path))
+    recorder.get_info("AAPL")
+    recorder.get_history("AAPL", period="1y", interval="1d")
+
+    replay = ReplayProvider(str(tmp_path))
+    assert replay.get_info("aapl") == {'currentPrice': 42.0, 'shortName': 'AAPL'}
+    # Periods are measured back from the last recorded bar, not from today
+    month = replay.get_history("AAPL", period="1mo", interval="1d")
+    assert len(month) == 32
+    assert month['Close'].iloc[-1] == 399.0
+    assert replay.get_recommendations("AAPL") is None
+
+    batch = replay.download(["AAPL", "MISSING"], period="1y")
+    assert list(batch.columns.get_level_values(0).unique()) == ["AAPL"]
+
+
+def test_data_tools_run_offline_from_fixtures(tmp_path):
+    (tmp_path / "info").mkdir()
+    (tmp_path / "info" / "MSFT.json").write_text(json.dumps({
+        'currentPrice': 410.5, 'currency': 'USD', 'longName': 'Microsoft Corporation',
+        'trailingPE': 35.1, 'marketCap': 3_000_000_000_000, 'trailingEps': 11.7,
+        'fiftyTwoWeekLow': 300.0, 'fiftyTwoWeekHigh': 450.0,
+    }))
+    get_quote_cache().clear()
+    market_providers.set_provider(ReplayProvider(str(tmp_path)))
+    try:
+        first = data_tools.get_market_data("MSFT")
+        get_quote_cache().clear()
+        assert data_tools.get_market_data("MSFT") == first
+        assert "Microsoft" in first and "410.50" in first
+        # Missing fixtures fall back to demo data that is stable between runs
+        assert data_tools.get_market_data("ZZZZ") == data_tools.get_market_data("ZZZZ")
+    finally:
+        get_quote_cache().clear()
+        market_providers.set_provider(None)
+
+
+def test_history_store_windows_follow_replayed_fixtures(tmp_path):
+    from utils.history_store import HistoryStore
+
+    (tmp_path / "history").mkdir()
+    _bars(start="2021-01-01").to_csv(tmp_path / "history" / "AAPL_1d.csv")
+    replay = ReplayProvider(str(tmp_path))
+    store = HistoryStore(
+        fetch=replay.get_history,
+        db_path=str(tmp_path / 'market.db'),
+        reference_date=replay.reference_date,
+    )
+
+    # The fixture ends in 2021; windows are measured back from its last bar, not from today
+    month = store.get_history("AAPL", period="1mo")
+    assert len(month) == len(replay.get_history("AAPL", period="1mo"))
+    assert len(store.get_history("AAPL", period="1y")) == 300
+
+
+def test_replay_uses_its_own_market_db(monkeypatch):
+    from utils.db import MARKET_DB, market_db_path
+
+    monkeypatch.delenv("COFINANCE_DATA_PROVIDER", raising=False)
+    assert market_db_path() == MARKET_DB
+    monkeypatch.setenv("COFINANCE_DATA_PROVIDER", "replay")
+    assert market_db_path() == "market_data.replay.db"
+
+
+def test_incomplete_provider_fails_at_construction():
+    class InfoOnly(market_providers.MarketDataProvider):
+        def get_info(self, symbol):
+            return {}
+
+    with pytest.raises(TypeError):
+        InfoOnly()
@@ -0,0 +1,42 @@
+import pytest
+
+from utils.near_dupes import NearDupeIndex, hamming, simhash
+
+STORY = ("Nvidia shares jump after record data center revenue",
+         "Nvidia reported record quarterly revenue of $35.1 billion, driven by data center sales, sending shares up 5% in extended trading.")
+COPY = ("Nvidia shares jump after record data center revenue - Yahoo Finance",
+        "Nvidia reported record quarterly revenue of $35.1 billion, driven by data center sales, sending shares up 5% in after-hours trading.")
+OTHER = ("Nvidia stock falls as export curbs weigh on China sales",
+         "Shares of Nvidia dropped 3% on Tuesday after the Commerce Department tightened export rules for advanced chips.")
+
+
+def _result(url, title, body):
+    return {'href': url, 'title': title, 'body': body}
+
+
+def test_simhash_keeps_copies_close_and_stories_apart():
+    assert hamming(simhash(*STORY), simhash(*COPY)) <= 6
+    assert hamming(simhash(*STORY), simhash(*OTHER)) > 12
+
+
+def test_collapse_keeps_first_copy_and_counts_the_rest():
+    results = [
+        _result("https://www.reuters.com/a", *STORY),
+        _result("https://b.com/x", *OTHER),
+        _result("https://finance.yahoo.com/a", *COPY),
+    ]
+    collapsed = NearDupeIndex().collapse(results)
+    assert [r['href'] for r in collapsed] == ["https://www.reuters.com/a", "https://b.com/x"]
+    assert collapsed[0]['duplicates'] == 1
+    assert collapsed[0]['also_in'] == ["finance.yahoo.com"]
+    assert collapsed[1]['duplicates'] == 0
+
+
+def test_index_remembers_clusters_across_calls_and_stays_bounded():
+    index = NearDupeIndex(max_entries=2)
+    first = index.add("https://a.com/1", simhash(*STORY))
+    assert index.add("https://c.com/3", simhash(*COPY)) == first
+    index.add("https://b.com/2", simhash(*OTHER))
+    assert len(index) == 2
+    with pytest.raises(ValueError):
+        NearDupeIndex(max_distance=8)
@@ -0,0 +1,116 @@
+import sqlite3
+import time
+
+from utils.news_cache import NewsCache, canonical_url, dedupe_results
+
+
+def _article(url, title, body="Shares rose after earnings beat estimates."):
+    return {'href': url, 'title': title, 'body': body}
+
+
+def test_canonical_url_strips_tracking_and_www():
+    assert canonical_url("https://WWW.Reuters.com/markets/nvda/?utm_source=x&id=7#top") == "https://reuters.com/markets/nvda?id=7"
+
+
+def test_dedupe_by_url_and_content_hash():
+    results = [
+        _article("https://a.com/story?utm_medium=rss", "NVDA beats"),
+        _article("https://a.com/story", "Different title"),
+        _article("https://b.com/copy", "NVDA   beats!"),
+        _article("https://c.com/other", "AMD misses", "Shares fell."),
+    ]
+    assert [r['href'] for r in dedupe_results(results)] == ["https://a.com/story?utm_medium=rss", "https://c.com/other"]
+
+
+def test_get_or_fetch_serves_repeats_from_disk(tmp_path):
+    cache = NewsCache(db_path=str(tmp_path / 'market.db'))
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return [_article("https://a.com/1", "NVDA beats"), _article("https://a.com/1#dup", "NVDA beats")]
+
+    first = cache.get_or_fetch('nvda', 'q', fetch)
+    again = NewsCache(db_path=str(tmp_path / 'market.db')).get_or_fetch('NVDA', 'q', fetch)
+    assert len(first) == 1
+    assert again == first
+    assert len(calls) == 1
+
+
+def test_expired_entry_refetches_and_failures_serve_stale(tmp_path):
+    cache = NewsCache(db_path=str(tmp_path / 'market.db'), ttl_sec=-1)
+    cache.put('AAPL', 'q', [_article("https://a.com/1", "Apple event")])
+
+    def broken():
+        raise RuntimeError("rate limited")
+
+    assert [r['title'] for r in cache.get_or_fetch('AAPL', 'q', broken)] == ["Apple event"]
+    assert cache.stats()['stale_served'] == 1
+    assert [r['title'] for r in cache.get_or_fetch('AAPL', 'q', lambda: [_article("https://b.com/2", "New")])] == ["New"]
+
+
+def test_full_text_search_ranks_by_symbol_and_time(tmp_path):
+    cache = NewsCache(db_path=str(tmp_path / 'market.db'))
+    cache.put('NVDA', 'q', [
+        _article("https://a.com/earn", "Nvidia earnings beat", "Data center revenue doubled in the quarter."),
+        _article("https://a.com/chips", "Nvidia unveils new chips", "The launch event focused on AI servers."),
+    ])
+    cache.put('AMD', 'q', [_article("https://b.com/amd", "AMD earnings preview", "Analysts expect strong revenue.")])
+
+    hits = cache.search("earnings revenue")
+    assert {h['symbols'][0] for h in hits} == {'NVDA', 'AMD'}
+    assert [h['title'] for h in cache.search("earnings", symbol='nvda')] == ["Nvidia earnings beat"]
+    assert cache.search("earning")[0]['symbols'][0] in ('NVDA', 'AMD')  # porter stemming
+    assert cache.search("earnings", since=time.time() + 60) == []
+    assert cache.search("  !! ") == []
+
+
+def test_articles_cached_before_the_index_are_backfilled(tmp_path):
+    db = str(tmp_path / 'market.db')
+    NewsCache(db_path=db).put('TSLA', 'q', [_article("https://a.com/1", "Tesla deliveries rise")])
+    with sqlite3.connect(db) as conn:
+        conn.execute("DELETE FROM news_fts")
+        conn.execute("DELETE FROM news_symbol_articles")
+    assert [h['symbols'] for h in NewsCache(db_path=db).search("deliveries")] == [['TSLA']]
+
+
+def test_articles_found_for_several_symbols_are_returned_once(tmp_path):
+    cache = NewsCache(db_path=str(tmp_path / 'market.db'))
+    story = _article("https://a.com/deal", "Microsoft and Nvidia sign AI chip deal")
+    cache.put('MSFT', 'q', [story])
+    cache.put('NVDA', 'q', [story])
+
+    hits = cache.search("chip deal")
+    assert len(hits) == 1
+    assert hits[0]['symbols'] == ['MSFT', 'NVDA']
+    assert len(cache.search("chip deal", symbol='nvda')) == 1
+    assert cache.search("chip deal", symbol='AMD') == []
+
+
+def test_per_symbol_index_is_rebuilt_once_per_article(tmp_path):
+    db = str(tmp_path / 'market.db')
+    cache = NewsCache(db_path=db)
+    story = _article("https://a.com/deal", "Microsoft and Nvidia sign AI chip deal")
+    cache.put('MSFT', 'q', [story])
+    cache.put('NVDA', 'q', [story])
+    cache.put('NVDA', 'q', [_article("https://a.com/next", "Nvidia guidance")])  # the deal only survives as a link
+    with sqlite3.connect(db) as conn:
+        conn.execute("DROP TABLE news_fts")
+        conn.execute(
+            "CREATE VIRTUAL TABLE news_fts USING fts5(title, body, symbol UNINDEXED, article_id UNINDEXED, "
+            "first_seen UNINDEXED, tokenize='porter unicode61')"
+        )
+
+    hits = NewsCache(db_path=db).search("chip deal")
+    assert [h['symbols'] for h in hits] == [['MSFT', 'NVDA']]
+
+
+def test_empty_results_are_not_cached_as_fetched(tmp_path):
+    cache = NewsCache(db_path=str(tmp_path / 'market.db'))
+    assert cache.get_or_fetch('PLTR', 'q', lambda: []) == []
+    assert cache.fetched_at('PLTR', 'q') is None
+    # The next lookup searches again instead of serving "no news" for a whole TTL
+    assert [r['title'] for r in cache.get_or_fetch('PLTR', 'q', lambda: [_article("https://a.com/1", "Palantir wins contract")])] == ["Palantir wins contract"]
+
+    cache.ttl_sec = -1
+    assert [r['title'] for r in cache.get_or_fetch('PLTR', 'q', lambda: [])] == ["Palantir wins contract"]
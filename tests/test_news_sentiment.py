@@ -0,0 +1,30 @@
+import numpy as np
+
+from utils.news_sentiment import BEARISH, BULLISH, NEUTRAL, score_headlines
+
+
+def test_scores_and_labels_per_article():
+    result = score_headlines([
+        "Nvidia shares surge after earnings beat estimates",
+        "Tesla stock plunges on recall and weak deliveries",
+        "Apple to hold annual shareholder meeting in March",
+    ])
+    assert list(result.labels) == [BULLISH, BEARISH, NEUTRAL]
+    assert result.scores[0] > 0 > result.scores[1]
+    assert np.all(np.abs(result.scores) <= 1.0)
+    assert list(result.hits) == [2, 3, 0]
+
+
+def test_negation_flips_nearby_words_only_within_article():
+    result = score_headlines(["Company did not beat expectations", "No comment. Profit growth strong"])
+    assert result.scores[0] < 0
+    assert result.labels[1] == BULLISH
+
+
+def test_aggregate_and_empty_batch():
+    overall = score_headlines(["Shares rally to record high", "Stock falls after downgrade"]).aggregate()
+    assert overall['articles'] == 2
+    assert overall['bullish'] == 1 and overall['bearish'] == 1
+    empty = score_headlines([])
+    assert empty.aggregate()['label'] == NEUTRAL
+    assert len(score_headlines(["", "..."]).scores) == 2
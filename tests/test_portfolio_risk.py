@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from utils.portfolio_risk import build_return_matrix, compute_risk, top_correlated_pairs
+
+
+def _prices(returns, start=100.0):
+    return pd.Series(start * np.cumprod(1 + returns))
+
+
+def test_beta_and_correlation_of_levered_copy():
+    rng = np.random.default_rng(42)
+    dates = pd.bdate_range('2024-01-01', periods=250)
+    bench = rng.normal(0, 0.01, 250)
+    closes = {
+        'BENCH': _prices(bench).set_axis(dates),
+        'LEV2X': _prices(2 * bench).set_axis(dates),
+        'NOISE': _prices(rng.normal(0, 0.01, 250)).set_axis(dates),
+    }
+    returns = build_return_matrix(closes)
+    report = compute_risk(returns, benchmark=returns['BENCH'])
+
+    assert abs(report.betas['BENCH'] - 1.0) < 1e-9
+    assert abs(report.betas['LEV2X'] - 2.0) < 0.05
+    assert report.corr.loc['BENCH', 'LEV2X'] > 0.99
+    assert top_correlated_pairs(report.corr, limit=1)[0][:2] == ('BENCH', 'LEV2X')
+
+
+def test_var_ordering():
+    rng = np.random.default_rng(7)
+    returns = pd.DataFrame(rng.normal(0, 0.02, (500, 4)), columns=list('ABCD'))
+    report = compute_risk(returns, confidence=0.95)
+    assert report.hist_var > 0
+    assert report.hist_cvar >= report.hist_var
+    assert report.param_cvar >= report.param_var
+    assert report.cov.shape == (4, 4)
+
+
+def test_build_return_matrix_drops_short_history():
+    dates = pd.bdate_range('2024-01-01', periods=100)
+    closes = {
+        'LONG': pd.Series(np.linspace(100, 120, 100), index=dates),
+        'OTHER': pd.Series(np.linspace(50, 40, 100), index=dates),
+        'NEW': pd.Series([10.0, 11.0], index=dates[-2:]),
+    }
+    returns = build_return_matrix(closes, min_coverage=0.6)
+    assert 'NEW' not in returns.columns
+    assert not returns.isna().any().any()
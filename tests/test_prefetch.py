@@ -0,0 +1,66 @@
+import threading
+
+from utils.prefetch import PrefetchScheduler
+
+
+def test_run_once_isolates_failing_jobs():
+    seen = {}
+    events = []
+
+    def quotes(symbols):
+        seen['quotes'] = symbols
+
+    def bars(symbols):
+        raise RuntimeError("upstream down")
+
+    scheduler = PrefetchScheduler(
+        symbols=lambda: ['AAPL', 'BTC-USD', 'AAPL'],
+        jobs={'bars': bars, 'quotes': quotes},
+        log_event=lambda kind, payload: events.append((kind, payload)),
+    )
+    results = scheduler.run_once()
+
+    assert seen['quotes'] == ['AAPL', 'BTC-USD']
+    assert results['quotes']['ok'] and not results['bars']['ok']
+    assert events == [('PREFETCH_FAILED', {'job': 'bars', 'symbols': 2, 'error': 'upstream down'})]
+    assert scheduler.status()['runs'] == 1
+
+
+def test_daemon_thread_refreshes_until_stopped():
+    rounds = threading.Semaphore(0)
+    scheduler = PrefetchScheduler(
+        symbols=lambda: ['NVDA'],
+        jobs={'quotes': lambda symbols: rounds.release()},
+        interval_sec=60,
+        log_event=lambda kind, payload: None,
+    )
+    scheduler.start()
+    assert rounds.acquire(timeout=5)
+    scheduler.trigger()  # wake up early instead of waiting the full interval
+    assert rounds.acquire(timeout=5)
+    scheduler.stop()
+    assert not scheduler.running
+
+
+def test_zero_interval_disables_scheduler():
+    scheduler = PrefetchScheduler(symbols=lambda: ['AAPL'], interval_sec=0)
+    assert not scheduler.start().running
+
+
+def test_watchlist_edits_trigger_the_prefetcher(tmp_path, monkeypatch):
+    from utils import db
+
+    monkeypatch.setattr(db, 'DB_FILE', str(tmp_path / 'watchlist.db'))
+    monkeypatch.setattr(db, '_watchlist_listeners', [])
+    db.init_db()
+    scheduler = PrefetchScheduler(symbols=lambda: [], log_event=lambda kind, payload: None)
+    db.on_watchlist_change(scheduler.trigger)
+
+    db.add_to_watchlist('NVDA')
+    assert scheduler._wake.is_set()
+    scheduler._wake.clear()
+
+    db.remove_from_watchlist('AAPL')  # not listed: nothing changed, nothing to refresh
+    assert not scheduler._wake.is_set()
+    db.remove_from_watchlist('NVDA')
+    assert scheduler._wake.is_set()
@@ -0,0 +1,106 @@
+import threading
+import time
+
+from utils.quote_cache import QuoteCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_expiry_and_stats():
+    clock = FakeClock()
+    cache = QuoteCache(ttl_sec=10, clock=clock)
+    cache.set('AAPL', {'currentPrice': 1})
+
+    assert cache.get('AAPL') == {'currentPrice': 1}
+    clock.now = 11
+    assert cache.get('AAPL') is None
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['size'] == 0
+
+
+def test_lru_eviction():
+    cache = QuoteCache(max_entries=2)
+    cache.set('A', 1)
+    cache.set('B', 2)
+    cache.get('A')  # A becomes most recently used
+    cache.set('C', 3)
+
+    assert cache.get('B') is None
+    assert cache.get('A') == 1
+    assert cache.get('C') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_get_or_fetch_skips_empty_results():
+    cache = QuoteCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {}
+
+    assert cache.get_or_fetch('X', fetch) == {}
+    assert cache.get_or_fetch('X', fetch) == {}
+    assert len(calls) == 2
+
+
+def test_age_reports_seconds_since_store():
+    clock = FakeClock()
+    cache = QuoteCache(clock=clock)
+    cache.set('A', 1)
+    clock.now = 4
+    assert cache.age('A') == 4
+    assert cache.age('missing') is None
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = QuoteCache()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(timeout=5)
+        return {'currentPrice': 10}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch('NVDA', fetch))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    deadline = time.time() + 5
+    while cache.flights.coalesced < 4 and time.time() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{'currentPrice': 10}] * 5
+    assert cache.stats()['coalesced'] == 4
+
+
+def test_failed_refetch_serves_last_known_value():
+    clock = FakeClock()
+    cache = QuoteCache(ttl_sec=10, clock=clock)
+    cache.set('AAPL', {'currentPrice': 1})
+    clock.now = 11
+
+    def broken():
+        raise RuntimeError("breaker open")
+
+    assert cache.get_or_fetch('AAPL', broken) == {'currentPrice': 1}
+    assert cache.stats()['stale_served'] == 1
+    try:
+        cache.get_or_fetch('MSFT', broken)
+        assert False, "expected the fetch error without a stale value"
+    except RuntimeError:
+        pass
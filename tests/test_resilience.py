@@ -0,0 +1,118 @@
+import pytest
+
+from utils.resilience import (
+    CircuitBreaker, CircuitOpenError, RateLimitedError, TokenBucket, Upstream, backoff_delays, is_transient_error,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_waits_for_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_sec=2, burst=2, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.try_acquire() is False
+    assert bucket.acquire() == pytest.approx(0.5)
+    with pytest.raises(RateLimitedError):
+        bucket.acquire(timeout_sec=0.1)
+
+
+def test_backoff_is_jittered_and_capped():
+    delays = list(backoff_delays(6, base_sec=1, cap_sec=4))
+    assert len(delays) == 6
+    assert all(0 <= d <= min(4, 2 ** i) for i, d in enumerate(delays))
+
+
+def test_breaker_opens_half_opens_and_closes():
+    clock = FakeClock()
+    transitions = []
+    breaker = CircuitBreaker('yf', failure_threshold=2, reset_after_sec=30, clock=clock,
+                             on_transition=lambda name, old, new, info: transitions.append(new))
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    clock.now = 31
+    assert breaker.allow()  # single trial call
+    assert not breaker.allow()
+    breaker.record_success()
+    assert transitions == ['open', 'half_open', 'closed']
+
+
+def test_upstream_retries_then_fails_fast_when_open():
+    clock = FakeClock()
+    events = []
+    upstream = Upstream('ddgs', rate_per_sec=100, burst=100, failure_threshold=3, reset_after_sec=60,
+                        max_retries=5, clock=clock, sleep=clock.sleep,
+                        log_event=lambda kind, payload: events.append((kind, payload)))
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        raise ConnectionError("429")
+
+    with pytest.raises(ConnectionError):
+        upstream.call(flaky)
+    # Retries stop as soon as the breaker opens
+    assert len(calls) == 3
+    with pytest.raises(CircuitOpenError):
+        upstream.call(flaky)
+    assert len(calls) == 3
+    assert events[0][0] == 'CIRCUIT_OPEN'
+    assert events[0][1]['upstream'] == 'ddgs'
+
+    clock.now += 61
+    assert upstream.call(lambda: "ok") == "ok"
+    assert events[-1][0] == 'CIRCUIT_CLOSED'
+    assert upstream.stats()['rejected'] == 1
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = type('Response', (), {'status_code': status_code})()
+
+
+def test_client_and_data_errors_skip_retries_and_breaker():
+    clock = FakeClock()
+    upstream = Upstream('yfinance', rate_per_sec=100, burst=100, failure_threshold=2, reset_after_sec=30,
+                        max_retries=3, clock=clock, sleep=clock.sleep, log_event=lambda *a: None)
+    calls = []
+
+    def bad_symbol(error):
+        calls.append(1)
+        raise error
+
+    for error in (_HTTPError(404), KeyError('regularMarketPrice'), _HTTPError(404), ValueError('no data')):
+        with pytest.raises(type(error)):
+            upstream.call(bad_symbol, error)
+    assert len(calls) == 4
+    assert upstream.breaker.state == CircuitBreaker.CLOSED
+    assert upstream.stats()['failures'] == 0
+
+    # Throttling and 5xx are still retried and open the breaker
+    with pytest.raises(_HTTPError):
+        upstream.call(bad_symbol, _HTTPError(429))
+    assert len(calls) == 6
+    assert upstream.breaker.state == CircuitBreaker.OPEN
+
+
+def test_is_transient_error_classification():
+    assert is_transient_error(ConnectionError())
+    assert is_transient_error(TimeoutError())
+    assert is_transient_error(_HTTPError(503))
+    assert is_transient_error(Exception("Too Many Requests. Rate limited. Try after a while."))
+    assert not is_transient_error(_HTTPError(404))
+    assert not is_transient_error(KeyError('currentPrice'))
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from utils.scoring import BUY, HOLD, NO_DATA, SELL, momentum_factor, score_watchlist, volatility_factor
+
+
+def test_labels_follow_range_position_thresholds():
+    result = score_watchlist(
+        price=[110, 130, 150, 170, 190, 0],
+        low_52w=[100] * 6,
+        high_52w=[200] * 6,
+    )
+    assert list(result.labels) == [BUY, HOLD, HOLD, HOLD, SELL, NO_DATA]
+    assert result.scores[0] == pytest.approx(0.8)
+    assert np.isnan(result.position[-1])
+
+
+def test_flat_range_has_no_recommendation():
+    result = score_watchlist([100], [100], [100])
+    assert list(result.labels) == [NO_DATA]
+
+
+def test_extra_factors_blend_into_the_score():
+    base = score_watchlist([140, 140], [100, 100], [200, 200])
+    blended = score_watchlist(
+        [140, 140], [100, 100], [200, 200],
+        factors={
+            'momentum': (momentum_factor([0.3, np.nan]), 1.0),
+            'volatility': (volatility_factor([0.2, 0.2]), 0.5),
+        },
+    )
+    # Strong momentum lifts the first symbol to BUY; a missing factor value is ignored
+    assert list(base.labels) == [HOLD, HOLD]
+    assert blended.labels[0] == BUY
+    assert blended.scores[1] == base.scores[1] / 1.5
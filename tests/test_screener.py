@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from utils.screener import (
+    UniverseStore, build_universe_frame, carry_forward_fundamentals, evaluate_filter, missing_fundamentals, screen,
+)
+
+
+def _universe():
+    quotes = {
+        'AAA': {'price': 105.0, 'previous_close': 100.0, 'low_52w': 100.0, 'high_52w': 200.0},
+        'BBB': {'price': 190.0, 'previous_close': 200.0, 'low_52w': 100.0, 'high_52w': 200.0},
+        'CCC': {'price': 52.0, 'previous_close': 50.0, 'low_52w': 50.0, 'high_52w': 80.0},
+        'BTC-USD': {'price': 60000.0, 'previous_close': 59000.0, 'low_52w': 40000.0, 'high_52w': 70000.0},
+    }
+    infos = {
+        'AAA': {'shortName': 'Alpha', 'trailingPE': 15.0, 'marketCap': 5e9, 'sector': 'Technology'},
+        'BBB': {'shortName': 'Beta', 'trailingPE': 12.0, 'marketCap': 9e9},
+        'CCC': {'shortName': 'Gamma', 'trailingPE': 35.0, 'marketCap': 1e9},
+        'BTC-USD': {'shortName': 'Bitcoin USD', 'marketCap': 1e12},
+    }
+    return build_universe_frame(quotes, quotes, infos)
+
+
+def test_build_universe_frame_derives_52_week_columns():
+    frame = _universe().set_index('symbol')
+    assert frame.loc['AAA', 'pct_above_low'] == pytest.approx(5.0)
+    assert frame.loc['BBB', 'pct_below_high'] == pytest.approx(5.0)
+    assert frame.loc['BBB', 'position_52w'] == pytest.approx(0.9)
+    assert frame.loc['BTC-USD', 'asset_class'] == 'crypto'
+    assert np.isnan(frame.loc['BTC-USD', 'pe'])
+
+
+def test_screen_filters_and_ranks():
+    frame = _universe()
+    result = screen(frame, "pct_above_low <= 10 and pe < 20")
+    assert list(result['symbol']) == ['AAA']
+
+    # NaN P/E never matches; chained comparisons and string columns work
+    assert list(screen(frame, "10 < pe < 40", sort_by="pe")['symbol']) == ['BBB', 'AAA', 'CCC']
+    assert list(screen(frame, "asset_class == 'crypto'")['symbol']) == ['BTC-USD']
+    assert list(screen(frame, "", limit=2)['symbol']) == ['BTC-USD', 'BBB']
+
+
+@pytest.mark.parametrize("expression", ["__import__('os')", "pe.real > 1", "unknown > 1", "pe >"])
+def test_evaluate_filter_rejects_unsafe_or_unknown_expressions(expression):
+    with pytest.raises(ValueError):
+        evaluate_filter(_universe(), expression)
+
+
+def test_universe_store_round_trip(tmp_path):
+    store = UniverseStore(db_path=str(tmp_path / 'market.db'))
+    assert store.is_stale()
+    store.save(_universe())
+
+    reloaded = UniverseStore(db_path=str(tmp_path / 'market.db')).load()
+    assert len(reloaded) == 4
+    assert reloaded.set_index('symbol').loc['AAA', 'pe'] == 15.0
+    assert not store.is_stale()
+
+
+def test_carry_forward_keeps_previous_fundamentals_for_failed_lookups():
+    previous = _universe()
+    quotes = {'AAA': {'price': 110.0, 'previous_close': 105.0, 'low_52w': 100.0, 'high_52w': 200.0}}
+    fresh = build_universe_frame(['AAA', 'CCC'], quotes, {'CCC': {'trailingPE': 30.0}})
+    assert list(fresh.loc[missing_fundamentals(fresh), 'symbol']) == ['AAA']
+
+    merged = carry_forward_fundamentals(fresh, previous, ['AAA']).set_index('symbol')
+    assert merged.loc['AAA', 'pe'] == 15.0
+    assert merged.loc['AAA', 'name'] == 'Alpha'
+    assert merged.loc['AAA', 'price'] == 110.0
+    assert merged.loc['CCC', 'pe'] == 30.0
+
+
+def test_screen_stocks_serves_stale_snapshot_and_refreshes_in_background(tmp_path, monkeypatch):
+    import threading
+
+    from tools import screener_tools
+    from utils import screener
+
+    store = UniverseStore(db_path=str(tmp_path / 'market.db'))
+    frame = _universe()
+    frame.loc[frame['symbol'] == 'CCC', list(screener.INFO_FIELDS)] = np.nan
+    store.save(frame)
+    store._updated_at -= 3 * 24 * 3600
+    monkeypatch.setattr(screener_tools, 'get_universe_store', lambda: store)
+
+    release, started = threading.Event(), threading.Event()
+
+    def slow_refresh(symbols=None):
+        started.set()
+        release.wait(5)
+
+    monkeypatch.setattr(screener_tools, 'refresh_universe', slow_refresh)
+    try:
+        out = screener_tools.screen_stocks("pct_above_low <= 10")
+        assert started.wait(2)
+        assert "3d old" in out
+        assert "AAA" in out
+        assert "1 of 4 symbols have no fundamentals" in out and "CCC" in out
+        # A second call does not start another refresh while one is running
+        assert not screener_tools.refresh_universe_in_background()
+    finally:
+        release.set()
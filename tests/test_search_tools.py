@@ -0,0 +1,75 @@
+import time
+
+from tools import search_tools
+import utils.db
+
+
+def test_watchlist_news_is_concurrent_uncapped_and_in_order(monkeypatch):
+    tickers = ['AAPL', 'MSFT', 'NVDA', 'AMD', 'TSLA', 'META', 'AMZN']
+    monkeypatch.setattr(utils.db, 'get_watchlist', lambda: [(t, None) for t in tickers])
+    monkeypatch.setattr(search_tools, 'WATCHLIST_NEWS_WORKERS', len(tickers))
+
+    def fake_news(symbol):
+        time.sleep(0.2)
+        return f"news for {symbol}"
+
+    monkeypatch.setattr(search_tools, 'get_company_news', fake_news)
+    started = time.monotonic()
+    out = search_tools.get_watchlist_news()
+    assert time.monotonic() - started < 0.2 * 3
+    positions = [out.index(f"### {t}\nnews for {t}") for t in tickers]
+    assert positions == sorted(positions)
+    assert "first 5" not in out
+
+
+def test_watchlist_news_reports_slow_ticker_without_dropping_others(monkeypatch):
+    monkeypatch.setattr(utils.db, 'get_watchlist', lambda: [('AAPL', None), ('SLOW', None)])
+    monkeypatch.setattr(search_tools, 'WATCHLIST_NEWS_TIMEOUT_SEC', 0.1)
+
+    def fake_news(symbol):
+        if symbol == 'SLOW':
+            time.sleep(1.0)
+        return f"news for {symbol}"
+
+    monkeypatch.setattr(search_tools, 'get_company_news', fake_news)
+    out = search_tools.get_watchlist_news()
+    assert "news for AAPL" in out
+    assert "News search for SLOW did not finish (timeout)" in out
+
+
+def _result(url, title, body):
+    return {'href': url, 'title': title, 'body': body}
+
+
+RELEVANT = [
+    _result("https://www.reuters.com/a", "Nvidia shares jump after earnings beat", "Revenue rose as analysts raised price targets."),
+    _result("https://blog.example.com/b", "NVDA stock: is it a buy before earnings?", "Investors weigh valuation and growth."),
+    _result("https://www.fool.com/c", "Is Nvidia a buy?", "The company reported a record quarter and strong sales."),
+]
+JUNK = [
+    _result("https://www.nvidia.com/download/driverResults.aspx/1", "NVIDIA GeForce Game Ready Driver", "Download the latest driver."),
+    _result("https://support.nvidia.com/x", "Nvidia stock support", "Shares of your account settings."),
+    _result("https://example.com/review", "NVIDIA RTX 5090 review", "Benchmarks show big gains in games."),
+]
+
+
+def test_relevance_filter_drops_blocked_and_off_topic_results():
+    kept = search_tools.filter_relevant_news(RELEVANT + JUNK, 'NVDA')
+    assert [r['href'] for r in kept] == [r['href'] for r in RELEVANT]
+
+
+def test_overfetches_when_too_few_results_survive_and_logs_ratio(monkeypatch):
+    calls, events = [], []
+
+    def fake_search(symbol, max_results=search_tools.NEWS_MAX_RESULTS):
+        calls.append(max_results)
+        return JUNK + RELEVANT[:1] + [JUNK[0]] if max_results == search_tools.NEWS_MAX_RESULTS else JUNK + RELEVANT
+
+    monkeypatch.setattr(search_tools, 'search_company_news', fake_search)
+    monkeypatch.setattr(search_tools, 'log_system_event', lambda kind, payload: events.append((kind, payload)))
+    kept = search_tools.relevant_company_news('NVDA')
+    assert calls == [search_tools.NEWS_MAX_RESULTS, search_tools.OVERFETCH_MAX_RESULTS]
+    assert len(kept) == 3
+    kind, payload = events[-1]
+    assert kind == 'NEWS_FILTERED'
+    assert payload['fetched'] == 11 and payload['kept'] == 3 and payload['overfetched'] is True
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from utils.sentiment_cache import SentimentCache
+
+
+def test_sentiment_cache_persists_across_instances(tmp_path):
+    db = str(tmp_path / 'market.db')
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {'score': 72, 'label': 'Greed'}
+
+    first = SentimentCache('fng', fetch=fetch, db_path=db)
+    assert first.get()['score'] == 72
+
+    # A new process would build a new cache: it must serve the stored value without fetching
+    def failing_fetch():
+        raise RuntimeError('offline')
+
+    second = SentimentCache('fng', fetch=failing_fetch, db_path=db)
+    assert second.get()['label'] == 'Greed'
+    assert len(calls) == 1
+
+
+def test_sentiment_cache_serves_stale_and_refreshes_in_background(tmp_path):
+    db = str(tmp_path / 'market.db')
+    values = iter([{'score': 20, 'label': 'Fear'}, {'score': 80, 'label': 'Extreme Greed'}])
+    cache = SentimentCache('fng', fetch=lambda: next(values), ttl_sec=0, db_path=db)
+
+    assert cache.get()['score'] == 20
+    time.sleep(0.01)
+    # Stale: old value is returned immediately, refresh happens off-thread
+    assert cache.get()['score'] == 20
+    for _ in range(100):
+        if cache.last_known()['score'] == 80:
+            break
+        time.sleep(0.01)
+    assert cache.last_known()['score'] == 80
+
+
+def test_sentiment_cache_first_fetch_failure_raises(tmp_path):
+    def failing_fetch():
+        raise RuntimeError('offline')
+
+    cache = SentimentCache('fng', fetch=failing_fetch, db_path=str(tmp_path / 'm.db'))
+    with pytest.raises(RuntimeError):
+        cache.get()
+    assert cache.last_known() is None
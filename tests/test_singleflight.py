@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+from utils.singleflight import SingleFlight
+
+
+def test_sequential_calls_are_not_coalesced():
+    flights = SingleFlight()
+    assert flights.do('a', lambda: 1) == 1
+    assert flights.do('a', lambda: 2) == 2
+    assert flights.stats()['executed'] == 2
+    assert flights.stats()['coalesced'] == 0
+
+
+def test_followers_receive_leader_error():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(timeout=5)
+        raise RuntimeError("upstream down")
+
+    errors = []
+
+    def call():
+        try:
+            flights.do('AAPL', failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(timeout=5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    while flights.stats()['coalesced'] < 1:
+        pass
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert errors == ["upstream down", "upstream down"]
+    assert flights.in_flight() == 0
+    with pytest.raises(ValueError):
+        flights.do('AAPL', lambda: (_ for _ in ()).throw(ValueError("next call runs fresh")))
@@ -0,0 +1,60 @@
+from utils.memory import extract_entities_from_text
+from utils.symbol_master import SymbolMaster, SymbolRecord, get_symbol_master, normalize_name
+
+
+def test_lookup_by_ticker_name_and_alias():
+    master = get_symbol_master()
+    assert master.lookup('aapl').ticker == 'AAPL'
+    assert master.lookup('Apple').ticker == 'AAPL'
+    assert master.lookup('Bitcoin').ticker == 'BTC-USD'
+    assert master.lookup('BTC').asset_class == 'crypto'
+    assert master.lookup('definitely not a company') is None
+
+
+def test_prefix_and_fuzzy_search():
+    master = SymbolMaster([
+        SymbolRecord('MSFT', 'Microsoft Corporation', 'equity', 'NASDAQ'),
+        SymbolRecord('MU', 'Micron Technology Inc.', 'equity', 'NASDAQ'),
+        SymbolRecord('NVDA', 'NVIDIA Corporation', 'equity', 'NASDAQ'),
+    ])
+    assert {r.ticker for r in master.search('micro')} == {'MSFT', 'MU'}
+    assert master.search('nvidai')[0].ticker == 'NVDA'
+
+
+def test_normalize_name_strips_corporate_suffixes():
+    assert normalize_name('The Walt Disney Company') == 'walt disney'
+    assert normalize_name('Apple Inc.') == 'apple'
+
+
+def test_extractor_drops_false_positive_tickers():
+    ents = extract_entities_from_text('I think AND USD look fine, but NVDA and $AMD? Also Link the chart.')
+    assert ents['tickers'] == ['AMD', 'NVDA']
+
+
+def test_extractor_resolves_company_names():
+    ents = extract_entities_from_text('Should I buy Nvidia or Apple? What about Bitcoin')
+    assert ents['tickers'] == ['AAPL', 'BTC-USD', 'NVDA']
+
+
+def test_extractor_ignores_common_word_names_and_abbreviations():
+    assert extract_entities_from_text('Target price for NVDA is 200')['tickers'] == ['NVDA']
+    assert extract_entities_from_text('Block trades hit AAPL')['tickers'] == ['AAPL']
+    assert extract_entities_from_text('Meta analysis of GOOGL')['tickers'] == ['GOOGL']
+    assert extract_entities_from_text('Ripple effect')['tickers'] == []
+    assert extract_entities_from_text('MS Office')['tickers'] == []
+
+
+def test_extractor_accepts_ambiguous_symbols_in_ticker_context():
+    assert extract_entities_from_text('How is Target stock doing?')['tickers'] == ['TGT']
+    assert extract_entities_from_text('Shares of Block Inc. fell')['tickers'] == ['SQ']
+    assert extract_entities_from_text('Is MS stock a buy? And $HD?')['tickers'] == ['HD', 'MS']
+    assert extract_entities_from_text('Meta Platforms earnings')['tickers'] == ['META']
+
+
+def test_extractor_keeps_marked_tickers_missing_from_master():
+    assert extract_entities_from_text('Compare PLTR with $ROKU and SOFI stock')['tickers'] == ['PLTR', 'ROKU', 'SOFI']
+
+
+def test_extractor_ignores_shouted_words_missing_from_master():
+    ents = extract_entities_from_text('WHAT IS GOING ON WITH NVDA? HELP, is the NYSE open? HODL')
+    assert ents['tickers'] == ['NVDA']
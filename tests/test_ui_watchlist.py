@@ -0,0 +1,21 @@
+from ui import layout
+
+
+def test_refresh_watchlist_rows_reuses_unchanged_row_html(monkeypatch):
+    quotes = {
+        'AAPL': {'price': 150.0, 'low_52w': 100.0, 'high_52w': 200.0},
+        'NVDA': {'price': 190.0, 'low_52w': 100.0, 'high_52w': 200.0},
+    }
+    monkeypatch.setattr(layout, 'get_batch_quotes', lambda tickers: {k: dict(v) for k, v in quotes.items()})
+    monkeypatch.setattr(layout, 'get_ticker_names', lambda tickers, max_len=20: {t: t for t in tickers})
+    watchlist = [('AAPL', '2025-01-02T10:00:00'), ('NVDA', '2025-01-03T10:00:00')]
+
+    rows = layout.refresh_watchlist_rows(watchlist, {})
+    assert rows['NVDA']['rec'] == "🔴 SELL"
+
+    quotes['AAPL']['price'] = 110.0
+    new_rows = layout.refresh_watchlist_rows(watchlist, rows)
+    assert new_rows['NVDA'] is rows['NVDA']
+    assert new_rows['AAPL'] is not rows['AAPL']
+    assert new_rows['AAPL']['rec'] == "🟢 BUY"
+    assert "$110.00" in new_rows['AAPL']['html']
@@ -0,0 +1,98 @@
+from typing import Dict, List, Optional
+
+from tools.data_tools import get_price_history, normalize_ticker
+from utils.backtest import RULES, run_grid
+from utils.fan_out import fan_out
+from utils.indicators import align_by_bar
+from utils.scoring import BUY_BELOW, SELL_ABOVE
+
+# Thresholds the sidebar and watchlist summary use for BUY/SELL labels
+SIDEBAR_RULE = {'buy_below': BUY_BELOW, 'sell_above': SELL_ABOVE, 'lookback': 252}
+
+
+def _pct(value) -> str:
+    return "N/A" if value is None or value != value else f"{value * 100:.1f}%"
+
+def _ratio(value) -> str:
+    # Zero-variance (never-trading or flat) runs have no Sharpe ratio
+    return "n/a" if value is None or value != value else f"{value:.2f}"
+
+def backtest_signal_rule(
+    rule: str = "range_position",
+    symbols: Optional[List[str]] = None,
+    period: str = "5y",
+    grid: Optional[Dict[str, List[float]]] = None,
+    cost_bps: float = 5.0,
+) -> str:
+    """
+    Backtests a signal rule over local price history for many symbols and a parameter grid
+    at once, reporting return, Sharpe, hit rate and drawdown per parameter set.
+    Default rule is the sidebar's 52-week-position rule (BUY below 0.3, SELL above 0.7).
+    Use when user asks how the BUY/HOLD/SELL rule (or a trading rule) has performed.
+
+    Args:
+        rule (str): 'range_position' (buy_below, sell_above, lookback), 'sma_cross' (fast, slow)
+            or 'rsi_reversion' (oversold, overbought, window)
+        symbols (List[str]): Tickers to test. Empty = watchlist.
+        period (str): History window (default '5y'; the 52-week rule needs > 1y)
+        grid (Dict[str, List[float]]): Optional parameter values, e.g. {'buy_below': [0.2, 0.3]}
+        cost_bps (float): Trading cost per position change in basis points (default 5)
+    """
+    try:
+        if rule not in RULES:
+            return f"❌ Unknown rule '{rule}'. Available: {', '.join(RULES)}"
+        if isinstance(symbols, str):
+            symbols = [s for s in symbols.replace(',', ' ').split() if s]
+        if not symbols:
+            from utils.db import get_watchlist
+            symbols = [ticker for ticker, _ in get_watchlist()]
+        tickers = list(dict.fromkeys(normalize_ticker(s)[0] for s in symbols))
+        if not tickers:
+            return "📋 No symbols given and your watchlist is empty."
+
+        loaded = fan_out(lambda sym: get_price_history(sym, period=period), tickers, timeout_sec=30.0)
+        closes = {
+            sym: df['Close'].dropna() for sym, df in loaded.results.items()
+            if df is not None and not df.empty and df['Close'].notna().any()
+        }
+        if not closes:
+            return f"⚠️ No price history available for {', '.join(tickers)}."
+        # Stocks and crypto trade on different calendars; align on each symbol's own bars
+        close = align_by_bar(closes)
+
+        result = run_grid(close, rule=rule, grid=grid, cost_bps=cost_bps)
+        summary_df = result.summary()
+        names = result.param_names
+
+        summary = f"**🧪 Backtest: {rule}** ({len(closes)} symbols × {len(summary_df)} parameter sets, {period}, {cost_bps:g} bps costs)\n\n"
+        summary += "| " + " | ".join(names) + " | Total Return | Ann. Return | Sharpe | Hit Rate | Max Drawdown | Trades/Symbol |\n"
+        summary += "|" + "---|" * (len(names) + 6) + "\n"
+        for params, row in summary_df.head(10).iterrows():
+            params = params if isinstance(params, tuple) else (params,)
+            summary += (
+                "| " + " | ".join(f"{p:g}" for p in params)
+                + f" | {_pct(row['total_return'])} | {_pct(row['ann_return'])} | {_ratio(row['sharpe'])}"
+                + f" | {_pct(row['hit_rate'])} | {_pct(row['max_drawdown'])} | {row['trades']:.1f} |\n"
+            )
+
+        if rule == 'range_position':
+            key = tuple(SIDEBAR_RULE.get(n) for n in names)
+            if key in summary_df.index:
+                current = summary_df.loc[key]
+                rank = list(summary_df.index).index(key) + 1
+                summary += (
+                    f"\n**Current sidebar rule (BUY < 0.3, SELL > 0.7):** rank {rank}/{len(summary_df)}, "
+                    f"Sharpe {_ratio(current['sharpe'])}, total return {_pct(current['total_return'])}, "
+                    f"hit rate {_pct(current['hit_rate'])}, max drawdown {_pct(current['max_drawdown'])}.\n"
+                )
+
+        buy_hold = result.stats.drop_duplicates('symbol')['buy_hold_return'].mean()
+        summary += f"\n_Buy-and-hold baseline (average across symbols): {_pct(buy_hold)}. Past performance does not guarantee future results._"
+        skipped = [t for t in tickers if t not in closes]
+        if skipped:
+            summary += f"\n_No history for: {', '.join(skipped)}._"
+        return summary
+    except ValueError as e:
+        return f"❌ Invalid backtest: {str(e)}"
+    except Exception as e:
+        return f"❌ Error running backtest: {str(e)}"
@@ -1,8 +1,23 @@
-import yfinance as yf
+import re
+import time
 import streamlit as st
 import plotly.graph_objects as go
-from typing import Optional
-import requests
+from typing import Dict, List, Optional
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from utils.quote_cache import get_quote_cache
+from utils.fan_out import fan_out
+from utils.history_store import HistoryStore
+from utils.sentiment_cache import SentimentCache
+from utils.downsample import downsample_recent_full
+from utils.indicators import compute_indicator_panel
+from utils.symbol_master import get_symbol_master
+from utils.market_providers import get_provider
+from utils.singleflight import get_single_flight
+from utils.prefetch import PrefetchScheduler, prefetch_interval_from_env
+from utils.scoring import HOLD, NO_DATA, score_watchlist
+from utils.fundamentals_store import PRICE_DERIVED_FIELDS, FundamentalsStore
 
 # Crypto ticker normalization
 CRYPTO_SYMBOLS = {
@@ -33,30 +48,238 @@ def normalize_ticker(symbol: str) -> tuple[str, bool]:
     if symbol_upper in CRYPTO_SYMBOLS:
         return CRYPTO_SYMBOLS[symbol_upper], True
     
+    # Resolve tickers and company names via the offline symbol master ('Apple' -> AAPL)
+    record = get_symbol_master().lookup(symbol)
+    if record is not None:
+        return record.ticker, record.asset_class == 'crypto'
+    
     # Otherwise, assume it's a stock
     return symbol_upper, False
 
+def get_ticker_info(symbol: str) -> dict:
+    """
+    Returns the provider's info dict for `symbol`, served from the shared quote cache.
+    All tools (and the sidebar) should use this instead of calling the provider directly.
+    """
+    key = ('info', symbol.upper().strip())
+    return get_quote_cache().get_or_fetch(key, lambda: get_provider().get_info(symbol))
+
+# Company names practically never change; keep them much longer than quotes
+NAME_TTL_SEC = 24 * 60 * 60
+
+def get_ticker_name(symbol: str, max_len: int = 20) -> str:
+    """Returns the (truncated) short name for `symbol`, or the symbol itself if unavailable."""
+    cache = get_quote_cache()
+    key = ('name', symbol.upper().strip())
+    name = cache.get(key)
+    if name is None:
+        try:
+            name = get_ticker_info(symbol).get('shortName') or symbol
+        except Exception:
+            name = symbol
+        if name != symbol:
+            cache.set(key, name, NAME_TTL_SEC)
+    return name[:max_len]
+
+def get_ticker_names(symbols: List[str], max_len: int = 20) -> Dict[str, str]:
+    """
+    Looks up short names for many symbols concurrently (bounded pool, per-ticker timeout).
+    Symbols that fail or time out map to the symbol itself.
+    """
+    lookup = fan_out(lambda sym: get_ticker_name(sym, max_len=max_len), symbols)
+    return {sym: lookup.results.get(sym, sym[:max_len]) for sym in symbols}
+
+# Symbols per bulk provider download in get_batch_quotes
+QUOTE_BATCH_SIZE = 50
+
+def _quote_from_bars(bars) -> Optional[dict]:
+    """Builds a quote dict (price, previous close, 52-week range) from daily OHLC bars."""
+    closes = bars['Close'].dropna()
+    if closes.empty:
+        return None
+    price = float(closes.iloc[-1])
+    prev_close = float(closes.iloc[-2]) if len(closes) > 1 else price
+    low_52w = bars['Low'].min()
+    high_52w = bars['High'].max()
+    # All-NaN Low/High columns yield NaN; fall back to the close range
+    if low_52w != low_52w or high_52w != high_52w:
+        low_52w, high_52w = closes.min(), closes.max()
+    return {
+        'price': price,
+        'previous_close': prev_close,
+        'low_52w': float(low_52w),
+        'high_52w': float(high_52w),
+    }
+
+def _quote_from_info(info: dict) -> Optional[dict]:
+    """Builds the same quote dict as _quote_from_bars from a `Ticker.info` payload."""
+    price = info.get('currentPrice', info.get('regularMarketPrice'))
+    if not isinstance(price, (int, float)):
+        return None
+    return {
+        'price': float(price),
+        'previous_close': float(info.get('previousClose') or price),
+        'low_52w': float(info.get('fiftyTwoWeekLow') or price),
+        'high_52w': float(info.get('fiftyTwoWeekHigh') or price),
+    }
+
+def get_batch_quotes(symbols: List[str], ttl_sec: Optional[float] = None, refresh: bool = False) -> Dict[str, dict]:
+    """
+    Fetches price, previous close and 52-week range for many symbols in bulk.
+    One bulk download per QUOTE_BATCH_SIZE symbols replaces N `Ticker.info` calls;
+    results are kept in the shared quote cache for `ttl_sec` (cache default if None).
+    `refresh=True` skips cached quotes (used by the background prefetcher).
+    Returns: {SYMBOL: {'price', 'previous_close', 'low_52w', 'high_52w'}} (failed symbols omitted)
+    """
+    cache = get_quote_cache()
+    quotes: Dict[str, dict] = {}
+    missing: List[str] = []
+    for sym in dict.fromkeys(s.upper().strip() for s in symbols if s):
+        cached = None if refresh else cache.get(('quote', sym))
+        if cached is not None:
+            quotes[sym] = cached
+        else:
+            missing.append(sym)
+
+    for start in range(0, len(missing), QUOTE_BATCH_SIZE):
+        chunk = missing[start:start + QUOTE_BATCH_SIZE]
+        try:
+            frame = get_provider().download(chunk, period="1y", interval="1d")
+        except Exception:
+            continue
+        if frame is None or frame.empty:
+            continue
+        multi = getattr(frame.columns, 'nlevels', 1) > 1
+        for sym in chunk:
+            try:
+                if multi:
+                    if sym not in frame.columns.get_level_values(0):
+                        continue
+                    bars = frame[sym]
+                elif len(chunk) == 1:
+                    bars = frame
+                else:
+                    continue
+                quote = _quote_from_bars(bars)
+            except (KeyError, IndexError, ValueError):
+                continue
+            if quote:
+                cache.set(('quote', sym), quote, ttl_sec)
+                quotes[sym] = quote
+
+    # Symbols the bulk request could not cover fall back to concurrent per-ticker info lookups
+    leftovers = [sym for sym in missing if sym not in quotes]
+    if leftovers:
+        fallback = fan_out(lambda sym: _quote_from_info(get_ticker_info(sym)), leftovers)
+        for sym, quote in fallback.results.items():
+            if quote:
+                cache.set(('quote', sym), quote, ttl_sec)
+                quotes[sym] = quote
+
+    # Upstream throttled or its breaker is open: last known quotes beat blank rows
+    for sym in missing:
+        if sym not in quotes:
+            stale = cache.get_stale(('quote', sym))
+            if stale is not None:
+                quotes[sym] = stale
+    return quotes
+
+_history_store: Optional[HistoryStore] = None
+
+def get_history_store() -> HistoryStore:
+    """Returns the process-wide local OHLCV store (created on first use)."""
+    global _history_store
+    if _history_store is None:
+        _history_store = HistoryStore(
+            fetch=lambda sym, **kwargs: get_provider().get_history(sym, **kwargs),
+            reference_date=lambda sym, interval: get_provider().reference_date(sym, interval),
+        )
+    return _history_store
+
+def get_price_history(symbol: str, period: str = "1y", interval: str = "1d"):
+    """
+    Returns OHLCV bars for `symbol` from the local history store.
+    Only bars newer than the last stored one are downloaded, and concurrent
+    requests for the same symbol/period share one download.
+    """
+    key = ('history', symbol.upper().strip(), period, interval)
+    return get_single_flight().do(key, lambda: get_history_store().get_history(symbol, period=period, interval=interval))
+
+def _watchlist_tickers() -> List[str]:
+    from utils.db import get_watchlist
+    return [ticker for ticker, _ in get_watchlist()]
+
+def _prefetch_quotes(tickers: List[str], ttl_sec: float) -> None:
+    get_batch_quotes(tickers, ttl_sec=ttl_sec, refresh=True)
+    get_ticker_names(tickers)
+
+def _prefetch_daily_bars(tickers: List[str]) -> None:
+    symbols = list(dict.fromkeys(normalize_ticker(t)[0] for t in tickers))
+    fan_out(lambda sym: get_price_history(sym, period="1y", interval="1d"), symbols, timeout_sec=30.0)
+
+_prefetcher: Optional[PrefetchScheduler] = None
+
+def get_watchlist_prefetcher() -> PrefetchScheduler:
+    """
+    Returns the process-wide watchlist prefetcher (not started).
+    Quotes are cached until shortly after the next round, so readers between rounds stay warm.
+    """
+    global _prefetcher
+    if _prefetcher is None:
+        interval = prefetch_interval_from_env()
+        quote_ttl = max(interval, 0) + get_quote_cache().ttl_sec
+        _prefetcher = PrefetchScheduler(
+            symbols=_watchlist_tickers,
+            jobs={
+                'quotes': lambda tickers: _prefetch_quotes(tickers, quote_ttl),
+                'daily_bars': _prefetch_daily_bars,
+            },
+            interval_sec=interval,
+        )
+        # Warm newly added tickers now instead of at the next round
+        from utils.db import on_watchlist_change
+        on_watchlist_change(_prefetcher.trigger)
+    return _prefetcher
+
+# The index is published once a day; refresh a few times a day in the background
+FEAR_GREED_TTL_SEC = 6 * 60 * 60
+
+def _fetch_fear_greed() -> dict:
+    """Fetches the current Crypto Fear & Greed Index through the market-data provider."""
+    return get_provider().get_fear_greed()
+
+_sentiment_cache: Optional[SentimentCache] = None
+
+def get_sentiment_cache() -> SentimentCache:
+    """Returns the process-wide Fear & Greed cache (created on first use)."""
+    global _sentiment_cache
+    if _sentiment_cache is None:
+        _sentiment_cache = SentimentCache('fear_greed', fetch=_fetch_fear_greed, ttl_sec=FEAR_GREED_TTL_SEC)
+    return _sentiment_cache
+
 def get_crypto_sentiment() -> dict:
     """
-    Fetches the Crypto Fear & Greed Index from alternative.me API.
-    Returns sentiment score (0-100) and label.
+    Returns the Crypto Fear & Greed Index (alternative.me) from a persistent
+    stale-while-revalidate cache: sentiment score (0-100) and label.
     """
+    cache = get_sentiment_cache()
     try:
-        response = requests.get('https://api.alternative.me/fng/', timeout=5)
-        data = response.json()
-        score = int(data['data'][0]['value'])
-        label = data['data'][0]['value_classification']
-        return {
-            'score': score,
-            'label': label,
-            'interpretation': get_sentiment_interpretation(score)
-        }
+        snapshot = cache.get()
     except Exception:
+        # Upstream down and nothing fresh: fall back to the last real value
+        snapshot = cache.last_known()
+    
+    if snapshot:
         return {
-            'score': 50,
-            'label': 'Neutral',
-            'interpretation': 'Unable to fetch sentiment data'
+            'score': snapshot['score'],
+            'label': snapshot['label'],
+            'interpretation': get_sentiment_interpretation(snapshot['score'])
         }
+    return {
+        'score': 50,
+        'label': 'Neutral',
+        'interpretation': 'Unable to fetch sentiment data'
+    }
 
 def get_sentiment_interpretation(score: int) -> str:
     """Interpret sentiment score for risk management."""
@@ -71,75 +294,99 @@ def get_sentiment_interpretation(score: int) -> str:
     else:
         return "💎 **EXTREME FEAR** - Capitulation zone. Strong buying opportunity for risk-tolerant investors."
 
-def get_market_data(symbol: str) -> str:
+@dataclass
+class MarketMetrics:
+    """Typed market snapshot for one symbol; rendered to markdown by the profile formatters."""
+    symbol: str
+    name: str
+    is_crypto: bool
+    price: Optional[float]
+    currency: str = 'USD'
+    pe_ratio: Optional[float] = None
+    market_cap: Optional[float] = None
+    eps: Optional[float] = None
+    low_52w: Optional[float] = None
+    high_52w: Optional[float] = None
+    volume_24h: Optional[float] = None
+
+    @property
+    def ath_distance_pct(self) -> Optional[float]:
+        """Percent below the 52-week high (used as ATH proxy for crypto)."""
+        high = self.high_52w if self.high_52w is not None else self.price
+        if self.price is None or not high or high <= 0:
+            return None
+        return ((high - self.price) / high) * 100
+
+    @property
+    def volatility_pct(self) -> Optional[float]:
+        """Width of the 52-week range relative to the 52-week low."""
+        low = self.low_52w if self.low_52w is not None else self.price
+        high = self.high_52w if self.high_52w is not None else self.price
+        if low is None or high is None or low <= 0:
+            return None
+        return ((high - low) / low) * 100
+
+def _num(value) -> Optional[float]:
+    """Returns `value` as float if it is a real number, else None ('N/A', 'Infinity', None...)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+def _fmt(value: Optional[float], spec: str = ".2f", prefix: str = "") -> str:
+    """Formats an optional number, rendering missing values as 'N/A'."""
+    return f"{prefix}{value:{spec}}" if value is not None else "N/A"
+
+def fetch_market_metrics(symbol: str) -> MarketMetrics:
     """
-    Fetches market data for stocks OR crypto (context-aware).
-    For stocks: Returns P/E, Market Cap, etc.
-    For crypto: Returns Sentiment, Volatility, ATH distance.
+    Fetches a typed market snapshot for a stock or crypto symbol.
+    Raises ValueError when the upstream returns no usable price.
     """
     normalized_symbol, is_crypto = normalize_ticker(symbol)
+    info = get_ticker_info(normalized_symbol)
     
-    try:
-        stock = yf.Ticker(normalized_symbol)
-        info = stock.info
-        
-        # Validate we got real data
-        if not info or ('regularMarketPrice' not in info and 'currentPrice' not in info):
-            raise ValueError("No valid data returned from API")
+    # Validate we got real data
+    if not info or ('regularMarketPrice' not in info and 'currentPrice' not in info):
+        raise ValueError("No valid data returned from API")
+    
+    return MarketMetrics(
+        symbol=normalized_symbol,
+        name=info.get('longName', info.get('shortName', normalized_symbol)),
+        is_crypto=is_crypto,
+        price=_num(info.get('currentPrice', info.get('regularMarketPrice'))),
+        currency=info.get('currency', 'USD'),
+        pe_ratio=_num(info.get('trailingPE')),
+        market_cap=_num(info.get('marketCap')),
+        eps=_num(info.get('trailingEps')),
+        low_52w=_num(info.get('fiftyTwoWeekLow')),
+        high_52w=_num(info.get('fiftyTwoWeekHigh')),
+        volume_24h=_num(info.get('volume24Hr', info.get('volume'))),
+    )
 
-        price = info.get('currentPrice', info.get('regularMarketPrice', 'N/A'))
-        currency = info.get('currency', 'USD')
-        name = info.get('longName', info.get('shortName', normalized_symbol))
-        
-        # Format price
-        if isinstance(price, (int, float)):
-            price_formatted = f"{price:.2f}"
-        else:
-            price_formatted = str(price)
-        
-        if is_crypto:
-            # CRYPTO-SPECIFIC ANALYSIS
-            market_cap = info.get('marketCap', 'N/A')
-            volume_24h = info.get('volume24Hr', info.get('volume', 'N/A'))
-            
-            # Get volatility (52w range)
-            low_52w = info.get('fiftyTwoWeekLow', price)
-            high_52w = info.get('fiftyTwoWeekHigh', price)
-            
-            # Calculate distance from ATH
-            if isinstance(price, (int, float)) and isinstance(high_52w, (int, float)) and high_52w > 0:
-                ath_distance = ((high_52w - price) / high_52w) * 100
-                ath_str = f"{ath_distance:.1f}% below ATH"
-            else:
-                ath_str = "N/A"
-            
-            # Calculate volatility percentage
-            if isinstance(low_52w, (int, float)) and isinstance(high_52w, (int, float)) and low_52w > 0:
-                volatility = ((high_52w - low_52w) / low_52w) * 100
-                volatility_str = f"{volatility:.1f}%"
-            else:
-                volatility_str = "N/A"
-            
-            # Get crypto sentiment
-            sentiment = get_crypto_sentiment()
-            
-            # Format volume for readability
-            if isinstance(volume_24h, (int, float)):
-                if volume_24h >= 1e9:
-                    volume_24h_str = f"${volume_24h/1e9:.2f}B"
-                elif volume_24h >= 1e6:
-                    volume_24h_str = f"${volume_24h/1e6:.2f}M"
-                else:
-                    volume_24h_str = f"${volume_24h:,.0f}"
-            else:
-                volume_24h_str = str(volume_24h)
-            
-            return f"""**📊 Crypto Asset Profile: {name} ({normalized_symbol})**
+def _format_volume(volume: Optional[float]) -> str:
+    """Formats a dollar volume for readability ($1.23T / $4.56B / $7.89M / $789)."""
+    if volume is None:
+        return "N/A"
+    if volume >= 1e12:
+        return f"${volume/1e12:.2f}T"
+    if volume >= 1e9:
+        return f"${volume/1e9:.2f}B"
+    if volume >= 1e6:
+        return f"${volume/1e6:.2f}M"
+    return f"${volume:,.0f}"
+
+def render_crypto_profile(m: MarketMetrics, sentiment: dict) -> str:
+    """Renders the crypto risk profile table for `m`."""
+    ath = m.ath_distance_pct
+    vol = m.volatility_pct
+    ath_str = f"{ath:.1f}% below ATH" if ath is not None else "N/A"
+    volatility_str = f"{vol:.1f}%" if vol is not None else "N/A"
+    
+    return f"""**📊 Crypto Asset Profile: {m.name} ({m.symbol})**
 
 | Metric | Value |
 |--------|-------|
-| Current Price | ${price_formatted} {currency} |
-| 24h Volume | {volume_24h_str} |
+| Current Price | ${_fmt(m.price)} {m.currency} |
+| 24h Volume | {_format_volume(m.volume_24h)} |
 | ATH Distance | {ath_str} |
 | 52-Week Volatility | {volatility_str} |
 | Fear & Greed Index | {sentiment['score']}/100 ({sentiment['label']}) |
@@ -147,36 +394,38 @@ def get_market_data(symbol: str) -> str:
 **Market Sentiment:** {sentiment['interpretation']}
 
 ⚠️ **Risk Note:** Cryptocurrencies are highly volatile."""
-        
-        else:
-            # STOCK-SPECIFIC ANALYSIS
-            pe_ratio = info.get('trailingPE', 'N/A')
-            market_cap = info.get('marketCap', 'N/A')
-            high_52w = info.get('fiftyTwoWeekHigh', 'N/A')
-            eps = info.get('trailingEps', 'N/A')
-            
-            # Format numbers
-            if isinstance(pe_ratio, (int, float)):
-                pe_ratio = f"{pe_ratio:.2f}"
-            if isinstance(market_cap, (int, float)):
-                market_cap = f"${market_cap:,.0f}"
-            if isinstance(high_52w, (int, float)):
-                high_52w = f"{high_52w:.2f}"
-            
-            return f"""**📈 Stock Profile: {name} ({normalized_symbol})**
+
+def render_stock_profile(m: MarketMetrics) -> str:
+    """Renders the stock profile table for `m`."""
+    return f"""**📈 Stock Profile: {m.name} ({m.symbol})**
 
 | Metric | Value |
 |--------|-------|
-| Current Price | ${price_formatted} {currency} |
-| P/E Ratio | {pe_ratio} |
-| Market Cap | {market_cap} |
-| EPS | {eps} |
-| 52-Week High | ${high_52w} {currency} |"""
+| Current Price | ${_fmt(m.price)} {m.currency} |
+| P/E Ratio | {_fmt(m.pe_ratio)} |
+| Market Cap | {_fmt(m.market_cap, ",.0f", "$")} |
+| EPS | {_fmt(m.eps)} |
+| 52-Week High | ${_fmt(m.high_52w)} {m.currency} |"""
+
+def get_market_data(symbol: str) -> str:
+    """
+    Fetches market data for stocks OR crypto (context-aware).
+    For stocks: Returns P/E, Market Cap, etc.
+    For crypto: Returns Sentiment, Volatility, ATH distance.
+    """
+    normalized_symbol, is_crypto = normalize_ticker(symbol)
+    
+    try:
+        metrics = fetch_market_metrics(normalized_symbol)
+        if metrics.is_crypto:
+            return render_crypto_profile(metrics, get_crypto_sentiment())
+        return render_stock_profile(metrics)
         
     except Exception as e:
-        # FALLBACK / DUMMY MODE
+        # FALLBACK / DUMMY MODE (seeded per symbol so offline runs are reproducible)
         import random
-        dummy_price = round(random.uniform(50, 500), 2)
+        rng = random.Random(normalized_symbol)
+        dummy_price = round(rng.uniform(50, 500), 2)
         
         if is_crypto:
             return f"""Note: Live data unavailable. Showing demo data for {normalized_symbol}...
@@ -188,7 +437,7 @@ def get_market_data(symbol: str) -> str:
 
 _(This is simulated data. Real implementation would show live data.)_"""
         else:
-            dummy_pe = round(random.uniform(15, 45), 2)
+            dummy_pe = round(rng.uniform(15, 45), 2)
             return f"""Note: Live data unavailable. Showing demo data for {symbol}...
 
 **Demo Stock Data for {symbol}**:
@@ -197,25 +446,80 @@ _(This is simulated data. Real implementation would show live data.)_"""
 
 _(This is simulated data. Real implementation would show live data.)_"""
 
-def plot_stock_history(symbol: Optional[str] = None) -> str:
+# Chart point budget: figures are kept in session_state and redrawn on every rerun
+CHART_MAX_POINTS = 800
+# Intraday charts keep more detail; anything denser than the daily budget is drawn with WebGL
+CHART_MAX_POINTS_INTRADAY = 4000
+CHART_WEBGL_MIN_POINTS = CHART_MAX_POINTS + 1
+# Daily bars inside this window are never downsampled (covers the 1m/6m range buttons)
+CHART_FULL_RES_DAYS = 183
+CHART_INTRADAY_INTERVALS = {'1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h'}
+
+CHART_DAILY_BUTTONS = [
+    dict(count=1, label="1m", step="month", stepmode="backward"),
+    dict(count=6, label="6m", step="month", stepmode="backward"),
+    dict(count=1, label="YTD", step="year", stepmode="todate"),
+    dict(count=1, label="1y", step="year", stepmode="backward"),
+    dict(step="all", label="All"),
+]
+CHART_INTRADAY_BUTTONS = [
+    dict(count=1, label="1d", step="day", stepmode="backward"),
+    dict(count=5, label="5d", step="day", stepmode="backward"),
+    dict(count=1, label="1m", step="month", stepmode="backward"),
+    dict(step="all", label="All"),
+]
+
+# Price-scale indicators that can be overlaid on the chart: name -> (panel columns, line colour)
+CHART_OVERLAYS = {
+    'SMA_20': (['SMA_20'], '#60A5FA'),
+    'SMA_50': (['SMA_50'], '#FBBF24'),
+    'SMA_200': (['SMA_200'], '#F472B6'),
+    'EMA_12': (['EMA_12'], '#A78BFA'),
+    'EMA_26': (['EMA_26'], '#34D399'),
+    'BB': (['BB_upper', 'BB_mid', 'BB_lower'], '#9CA3AF'),
+}
+
+def plot_stock_history(
+    symbol: Optional[str] = None,
+    period: str = "1y",
+    indicators: Optional[List[str]] = None,
+    interval: str = "1d",
+) -> str:
     """
-    Plots 1-year historical stock data using Plotly with interactive range selector.
+    Plots historical price data using Plotly with interactive range selector.
     Stores chart in session_state for display.
+    
+    Args:
+        symbol (str): Ticker symbol (e.g., 'AAPL', 'BTC-USD')
+        period (str): History range: '1mo', '3mo', '6mo', 'ytd', '1y', '2y', '5y', '10y' or 'max' (default '1y')
+        indicators (List[str]): Optional overlays: 'SMA_20', 'SMA_50', 'SMA_200', 'EMA_12', 'EMA_26', 'BB' (Bollinger Bands)
+        interval (str): Bar size: '1d' (default) or intraday '5m', '15m', '30m', '1h'
+            (Yahoo limits: 5m-30m up to '1mo', 1h up to '2y')
     """
     if not symbol:
         return "⚠️ No symbol provided for chart generation."
     try:
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period="1y")
+        intraday = interval in CHART_INTRADAY_INTERVALS
+        hist = get_price_history(symbol, period=period, interval=interval)
         
         if hist.empty:
             return f"⚠️ No historical data available for {symbol}."
         
+        if intraday:
+            # Intraday bars are LTTB-downsampled across the whole range to the larger budget
+            keep = downsample_recent_full(hist.index.asi8, hist['Close'].to_numpy(), CHART_MAX_POINTS_INTRADAY)
+        else:
+            # Keep the recent window at full resolution, LTTB-downsample older bars
+            recent_from = (hist.index[-1] - timedelta(days=CHART_FULL_RES_DAYS)).value
+            keep = downsample_recent_full(hist.index.asi8, hist['Close'].to_numpy(), CHART_MAX_POINTS, recent_from)
+        plotted = hist.iloc[keep]
+        trace_cls = go.Scattergl if len(plotted) >= CHART_WEBGL_MIN_POINTS else go.Scatter
+        
         # Create beautiful Plotly chart with range selector
         fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=hist.index, 
-            y=hist['Close'], 
+        fig.add_trace(trace_cls(
+            x=plotted.index, 
+            y=plotted['Close'], 
             mode='lines', 
             name='Close Price',
             line=dict(color='#10A37F', width=2),
@@ -223,6 +527,24 @@ def plot_stock_history(symbol: Optional[str] = None) -> str:
             fillcolor='rgba(16, 163, 127, 0.1)'
         ))
         
+        if indicators:
+            if isinstance(indicators, str):
+                indicators = indicators.replace(',', ' ').split()
+            wanted = [name.upper() for name in indicators if name.upper() in CHART_OVERLAYS]
+            if wanted:
+                # Computed on full-resolution bars, then sampled at the plotted points
+                panel = compute_indicator_panel(hist[['Close']])
+                for name in wanted:
+                    columns, color = CHART_OVERLAYS[name]
+                    for col in columns:
+                        fig.add_trace(trace_cls(
+                            x=plotted.index,
+                            y=panel[col]['Close'].iloc[keep],
+                            mode='lines',
+                            name=col.replace('_', ' '),
+                            line=dict(color=color, width=1, dash='dot' if name == 'BB' else 'solid'),
+                        ))
+        
         fig.update_layout(
             title=f'{symbol.upper()} - Price History',
             xaxis_title='Date',
@@ -237,13 +559,7 @@ def plot_stock_history(symbol: Optional[str] = None) -> str:
             xaxis=dict(
                 gridcolor='#3F3F3F',
                 rangeselector=dict(
-                    buttons=list([
-                        dict(count=1, label="1m", step="month", stepmode="backward"),
-                        dict(count=6, label="6m", step="month", stepmode="backward"),
-                        dict(count=1, label="YTD", step="year", stepmode="todate"),
-                        dict(count=1, label="1y", step="year", stepmode="backward"),
-                        dict(step="all", label="All")
-                    ]),
+                    buttons=list(CHART_INTRADAY_BUTTONS if intraday else CHART_DAILY_BUTTONS),
                     bgcolor='rgba(16, 163, 127, 0.2)',
                     activecolor='#10A37F',
                     font=dict(color='#ECECEC')
@@ -259,14 +575,43 @@ def plot_stock_history(symbol: Optional[str] = None) -> str:
             st.session_state['pending_charts'] = []
         st.session_state['pending_charts'].append(fig)
         
-        return f"📊 Interactive chart created successfully for {symbol.upper()}. Use the range selector buttons (1m, 6m, YTD, 1y, All) to adjust the time period."
+        labels = ", ".join(b['label'] for b in (CHART_INTRADAY_BUTTONS if intraday else CHART_DAILY_BUTTONS))
+        return f"📊 Interactive chart created successfully for {symbol.upper()}. Use the range selector buttons ({labels}) to adjust the time period."
         
     except Exception as e:
         return f"❌ Error creating chart for {symbol}: {str(e)}"
 
+_fundamentals_store: Optional[FundamentalsStore] = None
+
+def get_fundamentals_store() -> FundamentalsStore:
+    """Returns the process-wide versioned fundamentals store (created on first use)."""
+    global _fundamentals_store
+    if _fundamentals_store is None:
+        _fundamentals_store = FundamentalsStore()
+    return _fundamentals_store
+
+def _as_of(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M')
+
+# Display label and format for each fundamentals field, shared by every fundamentals tool
+FUNDAMENTAL_LABELS = {
+    'market_cap': ("Market Cap", _format_volume),
+    'eps': ("EPS (Trailing)", lambda v: f"{v:.2f}"),
+    'forward_eps': ("EPS (Forward)", lambda v: f"{v:.2f}"),
+    'pe': ("P/E", lambda v: f"{v:.2f}"),
+    'roe': ("ROE", lambda v: f"{v * 100:.2f}%"),
+    'dividend_yield': ("Dividend Yield", lambda v: f"{v * 100:.2f}%"),
+    'revenue': ("Revenue", _format_volume),
+    'profit_margin': ("Profit Margin", lambda v: f"{v * 100:.2f}%"),
+}
+
+def _format_fundamental(field: str, value: Optional[float]) -> str:
+    return "N/A" if value is None else FUNDAMENTAL_LABELS[field][1](value)
+
 def get_fundamental_metrics(symbol: str) -> str:
     """
-    Fetches key fundamental metrics (Market Cap, EPS, ROE, Dividend Yield) using yfinance.
+    Fetches key fundamental metrics (Market Cap, EPS, ROE, Dividend Yield).
+    Served from the local versioned fundamentals store when recently checked.
     """
     normalized_symbol, is_crypto = normalize_ticker(symbol)
     
@@ -274,35 +619,71 @@ def get_fundamental_metrics(symbol: str) -> str:
         return f"ℹ️ Fundamental metrics (EPS, ROE, Dividends) are not applicable to cryptocurrencies like {normalized_symbol}. Please refer to the Market Data and Sentiment analysis."
 
     try:
-        stock = yf.Ticker(normalized_symbol)
-        info = stock.info
-        
-        market_cap = info.get('marketCap', 'N/A')
-        eps = info.get('trailingEps', 'N/A')
-        roe = info.get('returnOnEquity', 'N/A')
-        div_yield = info.get('dividendYield', 'N/A')
-        
-        # Format
-        if isinstance(market_cap, (int, float)):
-            market_cap = f"${market_cap:,.0f}"
-        if isinstance(div_yield, (int, float)):
-            div_yield = f"{div_yield*100:.2f}%"
+        snapshot = get_fundamentals_store().get(normalized_symbol, get_ticker_info)
+        fmt = {field: _format_fundamental(field, snapshot.fields.get(field)) for field in FUNDAMENTAL_LABELS}
             
         return f"""**🏗️ Fundamental Metrics for {normalized_symbol}**:
-- 🏢 Market Cap: {market_cap}
-- 💵 EPS (Trailing): {eps}
-- 📉 ROE: {roe}
-- 🎁 Dividend Yield: {div_yield}"""
+- 🏢 Market Cap: {fmt['market_cap']}
+- 💵 EPS (Trailing): {fmt['eps']}
+- 📉 ROE: {fmt['roe']}
+- 🎁 Dividend Yield: {fmt['dividend_yield']}"""
     except Exception as e:
         return f"❌ Error fetching fundamentals for {symbol}: {e}"
 
+def get_fundamentals_history(symbol: str, since_days: int = 7) -> str:
+    """
+    Shows how a company's reported fundamentals (EPS, ROE, dividend yield, revenue...) changed
+    over the last `since_days` days, from locally stored snapshots (no network call).
+    Use for questions like "how has EPS changed since last week".
+
+    Args:
+        symbol (str): Stock ticker (e.g., 'AAPL')
+        since_days (int): Look-back window in days (default 7)
+    """
+    normalized_symbol, is_crypto = normalize_ticker(symbol)
+    if is_crypto:
+        return f"ℹ️ Fundamentals history is not applicable to cryptocurrencies like {normalized_symbol}."
+
+    try:
+        store = get_fundamentals_store()
+        current = store.latest(normalized_symbol)
+        if current is None:
+            # First time we see this symbol: take the initial snapshot now
+            current = store.get(normalized_symbol, get_ticker_info)
+            return f"ℹ️ No stored fundamentals history for {normalized_symbol} yet; recorded a first snapshot as of {_as_of(current.captured_at)}. Ask again later to see changes."
+
+        since = time.time() - int(since_days) * 86400
+        baseline = store.as_of(normalized_symbol, since) or store.history(normalized_symbol)[0]
+        versions = store.history(normalized_symbol, since=since)
+
+        summary = f"**🗂️ Fundamentals History for {normalized_symbol}** (last {since_days} days)\n\n"
+        summary += f"| Metric | {_as_of(baseline.captured_at)} | {_as_of(current.captured_at)} | Change |\n"
+        summary += "|--------|------|------|--------|\n"
+        for field, (label, _) in FUNDAMENTAL_LABELS.items():
+            if field in PRICE_DERIVED_FIELDS:
+                continue
+            old, new = baseline.fields.get(field), current.fields.get(field)
+            if old is None and new is None:
+                continue
+            if old not in (None, 0) and new is not None:
+                change = f"{(new - old) / abs(old) * 100:+.2f}%"
+            else:
+                change = "N/A"
+            summary += f"| {label} | {_format_fundamental(field, old)} | {_format_fundamental(field, new)} | {change} |\n"
+
+        summary += f"\n_{len(versions)} stored version(s) in this window; a version is stored only when a reported value changes. Market cap and P/E follow the share price and are not versioned._"
+        if baseline.captured_at > since:
+            summary += f"\n_Oldest stored snapshot is from {_as_of(baseline.captured_at)}, after the requested start._"
+        return summary
+    except Exception as e:
+        return f"❌ Error reading fundamentals history for {symbol}: {e}"
+
 def get_analyst_recommendations(symbol: str) -> str:
     """
-    Fetches analyst recommendations using yfinance.
+    Fetches analyst recommendations from the market-data provider.
     """
     try:
-        stock = yf.Ticker(symbol)
-        recs = stock.recommendations
+        recs = get_provider().get_recommendations(symbol)
         
         if recs is None or recs.empty:
             return f"⚠️ No analyst recommendations available for {symbol}."
@@ -327,48 +708,54 @@ def get_analyst_recommendations(symbol: str) -> str:
             # Just show raw tail if format is different
             summary += "Detailed breakdown not available in standard format."
             
-        target_mean = stock.info.get('targetMeanPrice', 'N/A')
+        target_mean = get_ticker_info(symbol).get('targetMeanPrice', 'N/A')
         summary += f"\n🎯 **Average Price Target**: ${target_mean}"
         
         return summary
     except Exception as e:
         return f"❌ Error fetching recommendations for {symbol}: {e}"
 
-def compare_stocks(symbol1: str, symbol2: str) -> str:
+# Rows of the comparison table: (label, formatter over MarketMetrics)
+COMPARISON_ROWS = [
+    ('Current Price', lambda m: _fmt(m.price, prefix="$")),
+    ('P/E Ratio', lambda m: _fmt(m.pe_ratio)),
+    ('Market Cap', lambda m: _fmt(m.market_cap, ",.0f", "$")),
+    ('EPS', lambda m: _fmt(m.eps)),
+    ('52-Week High', lambda m: _fmt(m.high_52w, prefix="$")),
+    ('52-Week Low', lambda m: _fmt(m.low_52w, prefix="$")),
+]
+
+def compare_stocks(symbols: List[str]) -> str:
     """
-    Compares two stocks side-by-side with key metrics.
+    Compares two or more stocks/crypto side-by-side with key metrics.
+    All symbols are fetched concurrently.
+    
+    Args:
+        symbols (List[str]): Ticker symbols to compare (e.g., ['NVDA', 'AMD', 'INTC'])
     """
+    if isinstance(symbols, str):
+        symbols = re.split(r'[,\s]+', symbols)
+    tickers = list(dict.fromkeys(normalize_ticker(s)[0] for s in symbols if s and s.strip()))
+    if len(tickers) < 2:
+        return "⚠️ Provide at least two symbols to compare."
+    
     try:
-        data1 = get_market_data(symbol1)
-        data2 = get_market_data(symbol2)
-        
-        # Extract metrics from the formatted strings (simple parsing)
-        def extract_metrics(text):
-            lines = text.split('\n')
-            price = pe = high = 'N/A'
-            for line in lines:
-                if 'Current Price' in line:
-                    price = line.split(':')[1].strip()
-                elif 'P/E Ratio' in line:
-                    pe = line.split(':')[1].strip()
-                elif '52-Week High' in line:
-                    high = line.split(':')[1].strip()
-            return price, pe, high
+        fetched = fan_out(fetch_market_metrics, tickers)
+        metrics = [fetched.results.get(t) for t in tickers]
         
-        p1, pe1, h1 = extract_metrics(data1)
-        p2, pe2, h2 = extract_metrics(data2)
+        table = "| Metric | " + " | ".join(tickers) + " |\n"
+        table += "|--------|" + "|".join("-" * (len(t) + 2) for t in tickers) + "|\n"
+        for label, render in COMPARISON_ROWS:
+            cells = [render(m) if m is not None else "N/A" for m in metrics]
+            table += f"| {label} | " + " | ".join(cells) + " |\n"
         
-        table = f"""
-| Metric          | {symbol1.upper()} | {symbol2.upper()} |
-|-----------------|-------------------|-------------------|
-| Current Price  | {p1}             | {p2}             |
-| P/E Ratio      | {pe1}            | {pe2}            |
-| 52-Week High   | {h1}             | {h2}             |
-"""
+        note = ""
+        if fetched.errors:
+            note = f"\n_Live data unavailable for: {', '.join(t for t in tickers if t in fetched.errors)}._\n"
         
-        return f"**📊 Side-by-Side Comparison: {symbol1.upper()} vs {symbol2.upper()}**\n\n{table}\n\n_Charts available for both stocks via plot_stock_history._"
+        return f"**📊 Side-by-Side Comparison: {' vs '.join(tickers)}**\n\n{table}{note}\n_Charts available for all symbols via plot_stock_history._"
     except Exception as e:
-        return f"❌ Error comparing {symbol1} and {symbol2}: {str(e)}"
+        return f"❌ Error comparing {', '.join(tickers)}: {str(e)}"
 
 def get_watchlist_summary() -> str:
     """
@@ -383,16 +770,28 @@ def get_watchlist_summary() -> str:
             return "📋 Your watchlist is empty. Analyze some stocks to get started!"
         
         summary = "**📋 Watchlist Summary**\n\n"
-        summary += "| Ticker | Name | Price | Change | Recommendation |\n"
-        summary += "|--------|------|-------|--------|----------------|\n"
+        summary += "| Ticker | Name | Price | Change | Recommendation | Score |\n"
+        summary += "|--------|------|-------|--------|----------------|-------|\n"
         
-        for ticker, _ in watchlist:
+        tickers = [ticker for ticker, _ in watchlist]
+        quotes = get_batch_quotes(tickers)
+        names = get_ticker_names(tickers, max_len=15)
+        
+        # One vectorized call scores the whole list (same rule as the sidebar)
+        rows = [quotes.get(ticker.upper()) or {} for ticker in tickers]
+        scored = score_watchlist(
+            [q.get('price', 0) for q in rows],
+            [q.get('low_52w', 0) for q in rows],
+            [q.get('high_52w', 0) for q in rows],
+        )
+        
+        for ticker, quote, label, score in zip(tickers, rows, scored.labels, scored.scores):
             try:
-                stock = yf.Ticker(ticker)
-                info = stock.info
-                name = info.get('shortName', ticker)[:15]
-                price = info.get('currentPrice', info.get('regularMarketPrice', 0))
-                prev_close = info.get('previousClose', price)
+                if not quote:
+                    raise ValueError(f"No quote for {ticker}")
+                name = names.get(ticker, ticker)
+                price = quote['price']
+                prev_close = quote['previous_close']
                 
                 if price and prev_close:
                     change = ((price - prev_close) / prev_close) * 100
@@ -400,18 +799,11 @@ def get_watchlist_summary() -> str:
                 else:
                     change_str = "N/A"
                 
-                # Simple recommendation
-                low_52w = info.get('fiftyTwoWeekLow', price)
-                high_52w = info.get('fiftyTwoWeekHigh', price)
-                if price and low_52w and high_52w and high_52w != low_52w:
-                    position = (price - low_52w) / (high_52w - low_52w)
-                    rec = "HOLD" if 0.3 < position < 0.7 else ("SELL" if position > 0.7 else "BUY")
-                else:
-                    rec = "HOLD"
-                
-                summary += f"| {ticker} | {name} | ${price:.2f} | {change_str} | {rec} |\n"
+                rec = HOLD if label == NO_DATA else label
+                score_str = "N/A" if score != score else f"{score:+.2f}"
+                summary += f"| {ticker} | {name} | ${price:.2f} | {change_str} | {rec} | {score_str} |\n"
             except Exception:
-                summary += f"| {ticker} | {ticker} | Error | N/A | HOLD |\n"
+                summary += f"| {ticker} | {ticker} | Error | N/A | HOLD | N/A |\n"
         
         return summary
     except Exception as e:
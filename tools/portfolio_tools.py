@@ -0,0 +1,63 @@
+from tools.data_tools import get_price_history, normalize_ticker
+from utils.fan_out import fan_out
+from utils.portfolio_risk import build_return_matrix, compute_risk, top_correlated_pairs
+
+
+def _pct(value) -> str:
+    return "N/A" if value is None or value != value else f"{value * 100:.2f}%"
+
+def get_portfolio_risk(benchmark: str = "SPY", period: str = "1y", confidence: float = 0.95) -> str:
+    """
+    Portfolio risk analytics for the whole watchlist (equal-weighted):
+    covariance/correlation, historical and parametric VaR/CVaR, and beta vs a benchmark.
+    Use when user asks about portfolio risk, diversification, correlation or beta.
+
+    Args:
+        benchmark (str): Benchmark ticker for beta (default 'SPY')
+        period (str): History window for daily returns (default '1y')
+        confidence (float): VaR confidence level (default 0.95)
+    """
+    try:
+        from utils.db import get_watchlist
+        tickers = list(dict.fromkeys(normalize_ticker(t)[0] for t, _ in get_watchlist()))
+        if len(tickers) < 2:
+            return "📋 Portfolio risk needs at least two symbols in your watchlist."
+
+        bench = normalize_ticker(benchmark)[0]
+        loaded = fan_out(lambda sym: get_price_history(sym, period=period), tickers + [bench])
+        closes = {sym: df['Close'] for sym, df in loaded.results.items() if df is not None and not df.empty}
+
+        returns = build_return_matrix({sym: closes.get(sym) for sym in tickers})
+        if returns.shape[1] < 2 or returns.empty:
+            return "⚠️ Not enough overlapping price history to compute portfolio risk."
+
+        bench_returns = closes[bench].pct_change(fill_method=None) if bench in closes else None
+        report = compute_risk(returns, bench_returns, confidence=confidence)
+        level = f"{confidence * 100:.0f}%"
+
+        summary = f"**🛡️ Portfolio Risk ({len(report.symbols)} symbols, equal-weighted, {report.observations} trading days)**\n\n"
+        summary += "| Metric | Value |\n|--------|-------|\n"
+        summary += f"| Annualized Volatility | {_pct(report.portfolio_vol)} |\n"
+        summary += f"| 1-Day VaR {level} (historical) | {_pct(report.hist_var)} |\n"
+        summary += f"| 1-Day CVaR {level} (historical) | {_pct(report.hist_cvar)} |\n"
+        summary += f"| 1-Day VaR {level} (parametric) | {_pct(report.param_var)} |\n"
+        summary += f"| 1-Day CVaR {level} (parametric) | {_pct(report.param_cvar)} |\n"
+        beta_str = f"{report.portfolio_beta:.2f}" if report.portfolio_beta is not None else "N/A"
+        summary += f"| Beta vs {bench} | {beta_str} |\n\n"
+
+        summary += f"| Ticker | Ann. Volatility | 1-Day VaR {level} | Beta |\n"
+        summary += "|--------|-----------------|------------|------|\n"
+        for sym in report.symbols:
+            beta = report.betas[sym]
+            summary += f"| {sym} | {_pct(report.asset_vol[sym])} | {_pct(report.asset_var[sym])} | {'N/A' if beta != beta else f'{beta:.2f}'} |\n"
+
+        pairs = top_correlated_pairs(report.corr)
+        if pairs:
+            summary += "\n**Most correlated pairs:** " + ", ".join(f"{a}/{b} ({c:.2f})" for a, b, c in pairs) + "\n"
+
+        skipped = [t for t in tickers if t not in report.symbols]
+        if skipped:
+            summary += f"\n_Excluded (insufficient history): {', '.join(skipped)}._\n"
+        return summary
+    except Exception as e:
+        return f"❌ Error computing portfolio risk: {str(e)}"
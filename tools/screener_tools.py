@@ -0,0 +1,142 @@
+import threading
+from typing import List, Optional
+
+import pandas as pd
+
+from tools.data_tools import get_batch_quotes, get_ticker_info
+from utils.fan_out import fan_out
+from utils.resilience import log_system_event
+from utils.screener import (
+    UNIVERSE_MAX_AGE_SEC, build_universe_frame, carry_forward_fundamentals, get_universe_store,
+    missing_fundamentals, screen, universe_symbols,
+)
+from utils.symbol_master import get_symbol_master
+
+# Held while a rebuild runs, so the prefetch job and screen_stocks never refresh twice at once
+_refresh_guard = threading.Lock()
+
+
+def refresh_universe(symbols: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Rebuilds the universe snapshot in bulk: one batched download for prices/52-week
+    ranges plus concurrent info lookups for fundamentals. Symbols whose lookup fails
+    (throttled, circuit open) keep their fundamentals from the previous snapshot.
+    Slow for large universes; runs from the background prefetch job, never inline.
+    """
+    if symbols is None:
+        from utils.db import get_watchlist
+        symbols = universe_symbols(extra=[ticker for ticker, _ in get_watchlist()])
+    store = get_universe_store()
+    quotes = get_batch_quotes(symbols)
+    lookups = fan_out(get_ticker_info, symbols, max_workers=16, timeout_sec=20.0)
+    asset_classes = {rec.ticker: rec.asset_class for rec in get_symbol_master().records()}
+    frame = build_universe_frame(symbols, quotes, {k.upper(): v for k, v in lookups.results.items()}, asset_classes)
+    frame = carry_forward_fundamentals(frame, store.load(), lookups.errors)
+    store.save(frame)
+    return frame
+
+def _refresh_unless_running() -> bool:
+    if not _refresh_guard.acquire(blocking=False):
+        return False
+    try:
+        refresh_universe()
+        return True
+    finally:
+        _refresh_guard.release()
+
+def refresh_universe_if_stale(max_age_sec: float = UNIVERSE_MAX_AGE_SEC) -> bool:
+    """Refreshes the snapshot only when it is missing or older than `max_age_sec` (background job)."""
+    if get_universe_store().is_stale(max_age_sec):
+        return _refresh_unless_running()
+    return False
+
+def _background_refresh() -> None:
+    try:
+        _refresh_unless_running()
+    except Exception as e:
+        log_system_event('PREFETCH_FAILED', {'job': 'universe', 'error': str(e)})
+
+def refresh_universe_in_background() -> bool:
+    """Starts a universe rebuild on a daemon thread unless one is already running."""
+    if _refresh_guard.locked():
+        return False
+    threading.Thread(target=_background_refresh, name="universe-refresh", daemon=True).start()
+    return True
+
+def universe_refresh_running() -> bool:
+    return _refresh_guard.locked()
+
+def _fmt_age(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "never refreshed"
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{seconds / size:.0f}{unit} old"
+    return "just refreshed"
+
+def _fmt(value, spec: str = ".2f", prefix: str = "", suffix: str = "") -> str:
+    return "N/A" if value is None or value != value else f"{prefix}{value:{spec}}{suffix}"
+
+def _fmt_cap(value) -> str:
+    if value is None or value != value:
+        return "N/A"
+    for threshold, unit in ((1e12, "T"), (1e9, "B"), (1e6, "M")):
+        if value >= threshold:
+            return f"${value / threshold:.2f}{unit}"
+    return f"${value:,.0f}"
+
+def screen_stocks(criteria: str = "", sort_by: str = "", limit: int = 20, refresh: bool = False) -> str:
+    """
+    Screens the whole local universe (stocks, ETFs, crypto) with a filter expression
+    and returns ranked matches. Use for questions like "which stocks are within 10%
+    of their 52-week low with P/E under 20".
+
+    Columns: price, change_pct, low_52w, high_52w, pct_above_low, pct_below_high,
+    position_52w (0 = at low, 1 = at high), pe, forward_pe, eps, market_cap,
+    dividend_yield, roe, beta, volume, symbol, name, asset_class, sector.
+
+    Args:
+        criteria (str): Filter, e.g. "pct_above_low <= 10 and pe < 20" or "asset_class == 'crypto'"
+        sort_by (str): Ranking column, '-' prefix for descending (default '-market_cap')
+        limit (int): Maximum results (default 20)
+        refresh (bool): Start a background rebuild of the snapshot (this call still screens the current one)
+    """
+    try:
+        store = get_universe_store()
+        if refresh or store.is_stale():
+            refresh_universe_in_background()
+        universe = store.load()
+        if universe.empty:
+            return "⏳ The screening universe is being built in the background. Try again in a few minutes."
+
+        age = store.age_sec()
+        status = _fmt_age(age)
+        if universe_refresh_running():
+            status += ", refresh in progress"
+        results = screen(universe, criteria, sort_by=sort_by, limit=limit)
+        title = f"`{criteria}`" if criteria else "all symbols"
+        missing = universe.loc[missing_fundamentals(universe), 'symbol'].tolist()
+        note = ""
+        if missing:
+            listed = ", ".join(missing[:10]) + (", …" if len(missing) > 10 else "")
+            note = (
+                f"\n_⚠️ {len(missing)} of {len(universe)} symbols have no fundamentals in this snapshot "
+                f"(lookups failed) and cannot match filters on P/E, EPS, market cap etc.: {listed}_"
+            )
+        if results.empty:
+            return f"🔎 No symbols in the {len(universe)}-symbol universe match {title} (snapshot {status}).{note}"
+
+        summary = f"**🔎 Screener: {title}** ({len(results)} shown, {len(universe)} screened, snapshot {status})\n\n"
+        summary += "| # | Ticker | Name | Price | Above 52W Low | Below 52W High | P/E | Market Cap |\n"
+        summary += "|---|--------|------|-------|---------------|----------------|-----|------------|\n"
+        for rank, row in enumerate(results.itertuples(index=False), 1):
+            summary += (
+                f"| {rank} | {row.symbol} | {str(row.name)[:20]} | {_fmt(row.price, prefix='$')} "
+                f"| {_fmt(row.pct_above_low, '.1f', suffix='%')} | {_fmt(row.pct_below_high, '.1f', suffix='%')} "
+                f"| {_fmt(row.pe)} | {_fmt_cap(row.market_cap)} |\n"
+            )
+        return summary + note
+    except ValueError as e:
+        return f"❌ Invalid screen: {str(e)}"
+    except Exception as e:
+        return f"❌ Error running screener: {str(e)}"
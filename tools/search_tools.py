@@ -1,28 +1,227 @@
+import re
+import time
+from datetime import datetime
+from typing import Dict, List, Set
+from urllib.parse import urlsplit
+
 from ddgs import DDGS  # Require modern package; install with `pip install ddgs`
 
+from utils.fan_out import fan_out
+from utils.near_dupes import get_near_dupe_index
+from utils.news_cache import get_news_cache
+from utils.news_sentiment import score_headlines
+from utils.resilience import CircuitOpenError, get_upstream, log_system_event
+from utils.symbol_master import AMBIGUOUS_TICKERS, get_symbol_master, normalize_name
+
+# Results requested per news search
+NEWS_MAX_RESULTS = 5
+# Concurrent searches for watchlist news and the per-ticker time budget
+WATCHLIST_NEWS_WORKERS = 4
+WATCHLIST_NEWS_TIMEOUT_SEC = 15.0
+
+# Relevance filter: fewer survivors than this triggers one larger search
+MIN_RELEVANT_RESULTS = 3
+OVERFETCH_MAX_RESULTS = 15
+# Results scoring below this are dropped before formatting
+RELEVANCE_THRESHOLD = 0.8
+# Finance keywords per token at which the density part of the score saturates
+KEYWORD_DENSITY_TARGET = 0.08
+# A single stray keyword ('gains' in a GPU review) only earns part of the density score
+MIN_KEYWORD_HITS = 2
+
+TRUSTED_NEWS_DOMAINS = {
+    'reuters.com', 'bloomberg.com', 'cnbc.com', 'wsj.com', 'ft.com', 'marketwatch.com', 'finance.yahoo.com',
+    'barrons.com', 'fool.com', 'seekingalpha.com', 'investors.com', 'businessinsider.com', 'forbes.com',
+    'benzinga.com', 'zacks.com', 'nasdaq.com', 'thestreet.com', 'investing.com', 'morningstar.com',
+    'apnews.com', 'coindesk.com', 'cointelegraph.com', 'theblock.co', 'economist.com', 'axios.com',
+}
+BLOCKED_NEWS_DOMAINS = {
+    'youtube.com', 'facebook.com', 'instagram.com', 'tiktok.com', 'pinterest.com', 'amazon.com', 'ebay.com',
+    'github.com', 'stackoverflow.com', 'softonic.com', 'apkpure.com', 'uptodown.com', 'driverscloud.com',
+    'wikipedia.org', 'indeed.com', 'glassdoor.com', 'linkedin.com',
+}
+# Host prefixes and path fragments of support, download and careers pages
+BLOCKED_HOST_PREFIXES = ('support.', 'help.', 'docs.', 'download.', 'drivers.', 'forums.', 'community.', 'careers.', 'jobs.')
+BLOCKED_PATH_PATTERN = re.compile(r"/(downloads?|drivers?|support|help|manuals?|careers|jobs|forums?)(/|$)", re.I)
+
+FINANCE_KEYWORDS = {
+    'stock', 'stocks', 'share', 'shares', 'earnings', 'revenue', 'profit', 'sales', 'analyst', 'analysts',
+    'price', 'target', 'market', 'markets', 'investor', 'investors', 'quarter', 'quarterly', 'guidance',
+    'forecast', 'outlook', 'dividend', 'buyback', 'rating', 'upgrade', 'downgrade', 'valuation', 'eps',
+    'ipo', 'sec', 'filing', 'acquisition', 'merger', 'deal', 'trading', 'traders', 'nasdaq', 'nyse', 's&p',
+    'dow', 'rally', 'selloff', 'surge', 'plunge', 'gains', 'losses', 'billion', 'million', 'fed', 'rates',
+    'inflation', 'crypto', 'etf', 'fund', 'portfolio', 'bullish', 'bearish', 'margin', 'growth', 'ceo',
+}
+
+
+def _news_query(symbol: str) -> str:
+    return f"{symbol} stock market financial news"
+
+def search_company_news(symbol: str, max_results: int = NEWS_MAX_RESULTS) -> List[Dict]:
+    """
+    Returns raw news results for `symbol`, from the local news cache when fresh.
+    Only a miss (or an expired entry) runs a DuckDuckGo search.
+    """
+    query = _news_query(symbol)
+    # Larger searches get their own cache entry so they don't replace the default one
+    cache_key = query if max_results == NEWS_MAX_RESULTS else f"{query} (top {max_results})"
+    return get_news_cache().get_or_fetch(
+        symbol,
+        cache_key,
+        lambda: get_upstream('ddgs').call(lambda: list(DDGS().text(query, max_results=max_results))),
+    )
+
+def _domain(url: str) -> str:
+    host = urlsplit(url or '').netloc.lower().split(':')[0]
+    return host[4:] if host.startswith('www.') else host
+
+def _domain_in(host: str, domains: Set[str]) -> bool:
+    return any(host == d or host.endswith('.' + d) for d in domains)
+
+def _symbol_terms(symbol: str) -> List[str]:
+    """Normalized company name and aliases for `symbol` from the local symbol master."""
+    rec = get_symbol_master().lookup(symbol)
+    if rec is None:
+        return []
+    terms = {normalize_name(label) for label in (rec.name,) + tuple(rec.aliases)}
+    return [t for t in terms if len(t) >= 3]
+
+def relevance_score(result: Dict, symbol: str, names: List[str]) -> float:
+    """
+    Cheap relevance of one search result to `symbol` in [0, 1.25]; 0 for blocked sources.
+    Half comes from naming the ticker or company, half from finance keyword density,
+    plus a bonus for trusted financial news domains.
+    """
+    url = result.get('href') or result.get('url') or ''
+    host = _domain(url)
+    if (
+        _domain_in(host, BLOCKED_NEWS_DOMAINS)
+        or host.startswith(BLOCKED_HOST_PREFIXES)
+        or BLOCKED_PATH_PATTERN.search(urlsplit(url).path)
+    ):
+        return 0.0
+
+    text = f"{result.get('title', '')} {result.get('body', '')}"
+    ticker = symbol.upper().split('-')[0].split('.')[0]
+    if ticker in AMBIGUOUS_TICKERS:
+        ticker_pattern = rf"(\$|\(|: ?){re.escape(ticker)}\b"
+    else:
+        ticker_pattern = rf"(?<![A-Za-z])\$?{re.escape(ticker)}\b"
+    padded = f" {normalize_name(text)} "
+    mentioned = bool(re.search(ticker_pattern, text)) or any(f" {name} " in padded for name in names)
+
+    words = re.findall(r"[a-z&$%]+", text.lower())
+    hits = sum(w in FINANCE_KEYWORDS for w in words)
+    density = hits / len(words) if words else 0.0
+
+    keywords = min(density / KEYWORD_DENSITY_TARGET, 1.0) * min(hits / MIN_KEYWORD_HITS, 1.0)
+    score = 0.5 * mentioned + 0.5 * keywords
+    if _domain_in(host, TRUSTED_NEWS_DOMAINS):
+        score += 0.25
+    return score
+
+def filter_relevant_news(results: List[Dict], symbol: str) -> List[Dict]:
+    """Results scoring at least RELEVANCE_THRESHOLD, in their original order."""
+    names = _symbol_terms(symbol)
+    return [r for r in results if relevance_score(r, symbol, names) >= RELEVANCE_THRESHOLD]
+
+def relevant_company_news(symbol: str) -> List[Dict]:
+    """
+    Searches news for `symbol` and drops off-topic results before they reach the LLM.
+    If too few results survive, searches once more with a larger result count.
+    """
+    fetched = search_company_news(symbol)
+    kept = filter_relevant_news(fetched, symbol)
+    total_fetched, overfetched = len(fetched), False
+    if len(kept) < MIN_RELEVANT_RESULTS and len(fetched) >= NEWS_MAX_RESULTS:
+        more = search_company_news(symbol, max_results=OVERFETCH_MAX_RESULTS)
+        kept = filter_relevant_news(more, symbol)
+        total_fetched, overfetched = total_fetched + len(more), True
+    kept = kept[:NEWS_MAX_RESULTS]
+    log_system_event('NEWS_FILTERED', {
+        'symbol': symbol.upper(),
+        'fetched': total_fetched,
+        'kept': len(kept),
+        'kept_ratio': round(len(kept) / total_fetched, 3) if total_fetched else None,
+        'overfetched': overfetched,
+    })
+    return kept
+
 def get_company_news(symbol: str) -> str:
     """
     Searches for the top 5 recent financial news articles using DuckDuckGo.
     """
     try:
-        ddgs = DDGS()
-        query = f"{symbol} stock market financial news"
-        results = list(ddgs.text(query, max_results=5))
-        
+        # Syndicated copies of one wire story are shown once
+        results = get_near_dupe_index().collapse(relevant_company_news(symbol))
+
         if not results:
-            return f"📰 No recent news found for {symbol}."
-            
+            return f"📰 No recent relevant news found for {symbol}."
+
+        sentiment = score_headlines([f"{r.get('title', '')}. {r.get('body', '')}" for r in results])
+
         news_summary = f"**📰 Recent Financial News for {symbol.upper()}:**\n\n"
         for i, r in enumerate(results, 1):
             title = r.get('title', 'No Title')
             href = r.get('href', '#')
             body = r.get('body', 'No summary available.')
-            news_summary += f"{i}. **[{title}]({href})**\n   {body[:150]}...\n\n"
-            
+            copies = ""
+            if r.get('duplicates'):
+                seen_in = f": {', '.join(r['also_in'][:3])}" if r.get('also_in') else ""
+                copies = f" _(+{r['duplicates']} similar{seen_in})_"
+            tone = f"{sentiment.scores[i - 1]:+.2f} {sentiment.labels[i - 1]}"
+            news_summary += f"{i}. **[{title}]({href})**{copies} `{tone}`\n   {body[:150]}...\n\n"
+
+        overall = sentiment.aggregate()
+        news_summary += (
+            f"**Sentiment:** {overall['score']:+.2f} ({overall['label']}) — "
+            f"{overall['bullish']} bullish, {overall['neutral']} neutral, {overall['bearish']} bearish "
+            f"_(local lexicon score, -1 to +1)_\n"
+        )
+
         return news_summary
+    except CircuitOpenError as e:
+        return f"⚠️ News search is cooling down after repeated failures: {e}"
     except Exception as e:
         return f"❌ Error fetching news for {symbol}: {str(e)}"
 
+def search_news_archive(query: str, symbol: str = "", since_days: int = 30, limit: int = 10) -> str:
+    """
+    Searches previously fetched news articles stored locally (no web search).
+    Use for questions about past coverage, e.g. 'what did the news say about NVDA earnings last week'.
+
+    Args:
+        query (str): Words to search for, e.g. 'earnings guidance'
+        symbol (str): Optional ticker to restrict results to
+        since_days (int): Only articles first seen in the last N days (default 30)
+        limit (int): Maximum number of articles (default 10)
+    """
+    try:
+        since = time.time() - float(since_days) * 86400 if since_days else None
+        hits = get_news_cache().search(query, symbol=symbol or None, since=since, limit=limit)
+        scope = f" for {symbol.upper()}" if symbol else ""
+        if not hits:
+            return f"📭 No stored news{scope} matching '{query}' in the last {since_days} days. Try get_company_news for fresh results."
+
+        summary = f"**🗂️ Stored News{scope} matching '{query}':**\n\n"
+        for i, h in enumerate(hits, 1):
+            seen = datetime.fromtimestamp(h['first_seen']).strftime('%Y-%m-%d')
+            summary += f"{i}. [{', '.join(h['symbols'])} · {seen}] **[{h['title']}]({h['href']})**\n   {(h['body'] or '')[:150]}...\n\n"
+        return summary
+    except Exception as e:
+        return f"❌ Error searching stored news: {str(e)}"
+
+def prefetch_headlines(tickers: List[str]) -> None:
+    """Warms the news cache for `tickers` (fresh entries are skipped without a search)."""
+    for ticker in tickers:
+        try:
+            search_company_news(ticker)
+        except CircuitOpenError:
+            # Search backend is cooling down; the next prefetch round will retry
+            return
+        except Exception:
+            continue
+
 def get_watchlist_news() -> str:
     """
     Fetches news for all stocks in the user's watchlist.
@@ -31,19 +230,26 @@ def get_watchlist_news() -> str:
     try:
         from utils.db import get_watchlist
         watchlist = get_watchlist()
-        
+
         if not watchlist:
             return "📋 Your watchlist is empty. Add some stocks to track their news!"
-        
+
+        tickers = [ticker for ticker, _ in watchlist]
+        fetched = fan_out(
+            get_company_news,
+            tickers,
+            max_workers=WATCHLIST_NEWS_WORKERS,
+            timeout_sec=WATCHLIST_NEWS_TIMEOUT_SEC,
+        )
+
         news_summary = "**📰 News Summary for Your Watchlist**\n\n"
-        
-        for ticker, _ in watchlist[:5]:  # Limit to first 5 to avoid too long response
-            ticker_news = get_company_news(ticker)
+        for ticker in dict.fromkeys(tickers):
+            ticker_news = fetched.results.get(ticker)
+            if ticker_news is None:
+                reason = fetched.errors.get(ticker, "no result")
+                ticker_news = f"⚠️ News search for {ticker} did not finish ({reason})."
             news_summary += f"### {ticker}\n{ticker_news}\n\n"
-        
-        if len(watchlist) > 5:
-            news_summary += f"\n_Showing news for first 5 stocks. You have {len(watchlist)} total._"
-        
+
         return news_summary
     except Exception as e:
         return f"❌ Error fetching watchlist news: {str(e)}"
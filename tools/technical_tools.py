@@ -0,0 +1,79 @@
+from typing import List, Optional
+
+from tools.data_tools import get_price_history, normalize_ticker
+from utils.fan_out import fan_out
+from utils.indicators import align_by_bar, compute_indicator_panel
+
+
+def _resolve_symbols(symbols: Optional[List[str]]) -> List[str]:
+    """Normalizes the requested symbols, defaulting to the whole watchlist."""
+    if isinstance(symbols, str):
+        symbols = [s for s in symbols.replace(',', ' ').split() if s]
+    if not symbols:
+        from utils.db import get_watchlist
+        symbols = [ticker for ticker, _ in get_watchlist()]
+    return list(dict.fromkeys(normalize_ticker(s)[0] for s in symbols))
+
+def _fmt(value, spec: str = ".2f", suffix: str = "") -> str:
+    return "N/A" if value is None or value != value else f"{value:{spec}}{suffix}"
+
+def _signal(price: float, sma_200: float, rsi_14: float) -> str:
+    """One-word read of trend (vs SMA200) and momentum (RSI extremes)."""
+    parts = []
+    if sma_200 == sma_200 and price == price:
+        parts.append("Uptrend" if price > sma_200 else "Downtrend")
+    if rsi_14 == rsi_14:
+        if rsi_14 >= 70:
+            parts.append("Overbought")
+        elif rsi_14 <= 30:
+            parts.append("Oversold")
+    return ", ".join(parts) or "N/A"
+
+def get_technical_indicators(symbols: Optional[List[str]] = None, period: str = "1y") -> str:
+    """
+    Computes technical indicators (SMA, EMA, RSI, MACD, Bollinger Bands, ATR, realized volatility)
+    for one or many symbols from locally stored price history.
+    Leave `symbols` empty to analyze the whole watchlist in one batch.
+
+    Args:
+        symbols (List[str]): Ticker symbols (e.g., ['NVDA', 'AMD']). Empty = watchlist.
+        period (str): History range used for the calculation (default '1y'; SMA200 needs >= '1y')
+    """
+    try:
+        tickers = _resolve_symbols(symbols)
+        if not tickers:
+            return "📋 No symbols given and your watchlist is empty."
+
+        # Warm symbols are read from disk; only stale/missing ones touch the network
+        loaded = fan_out(lambda sym: get_price_history(sym, period=period), tickers)
+        bars = {sym: df for sym, df in loaded.results.items() if df is not None and not df.empty}
+        if not bars:
+            return f"⚠️ No price history available for {', '.join(tickers)}."
+
+        close = align_by_bar({sym: df['Close'] for sym, df in bars.items()})
+        high = align_by_bar({sym: df['High'].fillna(df['Close']) for sym, df in bars.items()})
+        low = align_by_bar({sym: df['Low'].fillna(df['Close']) for sym, df in bars.items()})
+        panel = compute_indicator_panel(close, high, low)
+        latest = {name: frame.iloc[-1] for name, frame in panel.items()}
+        last_close = close.ffill().iloc[-1]
+
+        summary = "**📐 Technical Indicators**\n\n"
+        summary += "| Ticker | Price | SMA50 | SMA200 | RSI14 | MACD Hist | %B | ATR14 | Vol (20d, ann.) | Signal |\n"
+        summary += "|--------|-------|-------|--------|-------|-----------|----|-------|-----------------|--------|\n"
+        for sym in tickers:
+            if sym not in bars:
+                summary += f"| {sym} | N/A | N/A | N/A | N/A | N/A | N/A | N/A | N/A | No data |\n"
+                continue
+            price = last_close[sym]
+            summary += (
+                f"| {sym} | ${_fmt(price)} | {_fmt(latest['SMA_50'][sym])} | {_fmt(latest['SMA_200'][sym])} "
+                f"| {_fmt(latest['RSI_14'][sym], '.1f')} | {_fmt(latest['MACD_hist'][sym])} "
+                f"| {_fmt(latest['BB_pct_b'][sym])} | {_fmt(latest['ATR_14'][sym])} "
+                f"| {_fmt(latest['RV_20'][sym] * 100, '.1f', '%')} "
+                f"| {_signal(price, latest['SMA_200'][sym], latest['RSI_14'][sym])} |\n"
+            )
+
+        summary += "\n_RSI ≥ 70 overbought, ≤ 30 oversold. %B > 1 / < 0 = outside the Bollinger Bands._"
+        return summary
+    except Exception as e:
+        return f"❌ Error computing technical indicators: {str(e)}"
@@ -1,4 +1,5 @@
 import streamlit as st
+import time
 from datetime import datetime
 import uuid
 import json
@@ -10,9 +11,164 @@ from utils.report_generator import generate_report
 from utils.memory import MemoryStore
 from utils.code_utils import extract_code_blocks
 from tools.code_exec import execute_python
+from tools.data_tools import get_batch_quotes, get_ticker_names
+from utils.scoring import BUY, HOLD, NO_DATA, SELL, score_watchlist
 from utils.vector_store import get_vector_env_status
 from utils.llm_utils import fetch_llm_studio_models
 
+# The watchlist panel polls the cached quote layer on its own timer;
+# full-app reruns (chat submits) re-draw the last snapshot without any I/O
+WATCHLIST_REFRESH_SEC = 30
+
+
+# Sidebar badge (text, color) for each scoring label
+REC_STYLES = {
+    BUY: ("🟢 BUY", "#10A37F"),
+    SELL: ("🔴 SELL", "#EF4444"),
+    HOLD: ("🟡 HOLD", "#FBBF24"),
+    NO_DATA: ("⚪ HOLD", "#9CA3AF"),
+}
+
+
+def _watchlist_row(ticker: str, added_at: str, quote: dict, name: str, label: str) -> dict:
+    """Builds one display row (price, recommendation badge, added date)."""
+    price = quote.get('price', 0)
+    price_str = f"${price:.2f}" if price else "N/A"
+    rec, rec_color = REC_STYLES.get(label, REC_STYLES[NO_DATA])
+
+    try:
+        date_str = datetime.fromisoformat(added_at).strftime('%b %d')
+    except Exception:
+        date_str = "N/A"
+
+    return {
+        'ticker': ticker,
+        'name': name,
+        'price': price_str,
+        'rec': rec,
+        'rec_color': rec_color,
+        'date': date_str,
+    }
+
+
+def _row_signature(row: dict) -> tuple:
+    return (row['name'], row['price'], row['rec'], row['date'])
+
+
+def _row_html(row: dict) -> str:
+    return f"""
+    <div style="
+        padding: 10px;
+        background: rgba(16, 163, 127, 0.05);
+        border-left: 3px solid {row['rec_color']};
+        border-radius: 6px;
+        margin-bottom: 8px;
+    ">
+        <div style="display: flex; justify-content: space-between; align-items: center;">
+            <div style="flex: 1;">
+                <strong style="color: #10A37F;">{row['ticker']}</strong><br>
+                <span style="font-size: 0.85em; color: #ECECEC;">{row['name']}</span>
+            </div>
+            <div style="text-align: right;">
+                <div style="font-weight: bold;">{row['price']}</div>
+                <div style="font-size: 0.85em; color: {row['rec_color']};">{row['rec']}</div>
+            </div>
+        </div>
+        <div style="font-size: 0.75em; color: #9CA3AF; margin-top: 4px;">
+            Added: {row['date']}
+        </div>
+    </div>
+    """
+
+
+def refresh_watchlist_rows(watchlist_data, previous: dict) -> dict:
+    """
+    Polls the cached quote layer for the whole watchlist and merges it into `previous`.
+    Rows whose price/recommendation did not change keep their already-built HTML;
+    this only saves rebuilding markup, every row is still re-emitted on each run.
+    Returns rows by ticker.
+    """
+    # Price and 52-week range for the whole list come from one bulk request
+    # and display names are looked up concurrently
+    tickers = [ticker for ticker, _ in watchlist_data]
+    quotes = get_batch_quotes(tickers)
+    names = get_ticker_names(tickers, max_len=20)
+
+    # Recommendations for the whole list come from one vectorized scoring call
+    rows_quotes = [quotes.get(ticker.upper(), {}) for ticker in tickers]
+    labels = score_watchlist(
+        [q.get('price', 0) for q in rows_quotes],
+        [q.get('low_52w', 0) for q in rows_quotes],
+        [q.get('high_52w', 0) for q in rows_quotes],
+    ).labels
+
+    rows = {}
+    for (ticker, added_at), quote, label in zip(watchlist_data, rows_quotes, labels):
+        try:
+            row = _watchlist_row(ticker, added_at, quote, names.get(ticker, ticker), label)
+        except Exception:
+            # Fallback for failed fetches
+            row = {'ticker': ticker, 'name': ticker, 'price': 'N/A', 'rec': '⚪ HOLD', 'rec_color': '#9CA3AF', 'date': 'N/A'}
+        old = previous.get(ticker)
+        if old is not None and old['signature'] == _row_signature(row):
+            rows[ticker] = old
+        else:
+            row['signature'] = _row_signature(row)
+            row['html'] = _row_html(row)
+            rows[ticker] = row
+    return rows
+
+
+@st.fragment(run_every=WATCHLIST_REFRESH_SEC)
+def render_watchlist_panel():
+    """
+    Live watchlist rows; refreshes independently of the rest of the app.
+    Streamlit drops elements a run does not emit, so every row is written on each
+    fragment run; only the quote polling is skipped between refresh ticks.
+    """
+    watchlist_data = get_watchlist()
+    if not watchlist_data:
+        st.info("No stocks tracked yet. Analyze a stock to add it!")
+        return
+
+    st.caption(f"📋 {len(watchlist_data)} stocks tracked")
+
+    state = st.session_state.setdefault('watchlist_panel', {'rows': {}, 'polled_at': 0.0})
+    tickers = [ticker for ticker, _ in watchlist_data]
+    due = time.monotonic() - state['polled_at'] >= WATCHLIST_REFRESH_SEC * 0.9
+    if due or set(tickers) != set(state['rows']):
+        state['rows'] = refresh_watchlist_rows(watchlist_data, state['rows'])
+        state['polled_at'] = time.monotonic()
+
+    # Display watchlist items with individual delete buttons
+    for ticker in tickers:
+        row = state['rows'][ticker]
+        # Create columns for content and delete button
+        col_main, col_del = st.columns([5, 1])
+
+        with col_main:
+            st.markdown(row['html'], unsafe_allow_html=True)
+
+        with col_del:
+            # Individual delete button with modern styling
+            if st.button("🗑️", key=f"del_watch_{ticker}", help=f"Remove {ticker}", use_container_width=True):
+                result = remove_from_watchlist(ticker)
+                st.toast(result, icon="✅" if "✅" in result else "ℹ️")
+                st.rerun()
+
+    st.markdown("<div style='margin-top: 10px;'></div>", unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("📊 Analyze All", use_container_width=True, help="Ask agent to analyze your watchlist"):
+            st.session_state['watchlist_query'] = "Analyze my watchlist"
+            st.rerun()
+    with col2:
+        if st.button("🗑️ Clear All", use_container_width=True, help="Remove all stocks from watchlist"):
+            clear_watchlist()
+            st.toast("Watchlist cleared!", icon="✅")
+            st.rerun()
+
+
 def render_sidebar():
     """Renders the sidebar with provider settings, memory, and controls."""
     with st.sidebar:
@@ -160,124 +316,7 @@ def render_sidebar():
 
         st.divider()
         st.markdown("### 👀 Watchlist")
-        watchlist_data = get_watchlist()
-        if watchlist_data:
-            st.caption(f"📋 {len(watchlist_data)} stocks tracked")
-            
-            # Build detailed watchlist table
-            import yfinance as yf
-            
-            watchlist_rows = []
-            for ticker, added_at in watchlist_data:
-                try:
-                    stock = yf.Ticker(ticker)
-                    info = stock.info
-                    
-                    # Get name
-                    name = info.get('shortName', ticker)[:20]  # Truncate for display
-                    
-                    # Get current price
-                    price = info.get('currentPrice', info.get('regularMarketPrice', 0))
-                    if price:
-                        price_str = f"${price:.2f}"
-                    else:
-                        price_str = "N/A"
-                    
-                    # Calculate recommendation based on 52-week range
-                    low_52w = info.get('fiftyTwoWeekLow', price)
-                    high_52w = info.get('fiftyTwoWeekHigh', price)
-                    
-                    if price and low_52w and high_52w and high_52w != low_52w:
-                        position = (price - low_52w) / (high_52w - low_52w)
-                        if position < 0.3:
-                            rec = "🟢 BUY"
-                            rec_color = "#10A37F"
-                        elif position > 0.7:
-                            rec = "🔴 SELL"
-                            rec_color = "#EF4444"
-                        else:
-                            rec = "🟡 HOLD"
-                            rec_color = "#FBBF24"
-                    else:
-                        rec = "⚪ HOLD"
-                        rec_color = "#9CA3AF"
-                    
-                    # Format date
-                    try:
-                        dt = datetime.fromisoformat(added_at)
-                        date_str = dt.strftime('%b %d')
-                    except:
-                        date_str = "N/A"
-                    
-                    watchlist_rows.append({
-                        'ticker': ticker,
-                        'name': name,
-                        'price': price_str,
-                        'rec': rec,
-                        'rec_color': rec_color,
-                        'date': date_str
-                    })
-                except Exception:
-                    # Fallback for failed fetches
-                    watchlist_rows.append({
-                        'ticker': ticker,
-                        'name': ticker,
-                        'price': 'N/A',
-                        'rec': '⚪ HOLD',
-                        'rec_color': '#9CA3AF',
-                        'date': 'N/A'
-                    })
-            
-            # Display watchlist items with individual delete buttons
-            for row in watchlist_rows:
-                # Create columns for content and delete button
-                col_main, col_del = st.columns([5, 1])
-                
-                with col_main:
-                    st.markdown(f"""
-                    <div style="
-                        padding: 10px;
-                        background: rgba(16, 163, 127, 0.05);
-                        border-left: 3px solid {row['rec_color']};
-                        border-radius: 6px;
-                        margin-bottom: 8px;
-                    ">
-                        <div style="display: flex; justify-content: space-between; align-items: center;">
-                            <div style="flex: 1;">
-                                <strong style="color: #10A37F;">{row['ticker']}</strong><br>
-                                <span style="font-size: 0.85em; color: #ECECEC;">{row['name']}</span>
-                            </div>
-                            <div style="text-align: right;">
-                                <div style="font-weight: bold;">{row['price']}</div>
-                                <div style="font-size: 0.85em; color: {row['rec_color']};">{row['rec']}</div>
-                            </div>
-                        </div>
-                        <div style="font-size: 0.75em; color: #9CA3AF; margin-top: 4px;">
-                            Added: {row['date']}
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col_del:
-                    # Individual delete button with modern styling
-                    if st.button("🗑️", key=f"del_watch_{row['ticker']}", help=f"Remove {row['ticker']}", use_container_width=True):
-                        result = remove_from_watchlist(row['ticker'])
-                        st.toast(result, icon="✅" if "✅" in result else "ℹ️")
-                        st.rerun()
-            
-            st.markdown("<div style='margin-top: 10px;'></div>", unsafe_allow_html=True)
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("📊 Analyze All", use_container_width=True, help="Ask agent to analyze your watchlist"):
-                    st.session_state['watchlist_query'] = "Analyze my watchlist"
-                    st.rerun()
-            with col2:
-                if st.button("🗑️ Clear All", use_container_width=True, help="Remove all stocks from watchlist"):
-                    clear_watchlist()
-                    st.toast("Watchlist cleared!", icon="✅")
-                    st.rerun()
-        else:
-            st.info("No stocks tracked yet. Analyze a stock to add it!")
+        render_watchlist_panel()
 
         st.divider()
         if st.session_state.get('messages'):
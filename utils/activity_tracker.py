@@ -22,10 +22,16 @@ TOOL_AGENT_REGISTRY = {
     'get_analyst_recommendations': 'Data Analyst',
     'compare_stocks': 'Data Analyst',
     'get_watchlist_summary': 'Data Analyst',
+    'get_technical_indicators': 'Data Analyst',
+    'get_portfolio_risk': 'Data Analyst',
+    'screen_stocks': 'Data Analyst',
+    'backtest_signal_rule': 'Data Analyst',
+    'get_fundamentals_history': 'Data Analyst',
     
     # News Researcher tools
     'get_company_news': 'News Researcher',
     'get_watchlist_news': 'News Researcher',
+    'search_news_archive': 'News Researcher',
     
     # Team Lead tools
     'add_to_watchlist': 'Team Lead',
@@ -0,0 +1,231 @@
+"""
+Vectorized backtesting of parameterized signal rules.
+
+A rule turns a T x N close matrix (one column per symbol) into entry/exit
+masks; the engine turns those masks into a long/flat position with NumPy
+forward-fill and scores every symbol at once. Parameter grids are swept
+combination by combination, each one vectorized across all symbols, with
+intermediate results (rolling ranges, moving averages) shared through a
+per-run cache.
+"""
+
+import itertools
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .indicators import TRADING_DAYS_PER_YEAR, rsi, sma
+
+# Crypto trades every day of the year
+CRYPTO_DAYS_PER_YEAR = 365
+
+# Forward window (trading days) used to judge whether an entry signal was a hit
+DEFAULT_HIT_HORIZON = 63
+DEFAULT_COST_BPS = 5.0
+
+METRIC_COLUMNS = [
+    'total_return', 'ann_return', 'sharpe', 'max_drawdown', 'hit_rate', 'trades', 'exposure', 'buy_hold_return',
+]
+
+# rule(close, cache, **params) -> (entry mask, exit mask), both T x N
+SignalRule = Callable[..., Tuple[pd.DataFrame, pd.DataFrame]]
+
+
+def range_position_rule(close: pd.DataFrame, cache: Dict, buy_below: float = 0.3, sell_above: float = 0.7, lookback: int = 252):
+    """The sidebar rule: enter below `buy_below` of the trailing range, exit above `sell_above`."""
+    key = ('range_position', lookback)
+    if key not in cache:
+        low = close.rolling(lookback, min_periods=lookback).min()
+        high = close.rolling(lookback, min_periods=lookback).max()
+        span = (high - low).where(lambda s: s > 0)
+        cache[key] = (close - low) / span
+    position = cache[key]
+    return position < buy_below, position > sell_above
+
+
+def sma_cross_rule(close: pd.DataFrame, cache: Dict, fast: int = 50, slow: int = 200):
+    """Long while the fast SMA is above the slow SMA."""
+    for window in (fast, slow):
+        cache.setdefault(('sma', window), sma(close, window))
+    fast_ma, slow_ma = cache[('sma', fast)], cache[('sma', slow)]
+    return fast_ma > slow_ma, fast_ma < slow_ma
+
+
+def rsi_reversion_rule(close: pd.DataFrame, cache: Dict, oversold: float = 30, overbought: float = 70, window: int = 14):
+    """Enter when RSI is oversold, exit when it is overbought."""
+    cache.setdefault(('rsi', window), rsi(close, window))
+    value = cache[('rsi', window)]
+    return value < oversold, value > overbought
+
+
+RULES: Dict[str, SignalRule] = {
+    'range_position': range_position_rule,
+    'sma_cross': sma_cross_rule,
+    'rsi_reversion': rsi_reversion_rule,
+}
+
+DEFAULT_GRIDS: Dict[str, Dict[str, List]] = {
+    'range_position': {
+        'buy_below': [0.1, 0.2, 0.3, 0.4],
+        'sell_above': [0.6, 0.7, 0.8, 0.9],
+        'lookback': [126, 252],
+    },
+    'sma_cross': {'fast': [10, 20, 50], 'slow': [100, 150, 200]},
+    'rsi_reversion': {'oversold': [20, 25, 30, 35], 'overbought': [65, 70, 75, 80], 'window': [14]},
+}
+
+
+def _valid_params(rule: str, params: Dict) -> bool:
+    if rule == 'range_position':
+        return params['buy_below'] < params['sell_above']
+    if rule == 'sma_cross':
+        return params['fast'] < params['slow']
+    if rule == 'rsi_reversion':
+        return params['oversold'] < params['overbought']
+    return True
+
+
+def periods_per_year(symbols: Sequence[str]) -> np.ndarray:
+    """Bars per year for each symbol: 365 for crypto, 252 trading days otherwise."""
+    from .symbol_master import get_symbol_master
+
+    master = get_symbol_master()
+    factors = []
+    for sym in symbols:
+        rec = master.lookup(str(sym))
+        crypto = str(sym).upper().endswith('-USD') or (rec is not None and rec.asset_class == 'crypto')
+        factors.append(CRYPTO_DAYS_PER_YEAR if crypto else TRADING_DAYS_PER_YEAR)
+    return np.asarray(factors, dtype=float)
+
+
+def _ffill_state(entry: np.ndarray, exit_: np.ndarray) -> np.ndarray:
+    """1 after an entry until the next exit, else 0 (entry wins if both fire on a bar)."""
+    T = entry.shape[0]
+    signal = np.where(entry, 1.0, np.where(exit_, 0.0, np.nan))
+    idx = np.where(~np.isnan(signal), np.arange(T)[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    state = np.take_along_axis(signal, idx, axis=0)
+    return np.nan_to_num(state, nan=0.0)
+
+
+def simulate(
+    close: pd.DataFrame,
+    entry: pd.DataFrame,
+    exit_: pd.DataFrame,
+    cost_bps: float = DEFAULT_COST_BPS,
+    hit_horizon: int = DEFAULT_HIT_HORIZON,
+    bars_per_year: Optional[np.ndarray] = None,
+) -> pd.DataFrame:
+    """
+    Long/flat simulation for every symbol at once; trades fill on the close after the signal.
+    Annual return and Sharpe use `bars_per_year` per column (default: periods_per_year()).
+
+    Returns one row per symbol with METRIC_COLUMNS (returns and drawdown as fractions).
+    """
+    C = close.to_numpy(dtype=float)
+    T, N = C.shape
+    # Returns against the last valid close so a gap bar does not swallow the move across it
+    prev = close.ffill().shift(1).to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        R = C / prev - 1.0
+    R = np.nan_to_num(R, nan=0.0, posinf=0.0, neginf=0.0)
+
+    state = _ffill_state(entry.to_numpy(dtype=bool), exit_.to_numpy(dtype=bool))
+    held = np.vstack([np.zeros((1, N)), state[:-1]])
+    turnover = np.abs(np.diff(held, axis=0, prepend=0.0))
+    strat = held * R - turnover * (cost_bps / 10_000.0)
+
+    equity = np.cumprod(1.0 + strat, axis=0)
+    total = equity[-1] - 1.0
+    observed = np.maximum((~np.isnan(C)).sum(axis=0), 1)
+    if bars_per_year is None:
+        bars_per_year = periods_per_year(list(close.columns))
+    years = observed / bars_per_year
+    ann = np.power(np.maximum(1.0 + total, 0.0), 1.0 / years) - 1.0
+    std = strat.std(axis=0, ddof=1) if T > 1 else np.zeros(N)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, strat.mean(axis=0) / std * np.sqrt(bars_per_year), np.nan)
+    drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1.0
+
+    # Hit rate: share of entries followed by a positive return over the next `hit_horizon` bars
+    entries = np.diff(state, axis=0, prepend=0.0) > 0
+    forward = (close.shift(-hit_horizon) / close - 1.0).to_numpy(dtype=float)
+    judged = entries & ~np.isnan(forward)
+    hits = (judged & (forward > 0)).sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hit_rate = np.where(judged.sum(axis=0) > 0, hits / judged.sum(axis=0), np.nan)
+
+    filled = close.ffill()
+    first = close.bfill().iloc[0].to_numpy(dtype=float)
+    buy_hold = filled.iloc[-1].to_numpy(dtype=float) / first - 1.0
+
+    return pd.DataFrame({
+        'total_return': total,
+        'ann_return': ann,
+        'sharpe': sharpe,
+        'max_drawdown': -drawdown.min(axis=0),
+        'hit_rate': hit_rate,
+        'trades': entries.sum(axis=0),
+        'exposure': held.mean(axis=0),
+        'buy_hold_return': buy_hold,
+    }, index=pd.Index(close.columns, name='symbol'))
+
+
+@dataclass
+class BacktestResult:
+    rule: str
+    param_names: List[str]
+    stats: pd.DataFrame  # one row per (parameter combination, symbol)
+
+    def summary(self, sort_by: str = 'sharpe') -> pd.DataFrame:
+        """Metrics averaged across symbols for each parameter combination, best first."""
+        grouped = self.stats.groupby(self.param_names, sort=False)[METRIC_COLUMNS].mean()
+        grouped['symbols'] = self.stats.groupby(self.param_names, sort=False)['symbol'].nunique()
+        return grouped.sort_values(sort_by, ascending=False, na_position='last')
+
+
+def expand_grid(grid: Dict[str, Sequence]) -> List[Dict]:
+    names = list(grid)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(grid[n] for n in names))]
+
+
+def run_grid(
+    close: pd.DataFrame,
+    rule: str = 'range_position',
+    grid: Optional[Dict[str, Sequence]] = None,
+    cost_bps: float = DEFAULT_COST_BPS,
+    hit_horizon: int = DEFAULT_HIT_HORIZON,
+) -> BacktestResult:
+    """
+    Backtest `rule` for every parameter combination in `grid` over all columns of `close`.
+
+    Args:
+        close: Daily closes, one column per symbol (rows aligned by bar, NaN before listing)
+        rule: Name in RULES
+        grid: {param: [values]}; unspecified params use DEFAULT_GRIDS
+        cost_bps: Cost per position change, in basis points
+        hit_horizon: Forward bars used to score entry signals
+    """
+    if rule not in RULES:
+        raise ValueError(f"Unknown rule '{rule}'. Available: {', '.join(RULES)}")
+    full_grid = {**DEFAULT_GRIDS.get(rule, {}), **(grid or {})}
+    combos = [p for p in expand_grid(full_grid) if _valid_params(rule, p)]
+    if not combos:
+        raise ValueError("Parameter grid has no valid combinations")
+
+    cache: Dict = {}
+    frames = []
+    bars_per_year = periods_per_year(list(close.columns))
+    for params in combos:
+        entry, exit_ = RULES[rule](close, cache, **params)
+        stats = simulate(
+            close, entry, exit_, cost_bps=cost_bps, hit_horizon=hit_horizon, bars_per_year=bars_per_year,
+        ).reset_index()
+        for name, value in params.items():
+            stats[name] = value
+        frames.append(stats)
+    names = list(full_grid)
+    stats = pd.concat(frames, ignore_index=True)[names + ['symbol'] + METRIC_COLUMNS]
+    return BacktestResult(rule=rule, param_names=names, stats=stats)
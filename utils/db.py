@@ -3,6 +3,32 @@ import os
 
 DB_FILE = "watchlist.db"
 AGENT_DB = "agent_storage.db"
+MARKET_DB = "market_data.db"
+
+# Called with no arguments after the watchlist gains or loses tickers
+_watchlist_listeners = []
+
+def market_db_path() -> str:
+    """
+    SQLite file for the market-data caches of the selected provider (COFINANCE_DATA_PROVIDER).
+    Replay runs get their own file so bars cached by live runs never mask the fixtures.
+    """
+    kind = os.environ.get("COFINANCE_DATA_PROVIDER", "yfinance").strip().lower()
+    if kind in ("", "yfinance", "record"):
+        return MARKET_DB
+    return f"market_data.{kind}.db"
+
+def on_watchlist_change(callback) -> None:
+    """Register `callback()` to run after every watchlist edit (e.g. to refresh caches early)."""
+    if callback not in _watchlist_listeners:
+        _watchlist_listeners.append(callback)
+
+def _notify_watchlist_changed():
+    for callback in list(_watchlist_listeners):
+        try:
+            callback()
+        except Exception:
+            pass
 
 def init_db():
     """Initialize the SQLite database for the watchlist."""
@@ -43,6 +69,7 @@ def add_to_watchlist(ticker: str) -> str:
         c.execute('INSERT INTO watchlist (ticker) VALUES (?)', (ticker.upper(),))
         conn.commit()
         conn.close()
+        _notify_watchlist_changed()
         return f"✅ Added {ticker.upper()} to watchlist."
     except Exception as e:
         return f"❌ Error adding to watchlist: {e}"
@@ -75,6 +102,7 @@ def remove_from_watchlist(ticker: str) -> str:
         conn.close()
         
         if rows_affected > 0:
+            _notify_watchlist_changed()
             return f"✅ Removed {ticker.upper()} from watchlist."
         else:
             return f"ℹ️ {ticker.upper()} was not in your watchlist."
@@ -88,6 +116,7 @@ def clear_watchlist():
     c.execute('DELETE FROM watchlist')
     conn.commit()
     conn.close()
+    _notify_watchlist_changed()
 
 def get_all_sessions():
     """Retrieve all agent sessions from storage."""
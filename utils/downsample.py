@@ -0,0 +1,82 @@
+"""
+Server-side downsampling for price charts.
+
+Largest-Triangle-Three-Buckets (LTTB) keeps the visual shape of a series
+(peaks, troughs, trend changes) with a fixed point budget, so long histories
+produce small figure JSON and cheap redraws.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Return the indices of the points LTTB keeps from the series (x, y).
+
+    Args:
+        x: Monotonic x values (e.g., epoch nanoseconds)
+        y: Series values, same length as x
+        n_out: Target number of points (first and last are always kept)
+
+    Returns:
+        Sorted integer index array of length min(n_out, len(x))
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1], dtype=np.int64)
+
+    every = (n - 2) / (n_out - 2)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        # Average of the next bucket is the third triangle vertex
+        nxt_start, nxt_end = end, min(int((i + 2) * every) + 1, n)
+        if nxt_start >= nxt_end:
+            nxt_start, nxt_end = n - 1, n
+        avg_x = x[nxt_start:nxt_end].mean()
+        avg_y = y[nxt_start:nxt_end].mean()
+
+        bx = x[start:end]
+        by = y[start:end]
+        areas = np.abs((x[a] - avg_x) * (by - y[a]) - (x[a] - bx) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        out[i + 1] = a
+    return out
+
+
+def downsample_recent_full(
+    x: np.ndarray,
+    y: np.ndarray,
+    max_points: int,
+    recent_from: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Indices to plot: every point with x >= `recent_from`, LTTB over the rest.
+
+    The older part gets whatever budget the recent window leaves (at least a
+    handful of points), so zooming into recent ranges stays full resolution.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+    if recent_from is None:
+        return lttb_indices(x, y, max_points)
+
+    split = int(np.searchsorted(x, recent_from, side='left'))
+    recent = np.arange(split, n)
+    if split <= 2:
+        return np.arange(n)
+    budget = max(max_points - len(recent), 16)
+    older = lttb_indices(x[:split], np.asarray(y)[:split], min(budget, split))
+    return np.concatenate([older, recent])
@@ -0,0 +1,88 @@
+"""
+Bounded concurrent fan-out for per-symbol lookups.
+
+Runs one callable per key on a small thread pool and returns whatever finished.
+A slow or failing key only loses its own result, so total latency tracks the
+slowest key (capped by the per-task timeout) instead of the sum of all keys.
+"""
+
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TASK_TIMEOUT_SEC = 10.0
+_POLL_SEC = 0.05
+
+
+@dataclass
+class FanOutResult:
+    results: Dict[Hashable, Any] = field(default_factory=dict)
+    errors: Dict[Hashable, str] = field(default_factory=dict)  # key -> error message or "timeout"
+    elapsed_sec: float = 0.0
+
+
+def fan_out(
+    fn: Callable[[Hashable], Any],
+    keys: Iterable[Hashable],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timeout_sec: float = DEFAULT_TASK_TIMEOUT_SEC,
+) -> FanOutResult:
+    """
+    Call `fn(key)` for every key concurrently and collect partial results.
+
+    Args:
+        fn: Function to run per key
+        keys: Keys to fan out over (duplicates are fetched once)
+        max_workers: Upper bound on concurrent workers
+        timeout_sec: Per-task timeout, measured from when the task starts running
+
+    Returns:
+        FanOutResult with successful results and per-key errors
+    """
+    started_at = time.monotonic()
+    unique_keys = list(dict.fromkeys(keys))
+    outcome = FanOutResult()
+    if not unique_keys:
+        return outcome
+
+    workers = max(1, min(int(max_workers), len(unique_keys)))
+    task_started: Dict[Hashable, float] = {}
+
+    def run(key: Hashable) -> Any:
+        task_started[key] = time.monotonic()
+        return fn(key)
+
+    # Hard stop in case hung tasks keep queued ones from ever starting
+    waves = math.ceil(len(unique_keys) / workers)
+    deadline = started_at + timeout_sec * waves + _POLL_SEC
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fan_out")
+    futures = {executor.submit(run, key): key for key in unique_keys}
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=_POLL_SEC, return_when=FIRST_COMPLETED)
+            for fut in done:
+                key = futures[fut]
+                try:
+                    outcome.results[key] = fut.result()
+                except Exception as e:
+                    outcome.errors[key] = str(e) or e.__class__.__name__
+
+            now = time.monotonic()
+            for fut in list(pending):
+                key = futures[fut]
+                task_start = task_started.get(key)
+                if now >= deadline or (task_start is not None and now - task_start > timeout_sec):
+                    fut.cancel()
+                    outcome.errors[key] = "timeout"
+                    pending.discard(fut)
+    finally:
+        # Never block the caller on stragglers; they finish (and are dropped) in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    outcome.elapsed_sec = time.monotonic() - started_at
+    return outcome
@@ -0,0 +1,224 @@
+"""
+Time-versioned local store of company fundamentals.
+
+Each check of a symbol's reported fundamentals (EPS, ROE, dividend yield,
+revenue, ...) is compared with the latest stored snapshot, and a new snapshot
+is written only when something actually changed. Price-derived fields
+(market cap, P/E) move every trading day, so they are kept as unversioned
+latest values instead. Repeat queries are served from disk, and "how has
+EPS changed since last week" is answered from the stored versions without
+any network call.
+"""
+
+import json
+import math
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .db import market_db_path
+
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS fundamentals_snapshots (
+        symbol TEXT NOT NULL,
+        captured_at REAL NOT NULL,
+        fields TEXT NOT NULL,
+        PRIMARY KEY (symbol, captured_at)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS fundamentals_meta (
+        symbol TEXT PRIMARY KEY,
+        checked_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS fundamentals_latest (
+        symbol TEXT PRIMARY KEY,
+        fields TEXT NOT NULL
+    )
+    """,
+]
+
+# Stored field -> yfinance info key
+FUNDAMENTAL_FIELDS = {
+    'market_cap': 'marketCap',
+    'eps': 'trailingEps',
+    'forward_eps': 'forwardEps',
+    'pe': 'trailingPE',
+    'roe': 'returnOnEquity',
+    'dividend_yield': 'dividendYield',
+    'revenue': 'totalRevenue',
+    'profit_margin': 'profitMargins',
+}
+
+# Fields that follow the share price: stored as latest values only, never versioned
+PRICE_DERIVED_FIELDS = {'market_cap', 'pe'}
+# Relative change below which a reported field counts as unchanged (float noise)
+CHANGE_TOLERANCE = 1e-9
+
+# Fundamentals checked more recently than this are served from disk
+DEFAULT_MAX_AGE_SEC = 6 * 60 * 60
+
+# fetch(symbol) -> yfinance-style info dict
+InfoFetcher = Callable[[str], Dict]
+
+
+@dataclass
+class FundamentalsSnapshot:
+    symbol: str
+    captured_at: float
+    fields: Dict[str, Optional[float]]
+
+
+@contextmanager
+def _conn(db_path: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def extract_fundamentals(info: Dict) -> Dict[str, Optional[float]]:
+    """Numeric FUNDAMENTAL_FIELDS from an info dict (missing/non-numeric -> None)."""
+    fields: Dict[str, Optional[float]] = {}
+    for name, key in FUNDAMENTAL_FIELDS.items():
+        value = (info or {}).get(key)
+        fields[name] = float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value) else None
+    return fields
+
+
+def changed_fields(old: Dict[str, Optional[float]], new: Dict[str, Optional[float]]) -> List[str]:
+    """
+    Reported fields whose value differs (appearing/disappearing counts as a change).
+    Price-derived fields are ignored.
+    """
+    changed = []
+    for name in sorted((set(old) | set(new)) - PRICE_DERIVED_FIELDS):
+        a, b = old.get(name), new.get(name)
+        if a is None or b is None:
+            if a is not b:
+                changed.append(name)
+            continue
+        if abs(b - a) > CHANGE_TOLERANCE * max(abs(a), abs(b), 1e-12):
+            changed.append(name)
+    return changed
+
+
+class FundamentalsStore:
+    """Change-only versioned reported fundamentals plus latest price-derived values, in SQLite."""
+
+    def __init__(self, db_path: Optional[str] = None, max_age_sec: float = DEFAULT_MAX_AGE_SEC) -> None:
+        self.db_path = db_path or market_db_path()
+        self.max_age_sec = float(max_age_sec)
+        self._lock = threading.Lock()
+        with _conn(self.db_path) as conn:
+            cur = conn.cursor()
+            for stmt in SCHEMA_STATEMENTS:
+                cur.execute(stmt)
+            conn.commit()
+
+    def record(self, symbol: str, fields: Dict[str, Optional[float]], now: Optional[float] = None) -> bool:
+        """
+        Store the reported `fields` as a new version if they differ from the latest one
+        and overwrite the latest price-derived values. Always marks the symbol as checked.
+        Returns True if a snapshot was written.
+        """
+        symbol = symbol.upper().strip()
+        now = time.time() if now is None else float(now)
+        reported = {k: v for k, v in fields.items() if k not in PRICE_DERIVED_FIELDS}
+        priced = {k: v for k, v in fields.items() if k in PRICE_DERIVED_FIELDS}
+        with self._lock:
+            latest = self.latest(symbol)
+            is_new = latest is None or bool(changed_fields(latest.fields, reported))
+            with _conn(self.db_path) as conn:
+                if is_new:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO fundamentals_snapshots(symbol, captured_at, fields) VALUES(?,?,?)",
+                        (symbol, now, json.dumps(reported, sort_keys=True)),
+                    )
+                conn.execute(
+                    "INSERT OR REPLACE INTO fundamentals_latest(symbol, fields) VALUES(?,?)",
+                    (symbol, json.dumps(priced, sort_keys=True)),
+                )
+                conn.execute(
+                    "INSERT INTO fundamentals_meta(symbol, checked_at) VALUES(?,?) "
+                    "ON CONFLICT(symbol) DO UPDATE SET checked_at=excluded.checked_at",
+                    (symbol, now),
+                )
+                conn.commit()
+        return is_new
+
+    def _query(self, sql: str, params: tuple) -> List[FundamentalsSnapshot]:
+        with _conn(self.db_path) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [FundamentalsSnapshot(symbol=r[0], captured_at=r[1], fields=json.loads(r[2])) for r in rows]
+
+    def latest(self, symbol: str) -> Optional[FundamentalsSnapshot]:
+        rows = self._query(
+            "SELECT symbol, captured_at, fields FROM fundamentals_snapshots WHERE symbol=? ORDER BY captured_at DESC LIMIT 1",
+            (symbol.upper().strip(),),
+        )
+        return rows[0] if rows else None
+
+    def current(self, symbol: str) -> Optional[FundamentalsSnapshot]:
+        """The latest version with the latest price-derived values merged in."""
+        latest = self.latest(symbol)
+        if latest is None:
+            return None
+        with _conn(self.db_path) as conn:
+            row = conn.execute("SELECT fields FROM fundamentals_latest WHERE symbol=?", (latest.symbol,)).fetchone()
+        priced = json.loads(row[0]) if row else {}
+        return FundamentalsSnapshot(symbol=latest.symbol, captured_at=latest.captured_at, fields={**latest.fields, **priced})
+
+    def as_of(self, symbol: str, ts: float) -> Optional[FundamentalsSnapshot]:
+        """The version that was current at epoch-second `ts` (None if nothing was stored yet)."""
+        rows = self._query(
+            "SELECT symbol, captured_at, fields FROM fundamentals_snapshots WHERE symbol=? AND captured_at<=? "
+            "ORDER BY captured_at DESC LIMIT 1",
+            (symbol.upper().strip(), float(ts)),
+        )
+        return rows[0] if rows else None
+
+    def history(self, symbol: str, since: Optional[float] = None) -> List[FundamentalsSnapshot]:
+        """All versions (oldest first), optionally only those captured at or after `since`."""
+        return self._query(
+            "SELECT symbol, captured_at, fields FROM fundamentals_snapshots WHERE symbol=? AND captured_at>=? "
+            "ORDER BY captured_at ASC",
+            (symbol.upper().strip(), float(since) if since is not None else float('-inf')),
+        )
+
+    def checked_at(self, symbol: str) -> Optional[float]:
+        with _conn(self.db_path) as conn:
+            row = conn.execute("SELECT checked_at FROM fundamentals_meta WHERE symbol=?", (symbol.upper().strip(),)).fetchone()
+        return row[0] if row else None
+
+    def get(self, symbol: str, fetch: InfoFetcher) -> FundamentalsSnapshot:
+        """
+        Latest fundamentals for `symbol`: from disk if checked within `max_age_sec`,
+        otherwise fetched, versioned if changed, and returned. A failed fetch
+        falls back to the latest stored version when there is one.
+        """
+        checked = self.checked_at(symbol)
+        latest = self.current(symbol)
+        if latest is not None and checked is not None and time.time() - checked <= self.max_age_sec:
+            return latest
+        try:
+            fields = extract_fundamentals(fetch(symbol))
+        except Exception:
+            if latest is not None:
+                return latest
+            raise
+        if all(v is None for v in fields.values()):
+            # Empty payloads are upstream hiccups, not a company losing all its numbers
+            if latest is not None:
+                return latest
+            return FundamentalsSnapshot(symbol=symbol.upper().strip(), captured_at=time.time(), fields=fields)
+        self.record(symbol, fields)
+        return self.current(symbol)
@@ -0,0 +1,256 @@
+"""
+Incremental local OHLCV history store backed by SQLite.
+
+Bars are keyed by (symbol, interval, ts). The first request for a range
+downloads it once; later requests only fetch the bars after the last stored
+one and serve everything else from disk.
+"""
+
+import calendar
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from typing import Callable, Optional
+
+import pandas as pd
+
+from .db import market_db_path
+
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS ohlcv (
+        symbol TEXT NOT NULL,
+        interval TEXT NOT NULL,
+        ts INTEGER NOT NULL,
+        open REAL,
+        high REAL,
+        low REAL,
+        close REAL,
+        volume REAL,
+        PRIMARY KEY (symbol, interval, ts)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ohlcv_meta (
+        symbol TEXT NOT NULL,
+        interval TEXT NOT NULL,
+        covered_from INTEGER NOT NULL,
+        fetched_at REAL NOT NULL,
+        PRIMARY KEY (symbol, interval)
+    )
+    """,
+]
+
+# Approximate calendar days per yfinance period string ('max' and 'ytd' handled separately)
+PERIOD_DAYS = {
+    '1d': 1, '5d': 5, '1mo': 31, '3mo': 92, '6mo': 183,
+    '1y': 366, '2y': 731, '5y': 1827, '10y': 3653,
+}
+# Stored bars younger than this are served without asking upstream for newer ones
+REFRESH_AFTER_SEC = 15 * 60
+# Daily-or-longer bars are stored by exchange-local calendar date so symbols align across markets
+DAILY_INTERVALS = {'1d', '5d', '1wk', '1mo', '3mo'}
+# covered_from value for a range that was downloaded with period='max'
+_COVERS_ALL = -(2 ** 62)
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# fetch(symbol, interval=..., period=... | start=...) -> DataFrame shaped like Ticker.history()
+HistoryFetcher = Callable[..., pd.DataFrame]
+# reference_date(symbol, interval) -> day period windows end on (None = today)
+ReferenceDate = Callable[[str, str], Optional[date]]
+
+
+@dataclass
+class _Coverage:
+    covered_from: int
+    fetched_at: float
+
+
+def period_start(period: str, today: Optional[date] = None) -> Optional[int]:
+    """Epoch seconds of the first day a yfinance `period` asks for, or None for 'max'."""
+    period = (period or '1y').lower()
+    today = today or datetime.now(UTC).date()
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        start = date(today.year, 1, 1)
+    elif period in PERIOD_DAYS:
+        start = today - timedelta(days=PERIOD_DAYS[period])
+    else:
+        raise ValueError(f"Unsupported period '{period}'. Use one of: {', '.join(list(PERIOD_DAYS) + ['ytd', 'max'])}")
+    return calendar.timegm(start.timetuple())
+
+
+def _to_epoch_index(index: pd.Index, interval: str) -> pd.Series:
+    """Convert a Ticker.history() index to epoch seconds (local date for daily bars, UTC otherwise)."""
+    idx = pd.DatetimeIndex(index)
+    if idx.tz is not None:
+        idx = idx.tz_localize(None) if interval in DAILY_INTERVALS else idx.tz_convert('UTC').tz_localize(None)
+    if interval in DAILY_INTERVALS:
+        idx = idx.normalize()
+    return pd.Series((idx - pd.Timestamp(0)) // pd.Timedelta(seconds=1), index=index)
+
+
+@contextmanager
+def _conn(db_path: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+class HistoryStore:
+    """Persistent OHLCV bars with incremental top-up from an upstream fetcher."""
+
+    def __init__(
+        self,
+        fetch: HistoryFetcher,
+        db_path: Optional[str] = None,
+        refresh_after_sec: float = REFRESH_AFTER_SEC,
+        reference_date: Optional[ReferenceDate] = None,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            fetch: Upstream fetcher with the `Ticker.history()` keyword interface
+            db_path: SQLite database file (default: the selected provider's market DB)
+            refresh_after_sec: Age after which stored bars are topped up from upstream
+            reference_date: Day period windows are measured back from (replayed fixtures
+                end in the past); defaults to today
+        """
+        self._fetch = fetch
+        self.db_path = db_path or market_db_path()
+        self.refresh_after_sec = refresh_after_sec
+        self._reference_date = reference_date
+        with _conn(self.db_path) as conn:
+            cur = conn.cursor()
+            for stmt in SCHEMA_STATEMENTS:
+                cur.execute(stmt)
+            conn.commit()
+
+    def get_history(self, symbol: str, period: str = '1y', interval: str = '1d') -> pd.DataFrame:
+        """
+        Return OHLCV bars for `symbol` over `period`, fetching only what is missing locally.
+
+        Args:
+            symbol: Ticker symbol (e.g., 'AAPL', 'BTC-USD')
+            period: yfinance period string ('1mo', '6mo', '1y', '5y', 'ytd', 'max', ...)
+            interval: Bar interval ('1d', '1wk', '1h', ...)
+
+        Returns:
+            DataFrame indexed by date with Open/High/Low/Close/Volume columns
+        """
+        symbol = symbol.upper().strip()
+        today = self._reference_date(symbol, interval) if self._reference_date is not None else None
+        start = period_start(period, today)
+        coverage = self._coverage(symbol, interval)
+
+        if coverage is None or not self._covers(coverage, start):
+            # Requested range reaches further back than anything stored: one full download
+            try:
+                frame = self._fetch(symbol, interval=interval, period=period)
+            except Exception:
+                if coverage is None:
+                    raise
+                # Upstream down: the shorter range already stored beats an error
+                return self.read(symbol, interval, start)
+            # An empty download (yfinance's answer to transient errors) must not mark the range covered
+            if self._upsert(symbol, interval, frame):
+                covered_from = _COVERS_ALL if start is None else start
+                if coverage is not None:
+                    covered_from = min(covered_from, coverage.covered_from)
+                self._set_coverage(symbol, interval, covered_from)
+        elif time.time() - coverage.fetched_at > self.refresh_after_sec:
+            self._top_up(symbol, interval, coverage, period)
+
+        return self.read(symbol, interval, start)
+
+    def read(self, symbol: str, interval: str = '1d', start: Optional[int] = None) -> pd.DataFrame:
+        """Read stored bars only (no network), optionally from epoch-second `start`."""
+        q = "SELECT ts, open, high, low, close, volume FROM ohlcv WHERE symbol=? AND interval=?"
+        params = [symbol.upper().strip(), interval]
+        if start is not None:
+            q += " AND ts >= ?"
+            params.append(int(start))
+        q += " ORDER BY ts ASC"
+        with _conn(self.db_path) as conn:
+            rows = conn.execute(q, params).fetchall()
+        frame = pd.DataFrame(rows, columns=['ts'] + OHLCV_COLUMNS)
+        frame.index = pd.to_datetime(frame.pop('ts'), unit='s')
+        frame.index.name = 'Date'
+        return frame
+
+    def last_timestamp(self, symbol: str, interval: str = '1d') -> Optional[int]:
+        """Epoch seconds of the newest stored bar, or None if nothing is stored."""
+        with _conn(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT MAX(ts) FROM ohlcv WHERE symbol=? AND interval=?",
+                (symbol.upper().strip(), interval),
+            ).fetchone()
+        return row[0] if row and row[0] is not None else None
+
+    def _top_up(self, symbol: str, interval: str, coverage: _Coverage, period: str) -> None:
+        last_ts = self.last_timestamp(symbol, interval)
+        if last_ts is None:
+            # Covered but nothing stored: download the full range again
+            request = {'period': period}
+        else:
+            # Refetch from the last stored bar: it may have been a partial (intraday) bar
+            request = {'start': datetime.fromtimestamp(last_ts, UTC).strftime('%Y-%m-%d')}
+        try:
+            frame = self._fetch(symbol, interval=interval, **request)
+        except Exception:
+            # Stale bars beat no chart; try again on the next request
+            return
+        stored = self._upsert(symbol, interval, frame)
+        if stored or last_ts is not None:
+            self._set_coverage(symbol, interval, coverage.covered_from)
+
+    @staticmethod
+    def _covers(coverage: _Coverage, start: Optional[int]) -> bool:
+        if start is None:
+            return coverage.covered_from == _COVERS_ALL
+        return coverage.covered_from <= start
+
+    def _coverage(self, symbol: str, interval: str) -> Optional[_Coverage]:
+        with _conn(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT covered_from, fetched_at FROM ohlcv_meta WHERE symbol=? AND interval=?",
+                (symbol, interval),
+            ).fetchone()
+        return _Coverage(covered_from=row[0], fetched_at=row[1]) if row else None
+
+    def _set_coverage(self, symbol: str, interval: str, covered_from: int) -> None:
+        with _conn(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ohlcv_meta(symbol, interval, covered_from, fetched_at) VALUES(?,?,?,?)",
+                (symbol, interval, int(covered_from), time.time()),
+            )
+            conn.commit()
+
+    def _upsert(self, symbol: str, interval: str, frame: Optional[pd.DataFrame]) -> int:
+        """Store the bars in `frame`; returns how many were written."""
+        if frame is None or frame.empty:
+            return 0
+        bars = frame.reindex(columns=OHLCV_COLUMNS)
+        bars = bars[bars['Close'].notna()]
+        if bars.empty:
+            return 0
+        ts = _to_epoch_index(bars.index, interval)
+        rows = [
+            (symbol, interval, int(t), *(None if pd.isna(v) else float(v) for v in values))
+            for t, values in zip(ts.to_numpy(), bars.to_numpy())
+        ]
+        with _conn(self.db_path) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ohlcv(symbol, interval, ts, open, high, low, close, volume) VALUES(?,?,?,?,?,?,?,?)",
+                rows,
+            )
+            conn.commit()
+        return len(rows)
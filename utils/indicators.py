@@ -0,0 +1,111 @@
+"""
+Vectorized technical indicators.
+
+Every function takes pandas objects where each column is one symbol, so a
+single call computes an indicator for the whole watchlist at once.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def sma(close: pd.DataFrame, window: int) -> pd.DataFrame:
+    return close.rolling(window, min_periods=window).mean()
+
+
+def ema(close: pd.DataFrame, span: int) -> pd.DataFrame:
+    return close.ewm(span=span, adjust=False, min_periods=span).mean()
+
+
+def rsi(close: pd.DataFrame, window: int = 14) -> pd.DataFrame:
+    """Wilder's RSI (0-100)."""
+    delta = close.diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+    avg_gain = gain.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    avg_loss = loss.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    rs = avg_gain / avg_loss
+    return 100 - 100 / (1 + rs)
+
+
+def macd(close: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, pd.DataFrame]:
+    line = ema(close, fast) - ema(close, slow)
+    sig = line.ewm(span=signal, adjust=False, min_periods=signal).mean()
+    return {'MACD': line, 'MACD_signal': sig, 'MACD_hist': line - sig}
+
+
+def bollinger(close: pd.DataFrame, window: int = 20, num_std: float = 2.0) -> Dict[str, pd.DataFrame]:
+    mid = sma(close, window)
+    std = close.rolling(window, min_periods=window).std(ddof=0)
+    upper = mid + num_std * std
+    lower = mid - num_std * std
+    return {
+        'BB_mid': mid,
+        'BB_upper': upper,
+        'BB_lower': lower,
+        'BB_pct_b': (close - lower) / (upper - lower),
+    }
+
+
+def atr(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame, window: int = 14) -> pd.DataFrame:
+    """Wilder's Average True Range."""
+    prev_close = close.shift(1)
+    true_range = np.fmax(high - low, np.fmax((high - prev_close).abs(), (low - prev_close).abs()))
+    return true_range.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+
+
+def realized_volatility(close: pd.DataFrame, window: int = 20) -> pd.DataFrame:
+    """Annualized close-to-close volatility of log returns."""
+    log_returns = np.log(close).diff()
+    return log_returns.rolling(window, min_periods=window).std() * np.sqrt(TRADING_DAYS_PER_YEAR)
+
+
+def compute_indicator_panel(
+    close: pd.DataFrame,
+    high: Optional[pd.DataFrame] = None,
+    low: Optional[pd.DataFrame] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Compute the full indicator set for every column (symbol) in one pass.
+
+    Args:
+        close: Close prices, one column per symbol
+        high: Highs with the same shape (ATR is skipped when missing)
+        low: Lows with the same shape (ATR is skipped when missing)
+
+    Returns:
+        Dict of indicator name -> DataFrame shaped like `close`
+    """
+    panel: Dict[str, pd.DataFrame] = {
+        'SMA_20': sma(close, 20),
+        'SMA_50': sma(close, 50),
+        'SMA_200': sma(close, 200),
+        'EMA_12': ema(close, 12),
+        'EMA_26': ema(close, 26),
+        'RSI_14': rsi(close, 14),
+        'RV_20': realized_volatility(close, 20),
+    }
+    panel.update(macd(close))
+    panel.update(bollinger(close))
+    if high is not None and low is not None:
+        panel['ATR_14'] = atr(high, low, close, 14)
+    return panel
+
+
+def align_by_bar(series_by_symbol: Dict[str, pd.Series]) -> pd.DataFrame:
+    """
+    Stack per-symbol series into one matrix aligned on their latest bar.
+
+    Stocks and crypto trade on different calendars; aligning by bar position
+    (row 0 = latest bar) keeps rolling windows gap-free for every symbol.
+    """
+    columns = {
+        sym: pd.Series(s.to_numpy(dtype=float), index=range(1 - len(s), 1))
+        for sym, s in series_by_symbol.items()
+        if s is not None and len(s)
+    }
+    return pd.DataFrame(columns).sort_index()
@@ -0,0 +1,277 @@
+"""
+Pluggable market-data providers.
+
+All data tools fetch quotes, history, recommendations and sentiment through
+`get_provider()`. The default backend is yfinance; the replay backend serves
+recorded fixtures from disk so the whole data path can be benchmarked and
+tested offline with deterministic numbers.
+
+Select the backend with the COFINANCE_DATA_PROVIDER environment variable:
+- "yfinance" (default): live data
+- "replay": fixtures from COFINANCE_FIXTURES_DIR (default "fixtures")
+- "record": live data, written to COFINANCE_FIXTURES_DIR as it is fetched
+
+Fixture layout:
+    <dir>/info/<SYMBOL>.json
+    <dir>/history/<SYMBOL>_<interval>.csv
+    <dir>/recommendations/<SYMBOL>.csv
+    <dir>/sentiment/fear_greed.json
+"""
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Dict, List, Optional
+
+import pandas as pd
+import requests
+import yfinance as yf
+
+from .history_store import PERIOD_DAYS
+from .resilience import get_upstream
+
+DEFAULT_FIXTURES_DIR = "fixtures"
+
+
+class MarketDataProvider(ABC):
+    """Interface every market-data backend implements; incomplete backends fail at construction."""
+
+    name = "base"
+
+    @abstractmethod
+    def get_info(self, symbol: str) -> dict:
+        """Quote/profile dict with `Ticker.info` keys."""
+
+    @abstractmethod
+    def get_history(self, symbol: str, **kwargs) -> pd.DataFrame:
+        """OHLCV bars; accepts the `Ticker.history()` keywords interval, period, start."""
+
+    @abstractmethod
+    def get_recommendations(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Analyst recommendation table shaped like `Ticker.recommendations`."""
+
+    @abstractmethod
+    def download(self, symbols: List[str], period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        """Bulk daily bars for many symbols, columns grouped by ticker (MultiIndex)."""
+
+    @abstractmethod
+    def get_fear_greed(self) -> dict:
+        """Crypto Fear & Greed Index as {'score': int, 'label': str}."""
+
+    def reference_date(self, symbol: str, interval: str = "1d") -> Optional[date]:
+        """Day that period windows ('1y', 'ytd') are measured back from; None means today."""
+        return None
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Live data from Yahoo Finance (and alternative.me for Fear & Greed).
+    Every call goes through the upstream's rate limiter and circuit breaker.
+    """
+
+    name = "yfinance"
+
+    def get_info(self, symbol: str) -> dict:
+        return get_upstream('yfinance').call(lambda: yf.Ticker(symbol).info)
+
+    def get_history(self, symbol: str, **kwargs) -> pd.DataFrame:
+        return get_upstream('yfinance').call(lambda: yf.Ticker(symbol).history(**kwargs))
+
+    def get_recommendations(self, symbol: str) -> Optional[pd.DataFrame]:
+        return get_upstream('yfinance').call(lambda: yf.Ticker(symbol).recommendations)
+
+    def download(self, symbols: List[str], period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        return get_upstream('yfinance').call(
+            yf.download,
+            list(symbols),
+            period=period,
+            interval=interval,
+            group_by="ticker",
+            auto_adjust=False,
+            threads=True,
+            progress=False,
+        )
+
+    def get_fear_greed(self) -> dict:
+        def _fetch() -> dict:
+            response = requests.get('https://api.alternative.me/fng/', timeout=5)
+            response.raise_for_status()
+            return response.json()
+
+        data = get_upstream('alternative.me').call(_fetch)
+        return {
+            'score': int(data['data'][0]['value']),
+            'label': data['data'][0]['value_classification'],
+        }
+
+
+def _safe_name(symbol: str) -> str:
+    return symbol.upper().strip().replace('/', '_').replace('^', '_')
+
+
+class ReplayProvider(MarketDataProvider):
+    """Serves recorded fixtures from disk; missing fixtures raise FileNotFoundError."""
+
+    name = "replay"
+
+    def __init__(self, fixtures_dir: str = DEFAULT_FIXTURES_DIR) -> None:
+        self.fixtures_dir = fixtures_dir
+
+    def _path(self, kind: str, filename: str) -> str:
+        return os.path.join(self.fixtures_dir, kind, filename)
+
+    def get_info(self, symbol: str) -> dict:
+        with open(self._path('info', f"{_safe_name(symbol)}.json"), encoding='utf-8') as f:
+            return json.load(f)
+
+    def _read_history(self, symbol: str, interval: str) -> pd.DataFrame:
+        frame = pd.read_csv(self._path('history', f"{_safe_name(symbol)}_{interval}.csv"), index_col=0)
+        frame.index = pd.to_datetime(frame.index, utc=True).tz_localize(None)
+        return frame
+
+    def reference_date(self, symbol: str, interval: str = "1d") -> Optional[date]:
+        """The last recorded bar's date, so stored windows match the fixture's own windows."""
+        try:
+            frame = self._read_history(symbol, interval)
+        except FileNotFoundError:
+            return None
+        return frame.index[-1].date() if not frame.empty else None
+
+    def get_history(self, symbol: str, **kwargs) -> pd.DataFrame:
+        frame = self._read_history(symbol, kwargs.get('interval', '1d'))
+        if kwargs.get('start') is not None:
+            frame = frame[frame.index >= pd.Timestamp(kwargs['start'])]
+        else:
+            period = (kwargs.get('period') or '1y').lower()
+            # Windows are relative to the last recorded bar so replays are deterministic
+            if period in PERIOD_DAYS and not frame.empty:
+                frame = frame[frame.index >= frame.index[-1] - pd.Timedelta(days=PERIOD_DAYS[period])]
+            elif period == 'ytd' and not frame.empty:
+                frame = frame[frame.index >= pd.Timestamp(year=frame.index[-1].year, month=1, day=1)]
+        return frame
+
+    def get_recommendations(self, symbol: str) -> Optional[pd.DataFrame]:
+        path = self._path('recommendations', f"{_safe_name(symbol)}.csv")
+        if not os.path.exists(path):
+            return None
+        return pd.read_csv(path)
+
+    def download(self, symbols: List[str], period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        frames: Dict[str, pd.DataFrame] = {}
+        for sym in symbols:
+            try:
+                frames[sym] = self.get_history(sym, period=period, interval=interval)
+            except FileNotFoundError:
+                continue
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+    def get_fear_greed(self) -> dict:
+        with open(self._path('sentiment', 'fear_greed.json'), encoding='utf-8') as f:
+            return json.load(f)
+
+
+class RecordingProvider(MarketDataProvider):
+    """Wraps another provider and writes every successful response as a replay fixture."""
+
+    name = "record"
+
+    def __init__(self, inner: MarketDataProvider, fixtures_dir: str = DEFAULT_FIXTURES_DIR) -> None:
+        self.inner = inner
+        self.fixtures_dir = fixtures_dir
+        self._lock = threading.Lock()
+
+    def _write(self, kind: str, filename: str, writer) -> None:
+        folder = os.path.join(self.fixtures_dir, kind)
+        with self._lock:
+            os.makedirs(folder, exist_ok=True)
+            writer(os.path.join(folder, filename))
+
+    def get_info(self, symbol: str) -> dict:
+        info = self.inner.get_info(symbol)
+
+        def _dump(path: str) -> None:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(info, f, default=str)
+
+        self._write('info', f"{_safe_name(symbol)}.json", _dump)
+        return info
+
+    def get_history(self, symbol: str, **kwargs) -> pd.DataFrame:
+        frame = self.inner.get_history(symbol, **kwargs)
+        if frame is not None and not frame.empty:
+            interval = kwargs.get('interval', '1d')
+
+            def _dump(path: str) -> None:
+                merged = frame
+                if os.path.exists(path):
+                    previous = pd.read_csv(path, index_col=0)
+                    previous.index = pd.to_datetime(previous.index, utc=True)
+                    current = frame.copy()
+                    current.index = pd.to_datetime(current.index, utc=True)
+                    merged = pd.concat([previous, current])
+                    merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+                merged.to_csv(path)
+
+            self._write('history', f"{_safe_name(symbol)}_{interval}.csv", _dump)
+        return frame
+
+    def get_recommendations(self, symbol: str) -> Optional[pd.DataFrame]:
+        recs = self.inner.get_recommendations(symbol)
+        if recs is not None and not recs.empty:
+            self._write('recommendations', f"{_safe_name(symbol)}.csv", lambda path: recs.to_csv(path, index=False))
+        return recs
+
+    def download(self, symbols: List[str], period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        # Recorded per symbol so the replay backend can rebuild any batch
+        frame = self.inner.download(symbols, period=period, interval=interval)
+        if frame is not None and not frame.empty and getattr(frame.columns, 'nlevels', 1) > 1:
+            for sym in frame.columns.get_level_values(0).unique():
+                bars = frame[sym].dropna(how='all')
+                if not bars.empty:
+                    self._write('history', f"{_safe_name(sym)}_{interval}.csv", lambda path, b=bars: b.to_csv(path))
+        return frame
+
+    def reference_date(self, symbol: str, interval: str = "1d") -> Optional[date]:
+        return self.inner.reference_date(symbol, interval)
+
+    def get_fear_greed(self) -> dict:
+        data = self.inner.get_fear_greed()
+
+        def _dump(path: str) -> None:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+
+        self._write('sentiment', 'fear_greed.json', _dump)
+        return data
+
+
+def provider_from_env() -> MarketDataProvider:
+    """Build the provider selected by COFINANCE_DATA_PROVIDER / COFINANCE_FIXTURES_DIR."""
+    kind = os.environ.get("COFINANCE_DATA_PROVIDER", "yfinance").strip().lower()
+    fixtures_dir = os.environ.get("COFINANCE_FIXTURES_DIR", DEFAULT_FIXTURES_DIR)
+    if kind == "replay":
+        return ReplayProvider(fixtures_dir)
+    if kind == "record":
+        return RecordingProvider(YFinanceProvider(), fixtures_dir)
+    return YFinanceProvider()
+
+
+_provider: Optional[MarketDataProvider] = None
+
+
+def get_provider() -> MarketDataProvider:
+    """Return the process-wide market-data provider."""
+    global _provider
+    if _provider is None:
+        _provider = provider_from_env()
+    return _provider
+
+
+def set_provider(provider: Optional[MarketDataProvider]) -> None:
+    """Swap the process-wide provider (None = rebuild from the environment on next use)."""
+    global _provider
+    _provider = provider
@@ -7,6 +7,7 @@ from datetime import datetime, UTC
 from typing import Dict, List, Optional, Tuple
 
 from .db import AGENT_DB
+from .symbol_master import AMBIGUOUS_TICKERS, NOT_TICKERS, get_symbol_master, has_ticker_context
 
 
 SCHEMA_STATEMENTS = [
@@ -196,19 +197,39 @@ class MemoryStore:
             conn.commit()
 
 
-TICKER_PATTERN = re.compile(r"\$?[A-Z]{1,5}")
+TICKER_PATTERN = re.compile(r"\$?\b[A-Z]{1,5}(?:-[A-Z]{1,4})?\b")
 
 
 def extract_entities_from_text(text: str) -> Dict[str, List[str]]:
-    """Very lightweight entity extractor for tickers and simple intents."""
+    """Very lightweight entity extractor for tickers and simple intents.
+
+    Uppercase candidates known to the offline symbol master are kept unless they
+    are common words like "I", "AND" or "USD"; tickers that double as words
+    ("MS", "NOW") and tickers the master does not know ("ROKU") need a $cashtag
+    or explicit ticker context ("ROKU stock"). Names and aliases resolve through
+    the master too.
+    """
+    text = text or ""
+    master = get_symbol_master()
     tickers = set()
-    for token in TICKER_PATTERN.findall(text or ""):
-        clean = token[1:] if token.startswith("$") else token
-        if 1 <= len(clean) <= 5 and clean.isupper():
+    for match in TICKER_PATTERN.finditer(text):
+        token = match.group()
+        cashtag = token.startswith("$")
+        clean = token[1:] if cashtag else token
+        if clean in NOT_TICKERS:
+            continue
+        if clean in AMBIGUOUS_TICKERS and not (cashtag or has_ticker_context(text, match.start(), match.end())):
+            continue
+        record = master.lookup(clean)
+        if record is not None:
+            tickers.add(record.ticker)
+        elif cashtag or has_ticker_context(text, match.start(), match.end()):
+            # Unknown to the master: only trusted when explicitly marked as a ticker
             tickers.add(clean)
+    tickers.update(master.find_names(text))
 
     intents = []
-    lower = (text or "").lower()
+    lower = text.lower()
     if any(k in lower for k in ["compare", "versus", "vs", "side-by-side"]):
         intents.append("comparison_requested")
     if any(k in lower for k in ["deep dive", "detailed", "fundamental"]):
@@ -0,0 +1,153 @@
+"""
+SimHash near-duplicate detection for news results.
+
+The same wire story syndicated across several sites arrives with small edits
+(a different source tag, a trimmed sentence), so exact hashes miss it. Each
+article gets a 64-bit SimHash of its title and body shingles; copies land
+within a few bits of each other. Signatures are kept in a bounded index
+across calls, bucketed by band so lookups only compare a handful of
+candidates, and each cluster keeps the id of the first copy seen.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+SIMHASH_BITS = 64
+# Bands for candidate lookup; by pigeonhole, signatures within BANDS - 1 bits share a band
+BANDS = 8
+BAND_BITS = SIMHASH_BITS // BANDS
+# Signatures this close (Hamming distance) are treated as the same story
+DEFAULT_MAX_DISTANCE = 6
+DEFAULT_MAX_ENTRIES = 5000
+
+_WORD = re.compile(r"[a-z0-9$%.]+")
+_MASK = (1 << SIMHASH_BITS) - 1
+
+
+def _tokens(text: str) -> List[str]:
+    return [w.strip('.') for w in _WORD.findall((text or '').lower()) if w.strip('.')]
+
+
+def _features(title: str, body: str) -> Dict[str, int]:
+    """Word unigrams and bigrams; title features count double since titles survive syndication best."""
+    weights: Dict[str, int] = {}
+    for text, weight in ((title, 2), (body, 1)):
+        words = _tokens(text)
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            weights[feature] = weights.get(feature, 0) + weight
+    return weights
+
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(title: str, body: str = '') -> int:
+    """64-bit SimHash of an article's title and body."""
+    counts = [0] * SIMHASH_BITS
+    for feature, weight in _features(title, body).items():
+        h = _hash64(feature)
+        for bit in range(SIMHASH_BITS):
+            counts[bit] += weight if (h >> bit) & 1 else -weight
+    return sum(1 << bit for bit, c in enumerate(counts) if c > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK).count('1')
+
+
+def _bands(signature: int) -> List[Tuple[int, int]]:
+    mask = (1 << BAND_BITS) - 1
+    return [(i, (signature >> (i * BAND_BITS)) & mask) for i in range(BANDS)]
+
+
+class NearDupeIndex:
+    """Bounded SimHash index mapping each signature to the first article id in its cluster."""
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        if max_distance >= BANDS:
+            raise ValueError(f"max_distance must be below {BANDS} for banded lookup")
+        self.max_distance = int(max_distance)
+        self.max_entries = int(max_entries)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, str]" = OrderedDict()  # signature -> cluster id
+        self._buckets: Dict[Tuple[int, int], Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find(self, signature: int) -> Optional[str]:
+        """Cluster id of the closest indexed signature within `max_distance`, else None."""
+        with self._lock:
+            return self._find(signature)
+
+    def _find(self, signature: int) -> Optional[str]:
+        best, best_distance = None, self.max_distance + 1
+        candidates = set()
+        for band in _bands(signature):
+            candidates |= self._buckets.get(band, set())
+        for other in candidates:
+            distance = hamming(signature, other)
+            if distance < best_distance:
+                best, best_distance = other, distance
+        return self._entries[best] if best is not None else None
+
+    def add(self, article_id: str, signature: int) -> str:
+        """Index `signature` and return its cluster id (`article_id` if it starts a new cluster)."""
+        with self._lock:
+            cluster = self._find(signature) or article_id
+            if signature in self._entries:
+                self._entries.move_to_end(signature)
+                return self._entries[signature]
+            self._entries[signature] = cluster
+            for band in _bands(signature):
+                self._buckets.setdefault(band, set()).add(signature)
+            while len(self._entries) > self.max_entries:
+                old, _ = self._entries.popitem(last=False)
+                for band in _bands(old):
+                    bucket = self._buckets.get(band)
+                    if bucket is not None:
+                        bucket.discard(old)
+                        if not bucket:
+                            del self._buckets[band]
+            return cluster
+
+    def collapse(self, results: Iterable[Dict]) -> List[Dict]:
+        """
+        Keep the first result of every near-duplicate cluster (order kept). Kept
+        results get 'duplicates' (copies dropped) and 'also_in' (their sources).
+        """
+        kept: "OrderedDict[str, Dict]" = OrderedDict()
+        for r in results:
+            url = r.get('href') or r.get('url') or ''
+            cluster = self.add(url or r.get('title', ''), simhash(r.get('title', ''), r.get('body', '')))
+            if cluster in kept:
+                first = kept[cluster]
+                first['duplicates'] += 1
+                source = r.get('source') or _host(url)
+                if source and source not in first['also_in']:
+                    first['also_in'].append(source)
+            else:
+                kept[cluster] = {**r, 'duplicates': 0, 'also_in': []}
+        return list(kept.values())
+
+
+def _host(url: str) -> str:
+    host = re.sub(r"^[a-z]+://", "", (url or '').lower()).split('/')[0]
+    return host[4:] if host.startswith('www.') else host
+
+
+_index: Optional[NearDupeIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_near_dupe_index() -> NearDupeIndex:
+    """Return the process-wide near-duplicate index."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = NearDupeIndex()
+        return _index
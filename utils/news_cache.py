@@ -0,0 +1,326 @@
+"""
+Persistent, symbol-keyed cache for news search results.
+
+Results are stored per (symbol, query) with a TTL, so repeated lookups in a
+session are served from SQLite instead of a new search. Articles are stored
+once and deduplicated by canonical URL and by a hash of their normalized
+title and body, which also drops the same story served under two URLs.
+Every stored article is also indexed once in an FTS5 table keyed by its id
+and linked to each symbol it was found for, so past coverage can be searched
+locally.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .db import market_db_path
+
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS news_articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT NOT NULL UNIQUE,
+        content_hash TEXT NOT NULL UNIQUE,
+        title TEXT NOT NULL,
+        body TEXT NOT NULL,
+        source TEXT,
+        published TEXT,
+        first_seen REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS news_queries (
+        symbol TEXT NOT NULL,
+        query TEXT NOT NULL,
+        fetched_at REAL NOT NULL,
+        PRIMARY KEY (symbol, query)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS news_query_results (
+        symbol TEXT NOT NULL,
+        query TEXT NOT NULL,
+        rank INTEGER NOT NULL,
+        article_id INTEGER NOT NULL,
+        PRIMARY KEY (symbol, query, rank)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS news_symbol_articles (
+        symbol TEXT NOT NULL,
+        article_id INTEGER NOT NULL,
+        PRIMARY KEY (symbol, article_id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS news_symbol_articles_by_article ON news_symbol_articles(article_id)
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+        title, body,
+        tokenize='porter unicode61'
+    )
+    """,
+]
+
+# Headlines move slower than quotes; half an hour keeps a session's repeats local
+DEFAULT_NEWS_TTL_SEC = 30 * 60
+
+# bm25 column weights for news_fts (title, body)
+FTS_WEIGHTS = (2.0, 1.0)
+
+_TRACKING_PARAMS = re.compile(r"^(utm_|fbclid$|gclid$|mc_cid$|mc_eid$|ref$|guccounter$)")
+
+# fetch() -> [{'title', 'href', 'body', ...}] as returned by DDGS().text / .news
+NewsFetcher = Callable[[], List[Dict]]
+
+
+@contextmanager
+def _conn(db_path: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def canonical_url(url: str) -> str:
+    """Lowercase scheme/host, drop tracking params, fragments, 'www.' and trailing slashes."""
+    parts = urlsplit((url or "").strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not _TRACKING_PARAMS.match(k.lower())])
+    return urlunsplit((parts.scheme.lower() or "https", host, parts.path.rstrip("/") or "/", query, ""))
+
+
+def content_hash(title: str, body: str) -> str:
+    """Hash of the normalized title and body, so reformatted copies of a story collide."""
+    text = re.sub(r"[^a-z0-9 ]", " ", f"{title} {body}".lower())
+    return hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def dedupe_results(results: List[Dict]) -> List[Dict]:
+    """Drop results repeating an earlier one's canonical URL or content hash (order kept)."""
+    seen_urls, seen_hashes, kept = set(), set(), []
+    for r in results:
+        url = canonical_url(r.get('href') or r.get('url') or '')
+        digest = content_hash(r.get('title', ''), r.get('body', ''))
+        if url in seen_urls or digest in seen_hashes:
+            continue
+        seen_urls.add(url)
+        seen_hashes.add(digest)
+        kept.append(r)
+    return kept
+
+
+def fts_query(text: str) -> str:
+    """Free text -> FTS5 query: quoted terms OR-ed together (bm25 ranks docs matching more terms higher)."""
+    terms = re.findall(r"[\w$%]+", (text or "").lower())
+    return " OR ".join(f'"{t}"' for t in dict.fromkeys(terms))
+
+
+def _index_article(conn: sqlite3.Connection, symbol: str, article_id: int) -> None:
+    """Link the article to `symbol` and add it to the full-text index if it is not there yet."""
+    conn.execute("INSERT OR IGNORE INTO news_symbol_articles(symbol, article_id) VALUES(?,?)", (symbol, article_id))
+    conn.execute(
+        "INSERT INTO news_fts(rowid, title, body) SELECT id, title, body FROM news_articles "
+        "WHERE id=? AND NOT EXISTS (SELECT 1 FROM news_fts WHERE rowid=?)",
+        (article_id, article_id),
+    )
+
+
+def _drop_per_symbol_index(conn: sqlite3.Connection) -> bool:
+    """Drop a full-text table from the layout that held one row per (symbol, article); True if dropped."""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(news_fts)")]
+    if 'symbol' not in columns:
+        return False
+    conn.execute("DROP TABLE news_fts")
+    return True
+
+
+class NewsCache:
+    """TTL cache of news search results keyed by (symbol, query), persisted in SQLite."""
+
+    def __init__(self, db_path: Optional[str] = None, ttl_sec: float = DEFAULT_NEWS_TTL_SEC) -> None:
+        self.db_path = db_path or market_db_path()
+        self.ttl_sec = float(ttl_sec)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        with _conn(self.db_path) as conn:
+            cur = conn.cursor()
+            reindex = _drop_per_symbol_index(conn)
+            for stmt in SCHEMA_STATEMENTS:
+                cur.execute(stmt)
+            if reindex:
+                cur.execute(
+                    "INSERT INTO news_fts(rowid, title, body) SELECT id, title, body FROM news_articles "
+                    "WHERE id IN (SELECT article_id FROM news_symbol_articles)"
+                )
+            # Index articles cached before the full-text table existed
+            for symbol, article_id in cur.execute(
+                "SELECT DISTINCT r.symbol, r.article_id FROM news_query_results r "
+                "LEFT JOIN news_symbol_articles s ON s.symbol = r.symbol AND s.article_id = r.article_id "
+                "WHERE s.article_id IS NULL"
+            ).fetchall():
+                _index_article(conn, symbol, article_id)
+            conn.commit()
+
+    def fetched_at(self, symbol: str, query: str) -> Optional[float]:
+        with _conn(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT fetched_at FROM news_queries WHERE symbol=? AND query=?", (symbol.upper().strip(), query)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _read(self, symbol: str, query: str) -> List[Dict]:
+        with _conn(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT a.title, a.url, a.body, a.source, a.published
+                FROM news_query_results r JOIN news_articles a ON a.id = r.article_id
+                WHERE r.symbol=? AND r.query=? ORDER BY r.rank ASC
+                """,
+                (symbol.upper().strip(), query),
+            ).fetchall()
+        return [{'title': t, 'href': u, 'body': b, 'source': s, 'date': p} for t, u, b, s, p in rows]
+
+    def get(self, symbol: str, query: str, max_age_sec: Optional[float] = None) -> Optional[List[Dict]]:
+        """Cached results if fetched within `max_age_sec` (default TTL), else None."""
+        fetched = self.fetched_at(symbol, query)
+        limit = self.ttl_sec if max_age_sec is None else max_age_sec
+        if fetched is None or time.time() - fetched > limit:
+            return None
+        return self._read(symbol, query)
+
+    def put(self, symbol: str, query: str, results: List[Dict]) -> List[Dict]:
+        """
+        Store `results` for (symbol, query), deduplicated; returns what was stored.
+        An empty result (a throttled search, not proof there is no news) is not
+        stored and does not mark the query fetched, so the next lookup searches
+        again; the previous results, if any, are kept and returned.
+        """
+        symbol = symbol.upper().strip()
+        now = time.time()
+        kept = dedupe_results(results)
+        if not kept:
+            return self._read(symbol, query)
+        with self._lock, _conn(self.db_path) as conn:
+            conn.execute("DELETE FROM news_query_results WHERE symbol=? AND query=?", (symbol, query))
+            rank, linked = 0, set()
+            for r in kept:
+                url = canonical_url(r.get('href') or r.get('url') or '')
+                title, body = r.get('title') or '', r.get('body') or ''
+                digest = content_hash(title, body)
+                row = conn.execute(
+                    "SELECT id FROM news_articles WHERE url=? OR content_hash=? LIMIT 1", (url, digest)
+                ).fetchone()
+                if row is None:
+                    cur = conn.execute(
+                        "INSERT INTO news_articles(url, content_hash, title, body, source, published, first_seen) "
+                        "VALUES(?,?,?,?,?,?,?)",
+                        (url, digest, title, body, r.get('source'), r.get('date'), now),
+                    )
+                    article_id = cur.lastrowid
+                else:
+                    article_id = row[0]
+                if article_id in linked:
+                    continue
+                linked.add(article_id)
+                _index_article(conn, symbol, article_id)
+                conn.execute(
+                    "INSERT OR IGNORE INTO news_query_results(symbol, query, rank, article_id) VALUES(?,?,?,?)",
+                    (symbol, query, rank, article_id),
+                )
+                rank += 1
+            conn.execute(
+                "INSERT INTO news_queries(symbol, query, fetched_at) VALUES(?,?,?) "
+                "ON CONFLICT(symbol, query) DO UPDATE SET fetched_at=excluded.fetched_at",
+                (symbol, query, now),
+            )
+            conn.commit()
+        return self._read(symbol, query)
+
+    def get_or_fetch(self, symbol: str, query: str, fetch: NewsFetcher) -> List[Dict]:
+        """
+        Fresh cached results, else `fetch()` stored and returned. If the fetch
+        fails, the last stored results for the query are served regardless of age.
+        """
+        cached = self.get(symbol, query)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return cached
+        with self._lock:
+            self.misses += 1
+        try:
+            results = fetch()
+        except Exception:
+            if self.fetched_at(symbol, query) is None:
+                raise
+            with self._lock:
+                self.stale_served += 1
+            return self._read(symbol, query)
+        return self.put(symbol, query, list(results or []))
+
+    def search(
+        self, text: str, symbol: Optional[str] = None, since: Optional[float] = None, limit: int = 10
+    ) -> List[Dict]:
+        """
+        Ranked full-text search over every stored article, optionally limited to
+        one symbol and to articles first seen at or after epoch-second `since`.
+        Each article appears once, with every symbol it was found for.
+        """
+        match = fts_query(text)
+        if not match:
+            return []
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+        sql = (
+            f"SELECT a.title, a.url, a.body, a.source, a.first_seen, bm25(news_fts, {weights}) AS rank, "
+            "(SELECT group_concat(s.symbol) FROM news_symbol_articles s WHERE s.article_id = a.id) "
+            "FROM news_fts f JOIN news_articles a ON a.id = f.rowid "
+            "WHERE news_fts MATCH ? AND a.first_seen >= ?"
+        )
+        params: list = [match, float(since) if since is not None else 0.0]
+        if symbol:
+            sql += " AND EXISTS (SELECT 1 FROM news_symbol_articles s WHERE s.article_id = a.id AND s.symbol = ?)"
+            params.append(symbol.upper().strip())
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(int(limit))
+        with _conn(self.db_path) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [
+            {'title': t, 'href': u, 'body': b, 'source': src, 'symbols': sorted((syms or '').split(',')),
+             'first_seen': seen, 'rank': r}
+            for t, u, b, src, seen, r, syms in rows
+        ]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale_served': self.stale_served,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+_news_cache: Optional[NewsCache] = None
+
+
+def get_news_cache() -> NewsCache:
+    """Return the process-wide news cache."""
+    global _news_cache
+    if _news_cache is None:
+        _news_cache = NewsCache()
+    return _news_cache
@@ -0,0 +1,112 @@
+"""
+Local lexicon-based sentiment for news headlines.
+
+A batch of headlines (title + snippet) is tokenized once, the finance lexicon
+is looked up only for the batch's unique tokens, and per-article scores come
+from NumPy sums over the flattened token array. A negator ("not", "no",
+"without", ...) up to two tokens before a lexicon word flips its sign. Raw
+sums are squashed to [-1, 1] the way VADER normalizes its compound score.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+BULLISH = "bullish"
+BEARISH = "bearish"
+NEUTRAL = "neutral"
+
+# Scores beyond +/- this are labelled bullish / bearish
+LABEL_THRESHOLD = 0.05
+# Squashing constant: score = total / sqrt(total^2 + alpha)
+NORMALIZE_ALPHA = 15.0
+
+# Finance-specific word weights (-3 very bearish .. +3 very bullish)
+FINANCE_LEXICON: Dict[str, float] = {
+    # bullish
+    'beat': 2.0, 'beats': 2.0, 'surge': 2.5, 'surges': 2.5, 'surged': 2.5, 'soar': 2.5, 'soars': 2.5,
+    'soared': 2.5, 'jump': 2.0, 'jumps': 2.0, 'jumped': 2.0, 'rally': 2.0, 'rallies': 2.0, 'rallied': 2.0,
+    'gain': 1.5, 'gains': 1.5, 'gained': 1.5, 'rise': 1.0, 'rises': 1.0, 'rose': 1.0, 'climb': 1.5,
+    'climbs': 1.5, 'record': 1.5, 'upgrade': 2.5, 'upgrades': 2.5, 'upgraded': 2.5, 'outperform': 2.0,
+    'buy': 1.0, 'bullish': 2.5, 'growth': 1.5, 'profit': 1.5, 'profitable': 1.5, 'strong': 1.5,
+    'stronger': 1.5, 'raises': 1.5, 'raised': 1.5, 'boost': 1.5, 'boosts': 1.5, 'exceed': 2.0,
+    'exceeds': 2.0, 'exceeded': 2.0, 'optimistic': 1.5, 'rebound': 1.5, 'rebounds': 1.5, 'approval': 1.5,
+    'approved': 1.5, 'dividend': 0.5, 'buyback': 1.5, 'expansion': 1.0, 'breakthrough': 2.0, 'high': 0.5,
+    'higher': 1.0, 'upside': 1.5, 'tops': 1.5,
+    # bearish
+    'miss': -2.0, 'misses': -2.0, 'missed': -2.0, 'plunge': -2.5, 'plunges': -2.5, 'plunged': -2.5,
+    'tumble': -2.5, 'tumbles': -2.5, 'tumbled': -2.5, 'slump': -2.0, 'slumps': -2.0, 'drop': -1.5,
+    'drops': -1.5, 'dropped': -1.5, 'fall': -1.5, 'falls': -1.5, 'fell': -1.5, 'decline': -1.5,
+    'declines': -1.5, 'declined': -1.5, 'sink': -2.0, 'sinks': -2.0, 'downgrade': -2.5, 'downgrades': -2.5,
+    'downgraded': -2.5, 'underperform': -2.0, 'sell': -1.0, 'bearish': -2.5, 'loss': -1.5, 'losses': -1.5,
+    'weak': -1.5, 'weaker': -1.5, 'cuts': -1.5, 'cut': -1.5, 'lawsuit': -2.0, 'probe': -1.5,
+    'investigation': -1.5, 'fraud': -3.0, 'recall': -2.0, 'layoffs': -1.5, 'bankruptcy': -3.0,
+    'default': -2.5, 'warning': -1.5, 'warns': -1.5, 'concern': -1.0, 'concerns': -1.0, 'fears': -1.5,
+    'volatile': -0.5, 'lower': -1.0, 'low': -0.5, 'downside': -1.5, 'delay': -1.0, 'delays': -1.0,
+    'fine': -1.0, 'fined': -2.0, 'halt': -1.5, 'halts': -1.5, 'crash': -3.0, 'selloff': -2.5,
+}
+NEGATORS = frozenset({'not', 'no', 'never', 'without', "isn't", "wasn't", "didn't", "doesn't", "won't", 'fails', 'failed'})
+# How many tokens before a lexicon word a negator still applies
+NEGATION_WINDOW = 2
+
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+@dataclass
+class SentimentScores:
+    scores: np.ndarray  # per article, in [-1, 1]
+    labels: np.ndarray  # bullish / bearish / neutral
+    hits: np.ndarray  # lexicon words matched per article
+
+    def aggregate(self) -> Dict:
+        """Batch summary: mean score, overall label and label counts."""
+        mean = float(self.scores.mean()) if len(self.scores) else 0.0
+        return {
+            'score': mean,
+            'label': _label(mean),
+            'bullish': int((self.labels == BULLISH).sum()),
+            'bearish': int((self.labels == BEARISH).sum()),
+            'neutral': int((self.labels == NEUTRAL).sum()),
+            'articles': int(len(self.scores)),
+        }
+
+
+def _label(score: float) -> str:
+    if score > LABEL_THRESHOLD:
+        return BULLISH
+    if score < -LABEL_THRESHOLD:
+        return BEARISH
+    return NEUTRAL
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall((text or '').lower().replace('’', "'"))
+
+
+def score_headlines(texts: Sequence[str]) -> SentimentScores:
+    """Score every text in one pass over the flattened token array."""
+    docs = [tokenize(t) for t in texts]
+    n = len(docs)
+    lengths = np.array([len(d) for d in docs], dtype=int)
+    if n == 0 or lengths.sum() == 0:
+        return SentimentScores(np.zeros(n), np.full(n, NEUTRAL, dtype=object), np.zeros(n, dtype=int))
+
+    flat = np.array([tok for d in docs for tok in d], dtype=object)
+    doc_ids = np.repeat(np.arange(n), lengths)
+    vocab, inverse = np.unique(flat.astype(str), return_inverse=True)
+    weights = np.array([FINANCE_LEXICON.get(w, 0.0) for w in vocab])[inverse]
+    negator = np.array([w in NEGATORS for w in vocab])[inverse]
+
+    flip = np.zeros(len(flat), dtype=bool)
+    for offset in range(1, NEGATION_WINDOW + 1):
+        same_doc = doc_ids[offset:] == doc_ids[:-offset]
+        flip[offset:] |= negator[:-offset] & same_doc
+    weights = np.where(flip, -weights, weights)
+
+    total = np.bincount(doc_ids, weights=weights, minlength=n)
+    hits = np.bincount(doc_ids, weights=(weights != 0).astype(float), minlength=n).astype(int)
+    scores = total / np.sqrt(total * total + NORMALIZE_ALPHA)
+    labels = np.where(scores > LABEL_THRESHOLD, BULLISH, np.where(scores < -LABEL_THRESHOLD, BEARISH, NEUTRAL)).astype(object)
+    return SentimentScores(scores=scores, labels=labels, hits=hits)
@@ -0,0 +1,143 @@
+"""
+Vectorized portfolio risk analytics over an aligned daily return matrix.
+
+All statistics (covariance, correlation, VaR/CVaR, beta) are computed with
+matrix operations over the T x N return matrix, so cost grows with the
+matrix size rather than with per-symbol Python loops.
+"""
+
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_YEAR = 252
+# Minimum daily returns a symbol needs to take part in the analysis
+MIN_OBSERVATIONS = 30
+
+
+@dataclass
+class RiskReport:
+    symbols: List[str]
+    weights: np.ndarray
+    observations: int
+    cov: pd.DataFrame  # daily covariance
+    corr: pd.DataFrame
+    asset_vol: pd.Series  # annualized
+    asset_var: pd.Series  # daily historical VaR (positive = loss)
+    betas: pd.Series
+    portfolio_vol: float  # annualized
+    portfolio_beta: Optional[float]
+    hist_var: float
+    hist_cvar: float
+    param_var: float
+    param_cvar: float
+    confidence: float
+
+
+def build_return_matrix(closes: Dict[str, pd.Series], min_coverage: float = 0.8) -> pd.DataFrame:
+    """
+    Align daily closes by date and convert them to simple returns.
+
+    Dates on which fewer than `min_coverage` of the symbols traded (weekends for
+    stock-heavy lists) are dropped; short gaps are forward-filled, and symbols
+    with too little history are excluded.
+    """
+    frame = pd.DataFrame({sym: s for sym, s in closes.items() if s is not None and len(s)})
+    if frame.empty:
+        return frame
+    frame = frame.sort_index()
+    frame = frame[frame.notna().mean(axis=1) >= min_coverage]
+    frame = frame.ffill(limit=3)
+    returns = frame.pct_change(fill_method=None).iloc[1:]
+    returns = returns.loc[:, returns.notna().sum() >= MIN_OBSERVATIONS]
+    return returns.dropna(how='any')
+
+
+def top_correlated_pairs(corr: pd.DataFrame, limit: int = 5) -> List[Tuple[str, str, float]]:
+    """Most correlated distinct pairs from a correlation matrix."""
+    values = corr.to_numpy()
+    rows, cols = np.triu_indices(len(values), k=1)
+    if not len(rows):
+        return []
+    pair_corr = values[rows, cols]
+    order = np.argsort(-pair_corr)[:limit]
+    labels = corr.columns
+    return [(labels[rows[i]], labels[cols[i]], float(pair_corr[i])) for i in order]
+
+
+def compute_risk(
+    returns: pd.DataFrame,
+    benchmark: Optional[pd.Series] = None,
+    confidence: float = 0.95,
+    weights: Optional[np.ndarray] = None,
+) -> RiskReport:
+    """
+    Compute covariance, correlation, VaR/CVaR and beta for a return matrix.
+
+    Args:
+        returns: T x N daily simple returns (no NaNs), one column per symbol
+        benchmark: Benchmark daily returns indexed like `returns` (beta is NaN without it)
+        confidence: VaR confidence level (e.g., 0.95)
+        weights: Portfolio weights (defaults to equal weight)
+
+    Returns:
+        RiskReport with daily VaR/CVaR expressed as positive loss fractions
+    """
+    symbols = list(returns.columns)
+    R = returns.to_numpy(dtype=float)
+    T, N = R.shape
+    w = np.full(N, 1.0 / N) if weights is None else np.asarray(weights, dtype=float) / np.sum(weights)
+
+    cov = np.cov(R, rowvar=False, ddof=1).reshape(N, N)
+    std = np.sqrt(np.diag(cov))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / np.outer(std, std)
+
+    alpha = 1.0 - confidence
+    port = R @ w
+    cutoff = np.quantile(port, alpha)
+    hist_var = -cutoff
+    tail = port[port <= cutoff]
+    hist_cvar = -tail.mean() if len(tail) else hist_var
+
+    mu = port.mean()
+    sigma = float(np.sqrt(w @ cov @ w))
+    z = NormalDist().inv_cdf(alpha)
+    param_var = -(mu + z * sigma)
+    param_cvar = -mu + sigma * NormalDist().pdf(z) / alpha
+
+    asset_var = -np.quantile(R, alpha, axis=0)
+
+    betas = np.full(N, np.nan)
+    portfolio_beta = None
+    if benchmark is not None:
+        b = benchmark.reindex(returns.index).to_numpy(dtype=float)
+        mask = ~np.isnan(b)
+        if mask.sum() >= MIN_OBSERVATIONS:
+            bm = b[mask] - b[mask].mean()
+            Rm = R[mask] - R[mask].mean(axis=0)
+            var_b = (bm @ bm)
+            if var_b > 0:
+                betas = (Rm.T @ bm) / var_b
+                portfolio_beta = float(w @ betas)
+
+    return RiskReport(
+        symbols=symbols,
+        weights=w,
+        observations=T,
+        cov=pd.DataFrame(cov, index=symbols, columns=symbols),
+        corr=pd.DataFrame(corr, index=symbols, columns=symbols),
+        asset_vol=pd.Series(std * np.sqrt(TRADING_DAYS_PER_YEAR), index=symbols),
+        asset_var=pd.Series(asset_var, index=symbols),
+        betas=pd.Series(betas, index=symbols),
+        portfolio_vol=sigma * np.sqrt(TRADING_DAYS_PER_YEAR),
+        portfolio_beta=portfolio_beta,
+        hist_var=float(hist_var),
+        hist_cvar=float(hist_cvar),
+        param_var=float(param_var),
+        param_cvar=float(param_cvar),
+        confidence=confidence,
+    )
@@ -0,0 +1,121 @@
+"""
+Background prefetch scheduler.
+
+A daemon thread periodically runs named jobs (quotes, daily bars, headlines)
+over the current watchlist and writes into the local caches, so sidebar
+renders and "Analyze my watchlist" turns read warm data instead of paying
+for N cold upstream fetches.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .resilience import log_system_event
+
+# Seconds between refresh rounds; COFINANCE_PREFETCH_SEC=0 disables the scheduler
+DEFAULT_PREFETCH_INTERVAL_SEC = 300.0
+
+
+def prefetch_interval_from_env() -> float:
+    try:
+        return float(os.environ.get("COFINANCE_PREFETCH_SEC", DEFAULT_PREFETCH_INTERVAL_SEC))
+    except ValueError:
+        return DEFAULT_PREFETCH_INTERVAL_SEC
+
+
+class PrefetchScheduler:
+    """Runs every registered job over `symbols()` once per interval in a daemon thread."""
+
+    def __init__(
+        self,
+        symbols: Callable[[], List[str]],
+        jobs: Optional[Dict[str, Callable[[List[str]], Any]]] = None,
+        interval_sec: float = DEFAULT_PREFETCH_INTERVAL_SEC,
+        log_event: Callable[[str, Dict], None] = log_system_event,
+    ) -> None:
+        self._symbols = symbols
+        self.jobs: Dict[str, Callable[[List[str]], Any]] = dict(jobs or {})
+        self.interval_sec = float(interval_sec)
+        self._log_event = log_event
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self.runs = 0
+        self.last_run_at: Optional[float] = None
+        self.last_results: Dict[str, dict] = {}
+
+    def add_job(self, name: str, job: Callable[[List[str]], Any]) -> None:
+        with self._lock:
+            self.jobs[name] = job
+
+    def run_once(self) -> Dict[str, dict]:
+        """Run every job once over the current symbols; a failing job never stops the others."""
+        try:
+            symbols = list(dict.fromkeys(s for s in self._symbols() if s))
+        except Exception as e:
+            symbols = []
+            self._log_event('PREFETCH_FAILED', {'job': 'symbols', 'error': str(e)})
+        with self._lock:
+            jobs = list(self.jobs.items())
+
+        results: Dict[str, dict] = {}
+        for name, job in jobs:
+            started = time.perf_counter()
+            try:
+                if symbols:
+                    job(symbols)
+                results[name] = {'ok': True, 'symbols': len(symbols), 'elapsed_sec': time.perf_counter() - started}
+            except Exception as e:
+                results[name] = {'ok': False, 'error': str(e), 'elapsed_sec': time.perf_counter() - started}
+                self._log_event('PREFETCH_FAILED', {'job': name, 'symbols': len(symbols), 'error': str(e)})
+
+        with self._lock:
+            self.runs += 1
+            self.last_run_at = time.time()
+            self.last_results = results
+        return results
+
+    def _loop(self) -> None:
+        while not self._stopping:
+            self.run_once()
+            self._wake.wait(self.interval_sec)
+            self._wake.clear()
+
+    def start(self) -> "PrefetchScheduler":
+        """Start the daemon thread (no-op if already running or the interval is <= 0)."""
+        with self._lock:
+            if self.interval_sec <= 0 or (self._thread is not None and self._thread.is_alive()):
+                return self
+            self._stopping = False
+            self._thread = threading.Thread(target=self._loop, name="watchlist-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def trigger(self) -> None:
+        """Run the next round now instead of waiting for the interval (e.g. after a watchlist edit)."""
+        self._wake.set()
+
+    def stop(self, timeout_sec: float = 5.0) -> None:
+        self._stopping = True
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout_sec)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'running': self.running,
+                'interval_sec': self.interval_sec,
+                'runs': self.runs,
+                'last_run_at': self.last_run_at,
+                'jobs': list(self.jobs),
+                'last_results': dict(self.last_results),
+            }
@@ -0,0 +1,184 @@
+"""
+Shared in-process cache for market quote/info payloads.
+
+Every tool and UI widget that needs a `yf.Ticker(...).info` dict goes through
+this cache, so one analysis turn (or a sidebar rerun) fetches each ticker at
+most once per TTL window. Concurrent misses for the same key are coalesced
+into a single upstream fetch, and expired values are kept as a last-known
+fallback for when the upstream fails.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .singleflight import SingleFlight, get_single_flight
+
+# Quotes move, but not fast enough to justify a round trip on every rerun.
+DEFAULT_TTL_SEC = 60.0
+DEFAULT_MAX_ENTRIES = 512
+
+
+class QuoteCache:
+    """Thread-safe TTL cache with a size limit and LRU eviction."""
+
+    def __init__(
+        self,
+        ttl_sec: float = DEFAULT_TTL_SEC,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+        flights: Optional[SingleFlight] = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_sec: Default time-to-live for entries, in seconds
+            max_entries: Maximum number of entries before LRU eviction kicks in
+            clock: Monotonic time source (injectable for tests)
+            flights: Single-flight group used to coalesce concurrent misses
+        """
+        self.ttl_sec = float(ttl_sec)
+        self.max_entries = int(max_entries)
+        self._clock = clock
+        self.flights = flights if flights is not None else SingleFlight()
+        self._lock = threading.Lock()
+        # key -> (value, stored_at, ttl_sec)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, float]]" = OrderedDict()
+        # key -> (value, stored_at) for expired entries, served only when a refetch fails
+        self._stale: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_served = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for `key`, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, stored_at, ttl = entry
+            if self._clock() - stored_at > ttl:
+                # Expired entries are dropped lazily on access but remembered as stale
+                del self._entries[key]
+                self._remember_stale(key, value, stored_at)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _remember_stale(self, key: Hashable, value: Any, stored_at: float) -> None:
+        self._stale[key] = (value, stored_at)
+        self._stale.move_to_end(key)
+        while len(self._stale) > self.max_entries:
+            self._stale.popitem(last=False)
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """Return the freshest known value for `key`, even if expired (None if never stored)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry[0]
+            stale = self._stale.get(key)
+            return stale[0] if stale is not None else None
+
+    def set(self, key: Hashable, value: Any, ttl_sec: Optional[float] = None) -> None:
+        """Store `value` under `key`, evicting least recently used entries if full."""
+        ttl = self.ttl_sec if ttl_sec is None else float(ttl_sec)
+        with self._lock:
+            self._entries[key] = (value, self._clock(), ttl)
+            self._entries.move_to_end(key)
+            self._stale.pop(key, None)
+            while len(self._entries) > self.max_entries:
+                old_key, (old_value, old_stored_at, _) = self._entries.popitem(last=False)
+                self._remember_stale(old_key, old_value, old_stored_at)
+                self.evictions += 1
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any], ttl_sec: Optional[float] = None) -> Any:
+        """
+        Return the cached value for `key`, calling `fetch()` on a miss.
+
+        Empty results (None, {}, []) are returned but never cached, so a
+        transient upstream failure does not poison the cache for a whole TTL.
+        Concurrent misses for `key` share one `fetch()` call. If `fetch()`
+        raises (e.g. the upstream's circuit breaker is open), the last known
+        value is served instead when there is one.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        def _load() -> Any:
+            loaded = fetch()
+            if loaded:
+                self.set(key, loaded, ttl_sec)
+            return loaded
+
+        try:
+            return self.flights.do(key, _load)
+        except Exception:
+            stale = self.get_stale(key)
+            if stale is None:
+                raise
+            with self._lock:
+                self.stale_served += 1
+            return stale
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """Seconds since `key` was stored, or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            return self._clock() - entry[1]
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or the whole cache when `key` is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._stale.clear()
+            else:
+                self._entries.pop(key, None)
+                self._stale.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._stale.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.stale_served = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and entry ages for observability."""
+        with self._lock:
+            now = self._clock()
+            ages = [now - stored_at for _, stored_at, _ in self._entries.values()]
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'oldest_age_sec': max(ages) if ages else None,
+                'newest_age_sec': min(ages) if ages else None,
+                'stale_served': self.stale_served,
+                'coalesced': self.flights.coalesced,
+            }
+
+
+_quote_cache = QuoteCache(flights=get_single_flight())
+
+
+def get_quote_cache() -> QuoteCache:
+    """Return the process-wide quote cache shared by tools and UI."""
+    return _quote_cache
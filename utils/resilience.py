@@ -0,0 +1,365 @@
+"""
+Rate limiting, retry and circuit breaking for upstream data sources.
+
+Each upstream (yfinance, DuckDuckGo, alternative.me) gets one process-wide
+`Upstream` guard: a token bucket caps the request rate, failed calls are
+retried with jittered exponential backoff, and a circuit breaker stops
+calling an endpoint that keeps failing so callers can fall back to cached
+data immediately. Only transient failures (transport errors, throttling,
+5xx) are retried and counted; client and data errors such as an unknown
+ticker pass straight through. Breaker transitions and throttling are
+written to the events table under the "system" session.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+SYSTEM_SESSION = "system"
+
+# requests/sec, burst, consecutive failures before opening, seconds before a trial call
+UPSTREAM_LIMITS: Dict[str, Dict[str, float]] = {
+    'yfinance': {'rate_per_sec': 5.0, 'burst': 10, 'failure_threshold': 5, 'reset_after_sec': 30.0},
+    'ddgs': {'rate_per_sec': 1.0, 'burst': 3, 'failure_threshold': 3, 'reset_after_sec': 60.0},
+    'alternative.me': {'rate_per_sec': 0.5, 'burst': 2, 'failure_threshold': 3, 'reset_after_sec': 300.0},
+}
+DEFAULT_LIMITS = {'rate_per_sec': 2.0, 'burst': 5, 'failure_threshold': 5, 'reset_after_sec': 60.0}
+
+# Waiting longer than this for a token is reported as throttling
+THROTTLE_LOG_AFTER_SEC = 1.0
+# At most one throttle event per upstream per window
+THROTTLE_LOG_EVERY_SEC = 60.0
+
+# Exception class-name fragments of transport failures in requests, curl_cffi and yfinance
+_TRANSIENT_NAME_PARTS = ('Timeout', 'ConnectionError', 'ChunkedEncodingError', 'RateLimit')
+_TRANSIENT_MESSAGE_PARTS = ('too many requests', 'rate limit')
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+class RateLimitedError(RuntimeError):
+    """Raised when no request token became available within the wait budget."""
+
+
+def log_system_event(event_type: str, payload: Dict) -> None:
+    """Best-effort write to the events table; never raises."""
+    try:
+        from .memory import MemoryStore
+        MemoryStore().log_event(SYSTEM_SESSION, event_type, payload)
+    except Exception:
+        pass
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    response = getattr(error, 'response', None)
+    code = getattr(response, 'status_code', None) or getattr(error, 'status_code', None)
+    try:
+        return int(code) if code is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Whether `error` says the upstream is unavailable (retry and count it) rather than
+    that the request itself was bad (invalid ticker 404, missing field KeyError).
+    """
+    status = _status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if any(part in cls.__name__ for cls in type(error).__mro__ for part in _TRANSIENT_NAME_PARTS):
+        return True
+    message = str(error).lower()
+    return any(part in message for part in _TRANSIENT_MESSAGE_PARTS)
+
+
+def backoff_delays(
+    retries: int,
+    base_sec: float = 0.5,
+    cap_sec: float = 8.0,
+    rng: Optional[random.Random] = None,
+) -> Iterator[float]:
+    """'Full jitter' exponential backoff: attempt n sleeps uniform(0, min(cap, base * 2**n))."""
+    rng = rng or random
+    for attempt in range(retries):
+        yield rng.uniform(0, min(cap_sec, base_sec * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `rate_per_sec`."""
+
+    def __init__(
+        self,
+        rate_per_sec: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate_per_sec = float(rate_per_sec)
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_sec)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    def acquire(self, timeout_sec: float = 10.0) -> float:
+        """
+        Block until a token is available and return the seconds spent waiting.
+        Raises RateLimitedError if that would take longer than `timeout_sec`.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                wait = (1.0 - self._tokens) / self.rate_per_sec
+            if waited + wait > timeout_sec:
+                raise RateLimitedError(f"no request token within {timeout_sec:.1f}s")
+            self._sleep(wait)
+            waited += wait
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open after a cool-down -> closed on success."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_after_sec: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        on_transition: Optional[Callable[[str, str, str, Dict], None]] = None,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = int(failure_threshold)
+        self.reset_after_sec = float(reset_after_sec)
+        self._clock = clock
+        self._on_transition = on_transition
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _transition(self, new_state: str, reason: str) -> None:
+        old, self._state = self._state, new_state
+        if self._on_transition is not None and old != new_state:
+            try:
+                self._on_transition(self.name, old, new_state, {'reason': reason, 'failures': self._failures})
+            except Exception:
+                pass
+
+    def _maybe_half_open(self) -> None:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_after_sec:
+            self._transition(self.HALF_OPEN, "cool-down elapsed")
+            self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now (half-open lets a single trial call through)."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self._state != self.CLOSED:
+                self._transition(self.CLOSED, "trial call succeeded")
+
+    def release_trial(self) -> None:
+        """End a half-open trial without a verdict (the call failed for reasons of its own)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            reason = type(error).__name__ if error is not None else "failure"
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                if self._state != self.OPEN:
+                    self._transition(self.OPEN, reason)
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a trial call through (0 if closed)."""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_after_sec - (self._clock() - self._opened_at))
+
+
+class Upstream:
+    """Rate limiter + retry with backoff + circuit breaker for one upstream source."""
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_sec: float,
+        burst: float,
+        failure_threshold: int = 5,
+        reset_after_sec: float = 30.0,
+        max_retries: int = 2,
+        backoff_base_sec: float = 0.5,
+        backoff_cap_sec: float = 8.0,
+        acquire_timeout_sec: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        log_event: Callable[[str, Dict], None] = log_system_event,
+        is_transient: Callable[[BaseException], bool] = is_transient_error,
+    ) -> None:
+        self.name = name
+        self.max_retries = int(max_retries)
+        self.backoff_base_sec = backoff_base_sec
+        self.backoff_cap_sec = backoff_cap_sec
+        self.acquire_timeout_sec = acquire_timeout_sec
+        self._clock = clock
+        self._sleep = sleep
+        self._log_event = log_event
+        self._is_transient = is_transient
+        self.bucket = TokenBucket(rate_per_sec, burst, clock=clock, sleep=sleep)
+        self.breaker = CircuitBreaker(
+            name,
+            failure_threshold=failure_threshold,
+            reset_after_sec=reset_after_sec,
+            clock=clock,
+            on_transition=self._on_transition,
+        )
+        self._lock = threading.Lock()
+        self._last_throttle_log = float('-inf')
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.throttled = 0
+
+    def _on_transition(self, name: str, old: str, new: str, info: Dict) -> None:
+        self._log_event('CIRCUIT_' + new.upper(), {'upstream': name, 'from': old, **info})
+
+    def _note_throttle(self, waited: float, rejected: bool = False) -> None:
+        with self._lock:
+            self.throttled += 1
+            now = self._clock()
+            if now - self._last_throttle_log < THROTTLE_LOG_EVERY_SEC:
+                return
+            self._last_throttle_log = now
+        self._log_event('RATE_LIMITED', {
+            'upstream': self.name,
+            'waited_sec': round(waited, 3),
+            'rejected': rejected,
+            'tokens': round(self.bucket.available(), 2),
+        })
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call `fn(*args, **kwargs)` under the rate limit, retrying transient failures
+        with jittered backoff. Raises CircuitOpenError without calling `fn` while the
+        breaker is open, so callers can serve cached data right away. Non-transient
+        errors are raised at once and do not count toward the breaker.
+        """
+        delays = backoff_delays(self.max_retries, self.backoff_base_sec, self.backoff_cap_sec)
+        while True:
+            if not self.breaker.allow():
+                with self._lock:
+                    self.rejected += 1
+                raise CircuitOpenError(
+                    f"{self.name} temporarily unavailable (retry in {self.breaker.retry_after():.0f}s)"
+                )
+            try:
+                waited = self.bucket.acquire(self.acquire_timeout_sec)
+            except RateLimitedError:
+                self._note_throttle(self.acquire_timeout_sec, rejected=True)
+                raise
+            if waited > THROTTLE_LOG_AFTER_SEC:
+                self._note_throttle(waited)
+
+            with self._lock:
+                self.calls += 1
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not self._is_transient(e):
+                    self.breaker.release_trial()
+                    raise
+                with self._lock:
+                    self.failures += 1
+                self.breaker.record_failure(e)
+                delay = next(delays, None)
+                if delay is None or self.breaker.state == CircuitBreaker.OPEN:
+                    raise
+                self._sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'upstream': self.name,
+                'state': self.breaker.state,
+                'calls': self.calls,
+                'failures': self.failures,
+                'rejected': self.rejected,
+                'throttled': self.throttled,
+                'tokens': round(self.bucket.available(), 2),
+            }
+
+
+_upstreams: Dict[str, Upstream] = {}
+_upstreams_lock = threading.Lock()
+
+
+def get_upstream(name: str) -> Upstream:
+    """Return the process-wide guard for upstream `name` (limits from UPSTREAM_LIMITS)."""
+    with _upstreams_lock:
+        upstream = _upstreams.get(name)
+        if upstream is None:
+            upstream = _upstreams[name] = Upstream(name, **UPSTREAM_LIMITS.get(name, DEFAULT_LIMITS))
+        return upstream
+
+
+def reset_upstreams() -> None:
+    """Forget all guards (tests and config reloads)."""
+    with _upstreams_lock:
+        _upstreams.clear()
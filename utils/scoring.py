@@ -0,0 +1,92 @@
+"""
+Vectorized BUY/HOLD/SELL scoring for a whole watchlist.
+
+The base factor is the 52-week range position: at the low it scores +1,
+at the high -1. Extra factors (momentum, volatility, ...) are arrays in
+[-1, 1] blended in by weight. Labels come from the blended score, so with
+no extra factors they match the classic rule: position < 0.3 BUY,
+position > 0.7 SELL, otherwise HOLD.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+BUY = "BUY"
+HOLD = "HOLD"
+SELL = "SELL"
+NO_DATA = "N/A"
+
+# Range-position thresholds of the classic rule
+BUY_BELOW = 0.3
+SELL_ABOVE = 0.7
+# Same thresholds expressed on the [-1, 1] score scale (score = 1 - 2 * position)
+BUY_SCORE = 1.0 - 2.0 * BUY_BELOW
+SELL_SCORE = 1.0 - 2.0 * SELL_ABOVE
+
+# name -> (values in [-1, 1], weight); the range position always has weight 1
+Factors = Dict[str, Tuple[Sequence[float], float]]
+
+
+@dataclass
+class Scores:
+    labels: np.ndarray  # BUY / HOLD / SELL / N/A
+    scores: np.ndarray  # blended score in [-1, 1], NaN without data
+    position: np.ndarray  # 52-week range position in [0, 1], NaN without data
+
+
+def range_position(price: Sequence[float], low_52w: Sequence[float], high_52w: Sequence[float]) -> np.ndarray:
+    """(price - low) / (high - low) for every symbol; NaN when the range is empty or data is missing."""
+    price = np.asarray(price, dtype=float)
+    low = np.asarray(low_52w, dtype=float)
+    high = np.asarray(high_52w, dtype=float)
+    span = high - low
+    valid = (price > 0) & (low > 0) & (high > 0) & (span != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(valid, (price - low) / span, np.nan)
+
+
+def momentum_factor(returns: Sequence[float], scale: float = 0.2) -> np.ndarray:
+    """Trailing return mapped to [-1, 1] (+/- `scale` saturates)."""
+    return np.clip(np.asarray(returns, dtype=float) / scale, -1.0, 1.0)
+
+
+def volatility_factor(ann_vol: Sequence[float], comfortable: float = 0.3, extreme: float = 0.8) -> np.ndarray:
+    """Penalty in [-1, 0] that grows as annualized volatility rises past `comfortable`."""
+    vol = np.asarray(ann_vol, dtype=float)
+    return -np.clip((vol - comfortable) / (extreme - comfortable), 0.0, 1.0)
+
+
+def score_watchlist(
+    price: Sequence[float],
+    low_52w: Sequence[float],
+    high_52w: Sequence[float],
+    factors: Optional[Factors] = None,
+) -> Scores:
+    """
+    Score and label every symbol in one vectorized call.
+
+    Args:
+        price, low_52w, high_52w: Equal-length arrays (0/NaN = missing)
+        factors: Optional extra factors {name: (values in [-1, 1], weight)};
+            NaN factor values are ignored for that symbol
+
+    Returns:
+        Scores with labels, blended scores and the raw range position
+    """
+    position = range_position(price, low_52w, high_52w)
+    total = 1.0 - 2.0 * position
+    weight = np.ones_like(total)
+    for values, w in (factors or {}).values():
+        values = np.asarray(values, dtype=float)
+        present = ~np.isnan(values)
+        total = total + np.where(present, values * w, 0.0)
+        weight = weight + np.where(present, abs(w), 0.0)
+    score = total / weight
+
+    labels = np.full(score.shape, HOLD, dtype=object)
+    labels[score > BUY_SCORE] = BUY
+    labels[score < SELL_SCORE] = SELL
+    labels[np.isnan(score)] = NO_DATA
+    return Scores(labels=labels, scores=score, position=position)
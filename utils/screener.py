@@ -0,0 +1,311 @@
+"""
+Columnar universe snapshot and vectorized screener.
+
+A snapshot of price stats and fundamentals for the whole screening universe
+is refreshed in bulk by a background job and kept both on disk (SQLite) and
+in memory as one DataFrame, so screens never wait for a refresh.
+
+Screens are small boolean expressions ("pct_above_low <= 10 and pe < 20")
+compiled into NumPy masks over whole columns, so a screen over thousands of
+symbols is a handful of array operations.
+"""
+
+import ast
+import operator
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .db import market_db_path
+
+# Numeric snapshot columns, in display order
+NUMERIC_COLUMNS = [
+    'price', 'change_pct', 'low_52w', 'high_52w', 'pct_above_low', 'pct_below_high', 'position_52w',
+    'pe', 'forward_pe', 'eps', 'market_cap', 'dividend_yield', 'roe', 'beta', 'volume',
+]
+TEXT_COLUMNS = ['symbol', 'name', 'asset_class', 'sector']
+SNAPSHOT_COLUMNS = TEXT_COLUMNS + NUMERIC_COLUMNS
+
+# yfinance info key for each fundamentals column
+INFO_FIELDS = {
+    'pe': 'trailingPE',
+    'forward_pe': 'forwardPE',
+    'eps': 'trailingEps',
+    'market_cap': 'marketCap',
+    'dividend_yield': 'dividendYield',
+    'roe': 'returnOnEquity',
+    'beta': 'beta',
+    'volume': 'volume',
+}
+
+# Snapshots older than this are rebuilt in bulk by the background job
+UNIVERSE_MAX_AGE_SEC = 24 * 60 * 60
+
+SCHEMA_STATEMENTS = [
+    "CREATE TABLE IF NOT EXISTS universe_snapshot ("
+    + ", ".join(
+        [f"{c} TEXT" if c != 'symbol' else "symbol TEXT PRIMARY KEY" for c in TEXT_COLUMNS]
+        + [f"{c} REAL" for c in NUMERIC_COLUMNS]
+        + ["updated_at REAL NOT NULL"]
+    )
+    + ")",
+]
+
+
+@contextmanager
+def _conn(db_path: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _as_float(value) -> float:
+    try:
+        return float(value) if value is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def build_universe_frame(
+    symbols: Iterable[str],
+    quotes: Dict[str, dict],
+    infos: Dict[str, dict],
+    asset_classes: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """
+    Assemble the snapshot from bulk quotes ({'price', 'previous_close', 'low_52w', 'high_52w'})
+    and info dicts; derived 52-week columns are computed column-wise.
+    """
+    asset_classes = asset_classes or {}
+    rows = []
+    for sym in dict.fromkeys(s.upper().strip() for s in symbols if s):
+        quote = quotes.get(sym) or {}
+        info = infos.get(sym) or {}
+        row = {
+            'symbol': sym,
+            'name': info.get('shortName') or info.get('longName') or sym,
+            'asset_class': asset_classes.get(sym) or ('crypto' if sym.endswith('-USD') else 'equity'),
+            'sector': info.get('sector') or '',
+            'price': _as_float(quote.get('price') or info.get('currentPrice') or info.get('regularMarketPrice')),
+            'previous_close': _as_float(quote.get('previous_close') or info.get('previousClose')),
+            'low_52w': _as_float(quote.get('low_52w') or info.get('fiftyTwoWeekLow')),
+            'high_52w': _as_float(quote.get('high_52w') or info.get('fiftyTwoWeekHigh')),
+        }
+        for column, key in INFO_FIELDS.items():
+            row[column] = _as_float(info.get(key))
+        rows.append(row)
+
+    frame = pd.DataFrame(rows, columns=TEXT_COLUMNS + ['price', 'previous_close', 'low_52w', 'high_52w'] + list(INFO_FIELDS))
+    price = frame['price'].to_numpy(dtype=float)
+    prev = frame['previous_close'].to_numpy(dtype=float)
+    low = frame['low_52w'].to_numpy(dtype=float)
+    high = frame['high_52w'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frame['change_pct'] = (price / prev - 1.0) * 100.0
+        frame['pct_above_low'] = (price / low - 1.0) * 100.0
+        frame['pct_below_high'] = (1.0 - price / high) * 100.0
+        span = high - low
+        frame['position_52w'] = np.where(span > 0, (price - low) / span, np.nan)
+    return frame[SNAPSHOT_COLUMNS]
+
+
+def missing_fundamentals(frame: pd.DataFrame) -> pd.Series:
+    """Rows with no fundamentals at all (their info lookup failed), as a boolean mask."""
+    return frame[list(INFO_FIELDS)].isna().all(axis=1)
+
+
+def carry_forward_fundamentals(frame: pd.DataFrame, previous: pd.DataFrame, symbols: Iterable[str]) -> pd.DataFrame:
+    """
+    For `symbols` whose info lookup failed this round, keep name, sector and fundamentals
+    from the `previous` snapshot instead of replacing them with NaN.
+    """
+    if previous.empty:
+        return frame
+    wanted = {s.upper().strip() for s in symbols}
+    prev = previous.set_index('symbol')
+    rows = frame['symbol'].isin(wanted & set(prev.index)) & missing_fundamentals(frame)
+    if not rows.any():
+        return frame
+    frame = frame.copy()
+    carried = ['name', 'sector'] + list(INFO_FIELDS)
+    frame.loc[rows, carried] = prev.loc[frame.loc[rows, 'symbol'], carried].to_numpy()
+    return frame
+
+
+_BIN_OPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+    ast.BitAnd: operator.and_, ast.BitOr: operator.or_,
+}
+_CMP_OPS = {
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge,
+    ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+
+
+def evaluate_filter(frame: pd.DataFrame, expression: str) -> np.ndarray:
+    """
+    Evaluate a screen expression to a boolean mask over `frame`.
+
+    Only snapshot column names, numbers, quoted strings, arithmetic,
+    comparisons and and/or/not are accepted; anything else raises ValueError.
+    Comparisons against missing values (NaN) are False.
+    """
+    expression = (expression or "").strip()
+    if not expression:
+        return np.ones(len(frame), dtype=bool)
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid screen expression: {e.msg}") from None
+
+    def walk(node):
+        if isinstance(node, ast.Expression):
+            return walk(node.body)
+        if isinstance(node, ast.Name):
+            if node.id not in SNAPSHOT_COLUMNS:
+                raise ValueError(f"Unknown column '{node.id}'. Available: {', '.join(SNAPSHOT_COLUMNS)}")
+            column = frame[node.id]
+            return column.to_numpy(dtype=float) if node.id in NUMERIC_COLUMNS else column.astype(str).to_numpy()
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str)) and not isinstance(node.value, bool):
+            return node.value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -walk(node.operand)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+            return ~np.asarray(walk(node.operand), dtype=bool)
+        if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+            return _BIN_OPS[type(node.op)](walk(node.left), walk(node.right))
+        if isinstance(node, ast.BoolOp):
+            masks = [np.asarray(walk(v), dtype=bool) for v in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return combine.reduce(masks)
+        if isinstance(node, ast.Compare) and all(type(op) in _CMP_OPS for op in node.ops):
+            # Chained comparisons (10 < pe < 20) become a conjunction of pairwise masks
+            left = walk(node.left)
+            mask = np.ones(len(frame), dtype=bool)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = walk(comparator)
+                with np.errstate(invalid='ignore'):
+                    mask &= np.asarray(_CMP_OPS[type(op)](left, right), dtype=bool)
+                left = right
+            return mask
+        raise ValueError(f"Unsupported syntax in screen expression: {ast.dump(node)[:40]}")
+
+    mask = np.asarray(walk(tree), dtype=bool)
+    if mask.shape != (len(frame),):
+        raise ValueError("Screen expression must compare at least one column")
+    return mask
+
+
+def screen(
+    frame: pd.DataFrame,
+    expression: str = "",
+    sort_by: str = "",
+    limit: int = 20,
+) -> pd.DataFrame:
+    """
+    Filter the snapshot with `expression` and rank the matches.
+
+    Args:
+        frame: Universe snapshot (SNAPSHOT_COLUMNS)
+        expression: Screen expression, e.g. "pct_above_low <= 10 and pe < 20"
+        sort_by: Column to rank by; prefix with '-' for descending (default: -market_cap)
+        limit: Maximum rows returned
+    """
+    matches = frame[evaluate_filter(frame, expression)]
+    sort_by = (sort_by or "-market_cap").strip()
+    descending = sort_by.startswith('-')
+    column = sort_by.lstrip('-+')
+    if column not in SNAPSHOT_COLUMNS:
+        raise ValueError(f"Unknown sort column '{column}'. Available: {', '.join(SNAPSHOT_COLUMNS)}")
+    ranked = matches.sort_values(column, ascending=not descending, na_position='last', kind='stable')
+    return ranked.head(max(int(limit), 1))
+
+
+class UniverseStore:
+    """Universe snapshot persisted in SQLite and memoized as one in-memory DataFrame."""
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self.db_path = db_path or market_db_path()
+        self._lock = threading.Lock()
+        self._frame: Optional[pd.DataFrame] = None
+        self._updated_at: Optional[float] = None
+        with _conn(self.db_path) as conn:
+            cur = conn.cursor()
+            for stmt in SCHEMA_STATEMENTS:
+                cur.execute(stmt)
+            conn.commit()
+
+    def save(self, frame: pd.DataFrame) -> None:
+        """Replace the snapshot with `frame` (SNAPSHOT_COLUMNS)."""
+        now = time.time()
+        frame = frame[SNAPSHOT_COLUMNS].reset_index(drop=True)
+        records = frame.astype(object).where(frame.notna(), None).to_numpy().tolist()
+        placeholders = ",".join(["?"] * (len(SNAPSHOT_COLUMNS) + 1))
+        with _conn(self.db_path) as conn:
+            conn.execute("DELETE FROM universe_snapshot")
+            conn.executemany(
+                f"INSERT OR REPLACE INTO universe_snapshot({', '.join(SNAPSHOT_COLUMNS)}, updated_at) VALUES({placeholders})",
+                [row + [now] for row in records],
+            )
+            conn.commit()
+        with self._lock:
+            self._frame = frame
+            self._updated_at = now
+
+    def load(self) -> pd.DataFrame:
+        """The current snapshot (read from disk once per process, then from memory)."""
+        with self._lock:
+            if self._frame is not None:
+                return self._frame
+        with _conn(self.db_path) as conn:
+            rows = conn.execute(f"SELECT {', '.join(SNAPSHOT_COLUMNS)}, updated_at FROM universe_snapshot").fetchall()
+        frame = pd.DataFrame([r[:-1] for r in rows], columns=SNAPSHOT_COLUMNS)
+        frame[NUMERIC_COLUMNS] = frame[NUMERIC_COLUMNS].astype(float)
+        with self._lock:
+            self._frame = frame
+            self._updated_at = max((r[-1] for r in rows), default=None)
+        return frame
+
+    def age_sec(self) -> Optional[float]:
+        """Seconds since the last refresh, or None if the universe was never refreshed."""
+        self.load()
+        return None if self._updated_at is None else time.time() - self._updated_at
+
+    def is_stale(self, max_age_sec: float = UNIVERSE_MAX_AGE_SEC) -> bool:
+        age = self.age_sec()
+        return age is None or age > max_age_sec
+
+
+def universe_symbols(extra: Iterable[str] = ()) -> List[str]:
+    """
+    Screening universe: tickers from COFINANCE_UNIVERSE_FILE (one per line) if set,
+    otherwise the offline symbol master; `extra` (e.g. the watchlist) is always included.
+    """
+    path = os.environ.get("COFINANCE_UNIVERSE_FILE")
+    symbols: List[str] = []
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            symbols = [line.split('#')[0].strip().upper() for line in f]
+    else:
+        from .symbol_master import get_symbol_master
+        symbols = [rec.ticker for rec in get_symbol_master().records()]
+    return list(dict.fromkeys(s for s in list(symbols) + [e.upper().strip() for e in extra] if s))
+
+
+_universe_store: Optional[UniverseStore] = None
+
+
+def get_universe_store() -> UniverseStore:
+    """Return the process-wide universe snapshot store."""
+    global _universe_store
+    if _universe_store is None:
+        _universe_store = UniverseStore()
+    return _universe_store
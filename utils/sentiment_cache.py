@@ -0,0 +1,134 @@
+"""
+Persistent stale-while-revalidate cache for slow-moving sentiment indices.
+
+The Crypto Fear & Greed Index changes once a day, so callers get the stored
+value immediately; once it is older than the TTL a background thread refreshes
+it. The last real value is kept on disk and survives process restarts.
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from .db import market_db_path
+
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS sentiment_snapshots (
+        source TEXT PRIMARY KEY,
+        score INTEGER NOT NULL,
+        label TEXT NOT NULL,
+        fetched_at REAL NOT NULL
+    )
+    """,
+]
+
+DEFAULT_TTL_SEC = 6 * 60 * 60
+
+# fetch() -> {'score': int, 'label': str}
+SentimentFetcher = Callable[[], Dict]
+
+
+@contextmanager
+def _conn(db_path: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+class SentimentCache:
+    """Stale-while-revalidate cache for one sentiment source, persisted in SQLite."""
+
+    def __init__(
+        self,
+        source: str,
+        fetch: SentimentFetcher,
+        ttl_sec: float = DEFAULT_TTL_SEC,
+        db_path: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            source: Name of the sentiment source (row key on disk)
+            fetch: Upstream fetcher returning {'score', 'label'}
+            ttl_sec: Age after which a background refresh is triggered
+            db_path: SQLite database file (default: the selected provider's market DB)
+        """
+        self.source = source
+        self.ttl_sec = float(ttl_sec)
+        self.db_path = db_path or market_db_path()
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._snapshot: Optional[Dict] = None
+        with _conn(self.db_path) as conn:
+            cur = conn.cursor()
+            for stmt in SCHEMA_STATEMENTS:
+                cur.execute(stmt)
+            conn.commit()
+
+    def get(self) -> Dict:
+        """
+        Return the latest snapshot {'score', 'label', 'fetched_at'}.
+
+        Fetches synchronously only when nothing has ever been stored; a stale
+        snapshot is returned as-is while a background refresh runs.
+        """
+        snapshot = self.last_known()
+        if snapshot is None:
+            return self.refresh()
+        if time.time() - snapshot['fetched_at'] > self.ttl_sec:
+            self.refresh_in_background()
+        return snapshot
+
+    def last_known(self) -> Optional[Dict]:
+        """Return the last stored real value (memory first, then disk), or None."""
+        if self._snapshot is not None:
+            return self._snapshot
+        with _conn(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT score, label, fetched_at FROM sentiment_snapshots WHERE source=?",
+                (self.source,),
+            ).fetchone()
+        if row:
+            self._snapshot = {'score': row[0], 'label': row[1], 'fetched_at': row[2]}
+        return self._snapshot
+
+    def refresh(self) -> Dict:
+        """Fetch from upstream and persist the result. Raises if the fetch fails."""
+        data = self._fetch()
+        snapshot = {'score': int(data['score']), 'label': str(data['label']), 'fetched_at': time.time()}
+        with _conn(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sentiment_snapshots(source, score, label, fetched_at) VALUES(?,?,?,?)",
+                (self.source, snapshot['score'], snapshot['label'], snapshot['fetched_at']),
+            )
+            conn.commit()
+        self._snapshot = snapshot
+        return snapshot
+
+    def refresh_in_background(self) -> bool:
+        """Start a daemon refresh unless one is already running. Returns True if started."""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+
+        def _run() -> None:
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the stale value; the next stale read retries
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=_run, name=f"sentiment-refresh-{self.source}", daemon=True).start()
+        return True
@@ -0,0 +1,185 @@
+"""
+Offline symbol master: tickers, names, asset class and exchange.
+
+Backed by the bundled `data/symbol_master.csv` and indexed in memory with
+hash maps (exact ticker / name / alias) plus a sorted name list for prefix
+search, so resolution never touches the network.
+"""
+
+import bisect
+import csv
+import difflib
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+SYMBOL_MASTER_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "symbol_master.csv")
+
+# Corporate boilerplate dropped from names before indexing
+_NAME_SUFFIXES = {
+    'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'plc', 'ltd', 'limited',
+    'holdings', 'holding', 'group', 'sa', 'se', 'nv', 'ag', 'class', 'the', 'trust', 'fund',
+}
+
+# Uppercase tokens that look like tickers but almost never are in chat text
+NOT_TICKERS = {
+    'I', 'A', 'AI', 'AND', 'OR', 'THE', 'FOR', 'TO', 'OF', 'IN', 'IS', 'MY', 'VS',
+    'USD', 'EUR', 'GBP', 'JPY', 'US', 'USA', 'UK', 'EU',
+    'CEO', 'CFO', 'CTO', 'ETF', 'IPO', 'EPS', 'PE', 'ROE', 'ATH', 'RSI', 'MACD', 'SMA', 'EMA',
+    'YTD', 'QOQ', 'YOY', 'GDP', 'CPI', 'FED', 'FOMC', 'SEC', 'API', 'LLM', 'OK', 'NEWS',
+    'BUY', 'SELL', 'HOLD', 'FAQ', 'TLDR', 'NOTE', 'FUD', 'FOMO',
+    'AM', 'PM', 'ET', 'EST', 'UTC', 'IMO', 'BTW', 'FYI', 'LOL', 'ASAP', 'TBD',
+}
+# Real tickers that are also everyday words or abbreviations: only accepted as $cashtags
+# or in explicit ticker context ('MS stock', 'ticker HD')
+AMBIGUOUS_TICKERS = {
+    'A', 'C', 'F', 'T', 'V', 'NOW', 'LOW', 'ALL', 'ON', 'IT', 'ARE', 'BE', 'ARM', 'LINK', 'DOT', 'SOL', 'SHOP', 'COST',
+    'MS', 'MA', 'HD', 'TM',
+}
+# Company names and aliases (normalized) that are also everyday words: 'Target price',
+# 'Block trades', 'Meta analysis' and 'Ripple effect' only resolve in explicit ticker context
+AMBIGUOUS_NAMES = {
+    'target', 'block', 'meta', 'ripple', 'polygon', 'avalanche', 'visa', 'oracle',
+    'caterpillar', 'ford', 'lilly', 'ether', 'tron',
+}
+
+_CONTEXT_BEFORE = re.compile(r"\b(?:ticker|symbol|stock|shares (?:of|in))\s*:?\s*$", re.IGNORECASE)
+_CONTEXT_AFTER = re.compile(r"^'?s?\s+(?:stock|shares|share price|ticker)\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class SymbolRecord:
+    ticker: str
+    name: str
+    asset_class: str  # "equity", "etf" or "crypto"
+    exchange: str
+    aliases: tuple = field(default_factory=tuple)
+
+
+def has_ticker_context(text: str, start: int, end: int) -> bool:
+    """True if the span text[start:end] is explicitly used as a stock ('ticker MS', 'Target stock')."""
+    return bool(_CONTEXT_BEFORE.search(text[max(0, start - 20):start]) or _CONTEXT_AFTER.match(text[end:end + 20]))
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip punctuation and corporate suffixes ('The Walt Disney Company' -> 'walt disney')."""
+    words = re.sub(r"[^a-z0-9&+ ]", " ", (name or "").lower().replace("'", "")).split()
+    kept = [w for w in words if w not in _NAME_SUFFIXES]
+    return " ".join(kept or words)
+
+
+class SymbolMaster:
+    """In-memory ticker/name index over the local symbol master."""
+
+    def __init__(self, records: List[SymbolRecord]) -> None:
+        self._by_ticker: Dict[str, SymbolRecord] = {}
+        self._by_name: Dict[str, str] = {}
+        for rec in records:
+            self._by_ticker[rec.ticker] = rec
+            for label in (rec.name,) + tuple(rec.aliases):
+                key = normalize_name(label)
+                if key:
+                    # First writer wins so a class-A listing keeps the plain company name
+                    self._by_name.setdefault(key, rec.ticker)
+        self._sorted_names: List[str] = sorted(self._by_name)
+
+    @classmethod
+    def from_csv(cls, path: str = SYMBOL_MASTER_CSV) -> "SymbolMaster":
+        records = []
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                aliases = tuple(a.strip() for a in (row.get('aliases') or '').split('|') if a.strip())
+                records.append(SymbolRecord(
+                    ticker=row['ticker'].strip().upper(),
+                    name=row['name'].strip(),
+                    asset_class=row['asset_class'].strip(),
+                    exchange=row['exchange'].strip(),
+                    aliases=aliases,
+                ))
+        return cls(records)
+
+    def __len__(self) -> int:
+        return len(self._by_ticker)
+
+    def records(self, asset_class: Optional[str] = None) -> List[SymbolRecord]:
+        return [r for r in self._by_ticker.values() if asset_class is None or r.asset_class == asset_class]
+
+    def is_ticker(self, token: str) -> bool:
+        return (token or "").upper().strip() in self._by_ticker
+
+    def lookup(self, query: str) -> Optional[SymbolRecord]:
+        """Exact resolution by ticker, then by company name or alias ('Apple', 'Bitcoin', 'BTC')."""
+        q = (query or "").strip()
+        if not q:
+            return None
+        rec = self._by_ticker.get(q.upper().lstrip('$'))
+        if rec is not None:
+            return rec
+        ticker = self._by_name.get(normalize_name(q))
+        return self._by_ticker.get(ticker) if ticker else None
+
+    def search(self, query: str, limit: int = 5, cutoff: float = 0.8) -> List[SymbolRecord]:
+        """Exact match, then name-prefix matches, then fuzzy name matches."""
+        results: List[SymbolRecord] = []
+        exact = self.lookup(query)
+        if exact is not None:
+            results.append(exact)
+
+        key = normalize_name(query)
+        if key:
+            start = bisect.bisect_left(self._sorted_names, key)
+            for name in self._sorted_names[start:]:
+                if not name.startswith(key) or len(results) >= limit:
+                    break
+                rec = self._by_ticker[self._by_name[name]]
+                if rec not in results:
+                    results.append(rec)
+            if len(results) < limit:
+                for name in difflib.get_close_matches(key, self._sorted_names, n=limit, cutoff=cutoff):
+                    rec = self._by_ticker[self._by_name[name]]
+                    if rec not in results:
+                        results.append(rec)
+        return results[:limit]
+
+    def find_names(self, text: str, max_words: int = 3) -> List[str]:
+        """
+        Tickers whose company name or alias appears capitalized in `text` ('Analyze Nvidia' -> NVDA).
+
+        Names in AMBIGUOUS_NAMES only count with a corporate suffix ('Target Corp') or
+        explicit ticker context ('Block stock').
+        """
+        text = text or ""
+        matches = list(re.finditer(r"[A-Za-z0-9&.'+-]+", text))
+        words = [m.group() for m in matches]
+        found: List[str] = []
+        for i, word in enumerate(words):
+            if not word[:1].isupper():
+                continue
+            for n in range(min(max_words, len(words) - i), 0, -1):
+                key = normalize_name(" ".join(words[i:i + n]))
+                if key.upper() in AMBIGUOUS_TICKERS or key.upper() in NOT_TICKERS:
+                    continue
+                if key in AMBIGUOUS_NAMES:
+                    suffixed = n > 1 and re.sub(r"[^a-z]", "", words[i + n - 1].lower()) in _NAME_SUFFIXES - {'the'}
+                    if not (suffixed or has_ticker_context(text, matches[i].start(), matches[i + n - 1].end())):
+                        continue
+                ticker = self._by_name.get(key)
+                if ticker:
+                    found.append(ticker)
+                    break
+        return list(dict.fromkeys(found))
+
+
+_symbol_master: Optional[SymbolMaster] = None
+
+
+def get_symbol_master() -> SymbolMaster:
+    """Return the process-wide symbol master (loaded from disk on first use)."""
+    global _symbol_master
+    if _symbol_master is None:
+        try:
+            _symbol_master = SymbolMaster.from_csv()
+        except OSError:
+            _symbol_master = SymbolMaster([])
+    return _symbol_master